@@ -1,19 +1,69 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import threading
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
 
 from api.v1 import api_router as v1_router
+from api.v1.movies import movies_service
+from config import settings
 from connections.redis_manager import RedisManager
+from services.movies import MoviesService
+from utils.exceptions import ProfilerBusy, ProfilerDisabled
+from utils.metrics import metrics
+from utils.profiler import format_collapsed, sample_stacks
 
 api_router = APIRouter()
 api_router.include_router(v1_router, prefix="/v1")
 
 redis_manager = RedisManager()
 
+# Only one profile runs at a time, samples are taken from a thread
+profiler_lock = asyncio.Lock()
+
 
 @api_router.get("/healthcheck")
 async def healthcheck():
     return {"status": "ok"}
 
 
+@api_router.get("/metrics")
+async def get_metrics():
+    return metrics.collect()
+
+
+@api_router.get(
+    "/debug/profile",
+    response_class=PlainTextResponse,
+    responses={
+        404: {"description": "Profiler disabled"},
+        409: {"description": "A profile is already running"},
+    },
+)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="Duration of the profile."),
+    interval: float = Query(
+        0.005, ge=0.001, le=1, description="Seconds between two samples."
+    ),
+):
+    """
+    Sample the event loop stack for `seconds` and return the collapsed
+    stacks, ready for flamegraph.pl or speedscope. Needs PROFILER_ENABLED.
+    """
+    if not settings.PROFILER_ENABLED:
+        raise ProfilerDisabled()
+    if profiler_lock.locked():
+        raise ProfilerBusy()
+    async with profiler_lock:
+        stacks = await asyncio.to_thread(
+            sample_stacks,
+            threading.get_ident(),
+            min(seconds, settings.PROFILER_MAX_SECONDS),
+            interval,
+        )
+    return format_collapsed(stacks)
+
+
 @api_router.post(
     "/cache/delete",
     responses={
@@ -27,3 +77,31 @@ async def delete_cache_key(
 ):
     await cache.delete(key)
     return {"description": f"{key} deleted from cache"}
+
+
+@api_router.post(
+    "/cache/delete-prefix",
+    responses={
+        200: {"description": "Keys starting with {prefix} deleted from cache"},
+    },
+)
+async def delete_cache_prefix(
+    prefix: str,
+    cache: RedisManager = Depends(lambda: redis_manager),
+):
+    deleted = await cache.delete_prefix(prefix)
+    return {"description": f"{deleted} keys starting with {prefix} deleted from cache"}
+
+
+@api_router.post(
+    "/cache/delete-movie",
+    responses={
+        200: {"description": "Movie {movie_id} deleted from cache"},
+    },
+)
+async def delete_cache_movie(
+    movie_id: int,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    await service.invalidate_movie(movie_id)
+    return {"description": f"Movie {movie_id} deleted from cache"}
@@ -1,54 +1,223 @@
 from typing import List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
+from config import settings
+from constants.cache import CacheNamespace
 from schemas.requests.base import BaseRequest
-from schemas.requests.movies import SearchMoviesRequest
-from schemas.responses.movies import MoviesResponse
-from services.movies import MoviesService
+from schemas.requests.movies import (
+    BatchSearchMoviesRequest,
+    ExportMoviesRequest,
+    MovieRequest,
+    MoviesByIdsRequest,
+    MoviesChangesRequest,
+    MoviesStatsRequest,
+    SearchMoviesRequest,
+    SuggestMoviesRequest,
+)
+from schemas.responses.movies import (
+    MovieSuggestionResponse,
+    MoviesByIdsResponse,
+    MoviesChangesResponse,
+    MoviesResponse,
+    MoviesStatsResponse,
+)
+from services.movies import (
+    MOVIE_REFERENCE_FIELDS,
+    MOVIES_SEARCH_FIELDS,
+    MoviesService,
+)
+from utils.deadline import without_request_deadline
 from utils.decorators import cached
+from utils.exceptions import MovieNotFound
+from utils.timing import TimedORJSONResponse
 
 router = APIRouter()
 
 movies_service = MoviesService()
 
+@cached(
+    expiration_seconds=3600,
+    stale_while_revalidate=settings.CACHE_STALE_WHILE_REVALIDATE,
+    namespace=CacheNamespace.movies_list,
+    stale_if_error=settings.CACHE_STALE_IF_ERROR,
+)
+async def _list_movie_references(request: BaseRequest, service: MoviesService):
+    # Cached pages hold movie ids only, hydrated per request
+    page = await service.get_all_movies(request)
+    return page
+
 @router.get(
-    path="", description="List movies in the database. This endpoint is paginated."
+    path="",
+    description="List movies in the database. This endpoint is paginated: "
+    "pass the returned `next_cursor` to fetch the following page.",
 )
-@cached(expiration_seconds=3600)
 async def list_movies(
     request: BaseRequest = Depends(),
     service: MoviesService = Depends(lambda: movies_service),
 ):
-    movies = await service.get_all_movies(request)
-    return movies
+    service.validate_fields(request.fields_list)
+    page = await _list_movie_references(
+        request.model_copy(update={"fields": ",".join(MOVIE_REFERENCE_FIELDS)}),
+        service,
+    )
+    items = await service.hydrate(page["items"], request.fields_list)
+    return TimedORJSONResponse({**page, "items": items})
+
+@router.get(
+    "/export",
+    description="Stream every movie in the database as NDJSON (one movie per "
+    "line), optionally gzip-compressed.",
+    response_class=StreamingResponse,
+)
+async def export_movies(
+    request: ExportMoviesRequest = Depends(),
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    headers = {"Content-Encoding": "gzip"} if request.compress else None
+    return StreamingResponse(
+        without_request_deadline(service.export_movies(request)),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+@router.get(
+    "/stats",
+    description="Count movies per genre, director and release year bucket.",
+    response_model=MoviesStatsResponse,
+)
+@cached(
+    expiration_seconds=3600,
+    namespace=CacheNamespace.movies_stats,
+    stale_if_error=settings.CACHE_STALE_IF_ERROR,
+)
+async def get_movies_stats(
+    request: MoviesStatsRequest = Depends(),
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    stats = await service.get_stats(request)
+    return stats
+
+@router.get(
+    "/suggest",
+    description="Suggest movie titles for the prefix typed so far.",
+    response_model=List[MovieSuggestionResponse],
+)
+async def suggest_movies(
+    request: SuggestMoviesRequest = Depends(),
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    suggestions = await service.suggest(request)
+    return suggestions
+
+@cached(
+    expiration_seconds=3600,
+    stale_while_revalidate=settings.CACHE_STALE_WHILE_REVALIDATE,
+    namespace=CacheNamespace.movies_search,
+    stale_if_error=settings.CACHE_STALE_IF_ERROR,
+)
+async def _search_movie_references(
+    request: SearchMoviesRequest, service: MoviesService
+):
+    references = await service.search_movies(request, fields=MOVIE_REFERENCE_FIELDS)
+    return references
 
 @router.post(
     "/titles",
     description="Search movies based on the title requested.",
 )
-@cached(expiration_seconds=3600)
 async def search_movies_by_titles(
     request: SearchMoviesRequest,
     service: MoviesService = Depends(lambda: movies_service),
 ):
-    movies = await service.search_movies(request)
-    return movies
+    references = await _search_movie_references(request, service)
+    movies = await service.hydrate(references, MOVIES_SEARCH_FIELDS)
+    return TimedORJSONResponse(movies)
+
+@router.post(
+    "/titles/batch",
+    description="Search each title independently in a single round trip and "
+    "return the best matches grouped by the title as given.",
+)
+async def search_movies_by_titles_batch(
+    request: BatchSearchMoviesRequest,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    movies = await service.search_movies_batch(request)
+    return TimedORJSONResponse(movies)
+
+@router.post(
+    "/ids",
+    description="Fetch many movies at once by their ids and/or IMDB ids.",
+    responses={200: {"model": MoviesByIdsResponse}},
+)
+async def fetch_movies_by_ids(
+    request: MoviesByIdsRequest,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    movies = await service.get_movies_by_ids(request)
+    return TimedORJSONResponse(movies)
+
+@router.post(
+    "/changes",
+    description="Create, replace and delete many movies at once. Only the "
+    "cache entries affected by the changes are dropped.",
+    response_model=MoviesChangesResponse,
+)
+async def apply_movie_changes(
+    request: MoviesChangesRequest,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    changes = await service.apply_changes(
+        [movie.model_dump(exclude_none=True) for movie in request.upsert],
+        request.delete,
+    )
+    return changes
+
+@router.put(
+    "/{movie_id}",
+    description="Create or replace a movie.",
+    response_model=MoviesChangesResponse,
+)
+async def upsert_movie(
+    movie_id: int,
+    request: MovieRequest,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    movie = {**request.model_dump(exclude_none=True), "id": movie_id}
+    changes = await service.apply_changes([movie], [])
+    return changes
+
+@router.delete(
+    "/{movie_id}",
+    description="Delete a movie.",
+    response_model=MoviesChangesResponse,
+    responses={404: {"description": "Movie {movie_id} not found"}},
+)
+async def delete_movie(
+    movie_id: int,
+    service: MoviesService = Depends(lambda: movies_service),
+):
+    changes = await service.apply_changes([], [movie_id])
+    if changes["not_found"]:
+        raise MovieNotFound(movie_id)
+    return changes
 
-@router.get("/{id}", response_model=List[MoviesResponse])
+@router.get("/{id}", responses={200: {"model": List[MoviesResponse]}})
 async def fetch_movie_by_id(
     id: str,
     service: MoviesService = Depends(lambda: movies_service),
 ):
     # Implement this
     movies = await service.filter_movies(id)
-    return movies
+    return TimedORJSONResponse(movies)
 
-@router.get("/{title}", response_model=List[MoviesResponse])
+@router.get("/{title}", responses={200: {"model": List[MoviesResponse]}})
 async def fetch_movie_by_title(
     title: str,
     service: MoviesService = Depends(lambda: movies_service),  # Dependency injection
 ):
     # Implement this
     movies = await service.filter_movies(title)
-    return movies 
\ No newline at end of file
+    return TimedORJSONResponse(movies) 
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Compare cache codecs on realistic movie lists.
+
+Builds paginated list_movies payloads from the documents in movies.json and
+reports encode/decode time and stored size for the legacy json codec and
+for utils.cache_codec with and without compression.
+
+Usage:
+    python benchmarks/bench_cache_codec.py --sizes 100 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import cache_codec  # noqa: E402
+
+
+def load_movies():
+    with open(os.path.join(ROOT, "movies.json")) as movies_file:
+        lines = [json.loads(line) for line in movies_file if line.strip()]
+    return [line for line in lines if "index" not in line]
+
+
+def payload(movies, size):
+    items = []
+    for i in range(size):
+        movie = dict(movies[i % len(movies)])
+        movie["id"] = i
+        items.append(movie)
+    return {
+        "items": items,
+        "total": size,
+        "page": 1,
+        "page_size": size,
+        "total_pages": 1,
+        "next_cursor": None,
+    }
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(args):
+    movies = load_movies()
+    codecs = {
+        "json": (lambda v: json.dumps(v).encode(), json.loads),
+        "orjson": (
+            lambda v: cache_codec.encode(v, compression_threshold=float("inf")),
+            cache_codec.decode,
+        ),
+    }
+    for level in args.levels:
+        codecs[f"orjson+zlib{level}"] = (
+            lambda v, level=level: cache_codec.encode(
+                v, compression_threshold=0, compression_level=level
+            ),
+            cache_codec.decode,
+        )
+
+    for size in args.sizes:
+        value = payload(movies, size)
+        for name, (encode, decode) in codecs.items():
+            encode_time, data = best_of(lambda: encode(value), args.repeat)
+            decode_time, _ = best_of(lambda: decode(data), args.repeat)
+            print(
+                f"items={size:>7} codec={name:<13} size={len(data) / 1024:>10.1f}KiB "
+                f"encode={encode_time * 1000:>8.2f}ms decode={decode_time * 1000:>8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6])
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+"""Compare cache lookup latency of the sync and asyncio Redis clients.
+
+Simulates the API hot path: ``concurrency`` coroutines run on one event loop,
+each performing ``requests`` cache lookups. Latency is measured from the
+moment a request yields to the loop until its value is decoded, so time spent
+queued behind other requests is included. With the sync client every lookup
+blocks the loop, so in-flight requests queue behind each other; with the
+asyncio client they overlap on the pooled connections.
+
+Usage:
+    python benchmarks/bench_redis_cache.py --url redis://localhost:6279 \
+        --concurrency 200 --requests 50 --payload-kb 64
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import redis
+import redis.asyncio as aioredis
+
+KEY = "bench:redis_cache"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, latencies, elapsed):
+    latencies_ms = [latency * 1000 for latency in latencies]
+    print(
+        f"{name:<6} ops={len(latencies_ms):>7} "
+        f"throughput={len(latencies_ms) / elapsed:>9.0f} ops/s "
+        f"p50={statistics.median(latencies_ms):>8.2f}ms "
+        f"p99={percentile(latencies_ms, 99):>8.2f}ms "
+        f"max={max(latencies_ms):>8.2f}ms"
+    )
+
+
+async def run_sync(url, concurrency, requests):
+    client = redis.Redis.from_url(url, decode_responses=True)
+    latencies = []
+
+    async def worker():
+        for _ in range(requests):
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            json.loads(client.get(KEY))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    client.close()
+    return latencies, elapsed
+
+
+async def run_async(url, concurrency, requests, pool_size):
+    pool = aioredis.BlockingConnectionPool.from_url(
+        url, decode_responses=True, max_connections=pool_size
+    )
+    client = aioredis.Redis(connection_pool=pool)
+    latencies = []
+
+    async def worker():
+        for _ in range(requests):
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            json.loads(await client.get(KEY))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    return latencies, elapsed
+
+
+async def main(args):
+    payload = json.dumps({"data": "x" * args.payload_kb * 1024})
+    seed = redis.Redis.from_url(args.url)
+    seed.set(KEY, payload)
+
+    latencies, elapsed = await run_sync(args.url, args.concurrency, args.requests)
+    report("sync", latencies, elapsed)
+    latencies, elapsed = await run_async(
+        args.url, args.concurrency, args.requests, args.pool_size
+    )
+    report("async", latencies, elapsed)
+
+    seed.delete(KEY)
+    seed.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="redis://localhost:6279")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--payload-kb", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
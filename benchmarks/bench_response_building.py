@@ -0,0 +1,81 @@
+"""Measure hit-to-response throughput of MoviesService._build_response.
+
+Compares the current single-pass pipeline with the previous one, which
+built a MoviesResponse per hit, dumped it twice to check unknown fields,
+dumped it again and then rebuilt and dumped a second MoviesResponse.
+
+Usage:
+    python benchmarks/bench_response_building.py --sizes 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.elastic import ElasticsearchResponse  # noqa: E402
+from schemas.responses.movies import MoviesResponse  # noqa: E402
+from services.movies import MoviesService  # noqa: E402
+
+
+def synthetic_hits(size):
+    return [
+        {
+            "_source": {
+                "id": i,
+                "imdb_id": f"tt{i:07d}",
+                "title": f"Movie number {i}",
+                "title_normalized": f"movie number {i}",
+                "release_year": 1950 + i % 75,
+                "genre": ("Drama", "Crime", "Action")[i % 3],
+                "director": f"Director {i % 500}",
+                "additional_data": {"rating": round(5 + i % 50 / 10, 1)},
+            }
+        }
+        for i in range(size)
+    ]
+
+
+def legacy_build_response(movies, fields):
+    filtered = []
+    for movie in movies.hits:
+        response = MoviesResponse(**movie["_source"])
+        fields_set = set(fields) if fields else None
+        if fields_set and not fields_set.issubset(set(response.dict().keys())):
+            raise ValueError(fields_set.difference(response.dict().keys()))
+        filtered.append(
+            response.model_dump(include=fields) if fields else response.model_dump()
+        )
+    return [MoviesResponse(**field).model_dump() for field in filtered]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main(args):
+    warnings.simplefilter("ignore")
+    service = MoviesService()
+    for size in args.sizes:
+        hits = synthetic_hits(size)
+        movies = ElasticsearchResponse(hits=hits, total=len(hits))
+        for fields in (None, ["id", "title"]):
+            legacy = timed(legacy_build_response, movies, fields)
+            current = timed(service._build_response, movies, fields)
+            print(
+                f"hits={size:>7} fields={str(fields):<17} "
+                f"legacy={size / legacy:>9.0f} hits/s "
+                f"single-pass={size / current:>9.0f} hits/s "
+                f"speedup={legacy / current:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""Measure the per-title cost of title normalization.
+
+Compares the previous normalized_title, which ran NFKD twice and compiled
+its regexes on every call, with normalize_many (ASCII fast path, no memo
+hits) and with normalize_many over titles already in its memo. The outputs
+are checked to be identical.
+
+Titles are read from `--source`, one per line or the `primaryTitle` column
+of an IMDb title.basics.tsv dump, and repeated up to `--size`. Without a
+source, titles are derived from movies.json with accented and punctuated
+variants.
+
+Usage:
+    python benchmarks/bench_title_normalization.py --source title.basics.tsv
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from unicodedata import normalize
+
+import orjson
+import regex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import string_utils  # noqa: E402
+
+VARIANTS = ("{}", "{}: Part {}", "Le {} ({})", "{} – Édition spéciale", "¡{}! {}")
+
+
+def read_titles(path, size):
+    with open(path, newline="", encoding="utf-8") as source:
+        if path.endswith(".tsv"):
+            rows = csv.DictReader(source, delimiter="\t", quoting=csv.QUOTE_NONE)
+            titles = [row["primaryTitle"] for row in itertools.islice(rows, size)]
+        else:
+            titles = [line.rstrip("\n") for line in itertools.islice(source, size)]
+    return list(itertools.islice(itertools.cycle(titles), size))
+
+
+def synthetic_titles(size):
+    with open(os.path.join(ROOT, "movies.json"), encoding="utf-8") as source:
+        base = [
+            document["title"]
+            for document in map(orjson.loads, filter(str.strip, source))
+            if "title" in document
+        ]
+    return [
+        VARIANTS[i % len(VARIANTS)].format(base[i % len(base)], i)
+        for i in range(size)
+    ]
+
+
+def legacy_normalized_title(title):
+    if not title:
+        return title
+    text = normalize("NFKD", title).encode("ascii", "ignore").decode("utf-8")
+    text = normalize("NFKD", text).encode("ascii", "ignore").decode("utf-8")
+    text = regex.compile(r"[^A-Za-z0-9 ]+").sub("", text)
+    return regex.sub(r"\s+", " ", text).strip().lower()
+
+
+def timed(func, titles):
+    started = time.perf_counter()
+    result = func(titles)
+    return result, time.perf_counter() - started
+
+
+def main(args):
+    titles = read_titles(args.source, args.size) if args.source else synthetic_titles(args.size)
+    ascii_share = sum(title.isascii() for title in titles) / len(titles)
+    print(f"titles={len(titles)} distinct={len(set(titles))} ascii={ascii_share:.0%}")
+
+    expected, legacy = timed(lambda ts: [legacy_normalized_title(t) for t in ts], titles)
+    string_utils._normalized_text.cache_clear()
+    cold, cold_seconds = timed(string_utils.normalized_titles, titles)
+    warm_titles = titles[: string_utils.NORMALIZE_CACHE_SIZE]
+    string_utils.normalized_titles(warm_titles)
+    warm, warm_seconds = timed(string_utils.normalized_titles, warm_titles)
+    assert cold == expected and warm == expected[: len(warm_titles)]
+
+    for name, seconds, count in (
+        ("legacy", legacy, len(titles)),
+        ("normalize_many", cold_seconds, len(titles)),
+        ("normalize_many (memo hits)", warm_seconds, len(warm_titles)),
+    ):
+        print(
+            f"{name:<27} {seconds / count * 1e9:>7.0f} ns/title "
+            f"speedup={legacy / len(titles) / (seconds / count):.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", help="Titles file or IMDb title.basics.tsv")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    main(parser.parse_args())
@@ -27,6 +27,59 @@ class Configuration(metaclass=Singleton):
             variable_name="ES_MOVIES_URL",
             default="http://localhost:8200",
         )
+        # ES_MOVIES_URL may list several nodes, separated by commas
+        self.ES_HOSTS = [
+            host.strip() for host in self.ES_WITCHER_URL.split(",") if host.strip()
+        ]
+        self.ES_POOL_MAXSIZE = self._load_variable(
+            "ES_POOL_MAXSIZE", cast=int, default=25
+        )
+        self.ES_HTTP_COMPRESS = self._load_variable(
+            "ES_HTTP_COMPRESS", cast=bool, default=True
+        )
+        self.ES_KEEPALIVE_TIMEOUT = self._load_variable(
+            "ES_KEEPALIVE_TIMEOUT", cast=float, default=30.0
+        )
+        self.ES_SNIFF_ON_START = self._load_variable(
+            "ES_SNIFF_ON_START", cast=bool, default=False
+        )
+        self.ES_SNIFF_ON_CONNECTION_FAIL = self._load_variable(
+            "ES_SNIFF_ON_CONNECTION_FAIL", cast=bool, default=False
+        )
+        self.ES_SNIFFER_TIMEOUT = self._load_variable(
+            "ES_SNIFFER_TIMEOUT", cast=float, default=0
+        )
+        self.ES_SCROLL_KEEP_ALIVE = self._load_variable(
+            "ES_SCROLL_KEEP_ALIVE", default="1m"
+        )
+        self.ES_POINT_IN_TIME_ENABLED = self._load_variable(
+            "ES_POINT_IN_TIME_ENABLED", cast=bool, default=True
+        )
+        self.REQUEST_TIMEOUT = self._load_variable(
+            "REQUEST_TIMEOUT", cast=float, default=30.0
+        )
+        self.ES_MAX_RETRIES = self._load_variable("ES_MAX_RETRIES", cast=int, default=2)
+        self.ES_RETRY_BACKOFF = self._load_variable(
+            "ES_RETRY_BACKOFF", cast=float, default=0.05
+        )
+        self.ES_RETRY_BACKOFF_MAX = self._load_variable(
+            "ES_RETRY_BACKOFF_MAX", cast=float, default=1.0
+        )
+        self.ES_HEDGING_ENABLED = self._load_variable(
+            "ES_HEDGING_ENABLED", cast=bool, default=False
+        )
+        self.ES_HEDGE_PERCENTILE = self._load_variable(
+            "ES_HEDGE_PERCENTILE", cast=float, default=95.0
+        )
+        self.ES_HEDGE_MIN_SAMPLES = self._load_variable(
+            "ES_HEDGE_MIN_SAMPLES", cast=int, default=50
+        )
+        self.ES_CIRCUIT_FAILURE_THRESHOLD = self._load_variable(
+            "ES_CIRCUIT_FAILURE_THRESHOLD", cast=int, default=5
+        )
+        self.ES_CIRCUIT_RESET_TIMEOUT = self._load_variable(
+            "ES_CIRCUIT_RESET_TIMEOUT", cast=float, default=30.0
+        )
         self.REDIS_URL = self._load_variable(
             variable_name="REDIS_URL",
             default="redis://localhost:6279",
@@ -41,9 +94,126 @@ class Configuration(metaclass=Singleton):
             variable_name="REDIS_INSTANCE_PATH",
             default="projects/moviedb/locations/us-east1/clusters/movies-redis-cluster",
         )
+        self.MSEARCH_MAX_TITLES = self._load_variable(
+            "MSEARCH_MAX_TITLES", cast=int, default=1000
+        )
+        self.MSEARCH_BATCH_SIZE = self._load_variable(
+            "MSEARCH_BATCH_SIZE", cast=int, default=100
+        )
+        self.MSEARCH_MAX_CONCURRENT_SEARCHES = self._load_variable(
+            "MSEARCH_MAX_CONCURRENT_SEARCHES", cast=int, default=8
+        )
+        self.MSEARCH_MAX_CONCURRENT_BATCHES = self._load_variable(
+            "MSEARCH_MAX_CONCURRENT_BATCHES", cast=int, default=1
+        )
+        self.REDIS_MAX_CONNECTIONS = self._load_variable(
+            "REDIS_MAX_CONNECTIONS", cast=int, default=50
+        )
+        self.REDIS_POOL_TIMEOUT = self._load_variable(
+            "REDIS_POOL_TIMEOUT", cast=float, default=5.0
+        )
+        self.REDIS_SOCKET_TIMEOUT = self._load_variable(
+            "REDIS_SOCKET_TIMEOUT", cast=float, default=2.0
+        )
         self.DEFAULT_CACHE_EXPIRATION = self._load_variable(
             "DEFAULT_CACHE_EXPIRATION", cast=int, default=3600 * 24
         )
+        self.CACHE_COMPRESSION_THRESHOLD = self._load_variable(
+            "CACHE_COMPRESSION_THRESHOLD", cast=int, default=16 * 1024
+        )
+        self.CACHE_COMPRESSION_LEVEL = self._load_variable(
+            "CACHE_COMPRESSION_LEVEL", cast=int, default=1
+        )
+        self.CACHE_STALE_WHILE_REVALIDATE = self._load_variable(
+            "CACHE_STALE_WHILE_REVALIDATE", cast=int, default=600
+        )
+        self.CACHE_STALE_IF_ERROR = self._load_variable(
+            "CACHE_STALE_IF_ERROR", cast=int, default=3600
+        )
+        self.CACHE_LOCK_ENABLED = self._load_variable(
+            "CACHE_LOCK_ENABLED", cast=bool, default=False
+        )
+        self.CACHE_LOCK_TIMEOUT = self._load_variable(
+            "CACHE_LOCK_TIMEOUT", cast=float, default=30.0
+        )
+        self.CACHE_LOCK_POLL_INTERVAL = self._load_variable(
+            "CACHE_LOCK_POLL_INTERVAL", cast=float, default=0.1
+        )
+        self.LOCAL_CACHE_ENABLED = self._load_variable(
+            "LOCAL_CACHE_ENABLED", cast=bool, default=False
+        )
+        self.LOCAL_CACHE_MAX_ITEMS = self._load_variable(
+            "LOCAL_CACHE_MAX_ITEMS", cast=int, default=1024
+        )
+        self.LOCAL_CACHE_MAX_BYTES = self._load_variable(
+            "LOCAL_CACHE_MAX_BYTES", cast=int, default=64 * 1024 * 1024
+        )
+        self.LOCAL_CACHE_TTL = self._load_variable(
+            "LOCAL_CACHE_TTL", cast=float, default=60.0
+        )
+        self.CACHE_INVALIDATION_CHANNEL = self._load_variable(
+            "CACHE_INVALIDATION_CHANNEL", default="cache:invalidate"
+        )
+        self.TITLE_INDEX_ENABLED = self._load_variable(
+            "TITLE_INDEX_ENABLED", cast=bool, default=False
+        )
+        self.TITLE_INDEX_REFRESH_INTERVAL = self._load_variable(
+            "TITLE_INDEX_REFRESH_INTERVAL", cast=float, default=300.0
+        )
+        self.TITLE_INDEX_MAX_DOCUMENTS = self._load_variable(
+            "TITLE_INDEX_MAX_DOCUMENTS", cast=int, default=200000
+        )
+        self.SUGGEST_CACHE_MAX_ITEMS = self._load_variable(
+            "SUGGEST_CACHE_MAX_ITEMS", cast=int, default=10000
+        )
+        self.SUGGEST_CACHE_MAX_BYTES = self._load_variable(
+            "SUGGEST_CACHE_MAX_BYTES", cast=int, default=8 * 1024 * 1024
+        )
+        self.SUGGEST_CACHE_TTL = self._load_variable(
+            "SUGGEST_CACHE_TTL", cast=float, default=300.0
+        )
+        self.IDS_LOOKUP_MAX_IDS = self._load_variable(
+            "IDS_LOOKUP_MAX_IDS", cast=int, default=10000
+        )
+        self.IDS_LOOKUP_CHUNK_SIZE = self._load_variable(
+            "IDS_LOOKUP_CHUNK_SIZE", cast=int, default=1000
+        )
+        self.MOVIE_CACHE_EXPIRATION = self._load_variable(
+            "MOVIE_CACHE_EXPIRATION", cast=int, default=86400
+        )
+        self.MOVIE_CHANGES_MAX_ITEMS = self._load_variable(
+            "MOVIE_CHANGES_MAX_ITEMS", cast=int, default=1000
+        )
+        self.INGEST_BATCH_SIZE = self._load_variable(
+            "INGEST_BATCH_SIZE", cast=int, default=1000
+        )
+        self.INGEST_MAX_BATCH_BYTES = self._load_variable(
+            "INGEST_MAX_BATCH_BYTES", cast=int, default=5 * 1024 * 1024
+        )
+        self.INGEST_CONCURRENCY = self._load_variable(
+            "INGEST_CONCURRENCY", cast=int, default=4
+        )
+        self.INGEST_MAX_RETRIES = self._load_variable(
+            "INGEST_MAX_RETRIES", cast=int, default=3
+        )
+        self.REINDEX_REPLICAS = self._load_variable(
+            "REINDEX_REPLICAS", cast=int, default=1
+        )
+        self.REINDEX_HEALTH_TIMEOUT = self._load_variable(
+            "REINDEX_HEALTH_TIMEOUT", cast=float, default=300.0
+        )
+        self.REINDEX_TIMEOUT = self._load_variable(
+            "REINDEX_TIMEOUT", cast=float, default=3600.0
+        )
+        self.SERVER_TIMING_ENABLED = self._load_variable(
+            "SERVER_TIMING_ENABLED", cast=bool, default=False
+        )
+        self.PROFILER_ENABLED = self._load_variable(
+            "PROFILER_ENABLED", cast=bool, default=False
+        )
+        self.PROFILER_MAX_SECONDS = self._load_variable(
+            "PROFILER_MAX_SECONDS", cast=float, default=60.0
+        )
         self.SLACK_HOOK = self._load_variable(
             "SLACK_HOOK",
             cast=str,
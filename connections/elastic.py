@@ -1,14 +1,38 @@
-from typing import List, Union
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Union
 
-from opensearchpy import AsyncOpenSearch
-from opensearchpy.helpers import async_scan
+from opensearchpy import AsyncOpenSearch, TransportError
+from opensearchpy.helpers import ScanError
 from fastapi import HTTPException
 from pydantic import ValidationError
 
 from config import settings
+from connections.opensearch_connection import PooledAsyncHttpConnection
+from connections.resilience import ResiliencePolicy
 from models.elastic import ElasticsearchResponse, ESBaseRequest, ESSearchRequest
 from utils.logger import Logger
+from utils.metrics import metrics
 from utils.singleton import Singleton
+from utils.timing import timed_stage
+
+
+# Error reasons of clusters without the point-in-time API.
+POINT_IN_TIME_UNSUPPORTED_REASONS = (
+    "no handler found",
+    "incorrect http method",
+    "unsupported",
+    "unrecognized",
+)
+
+
+def _point_in_time_unsupported(error: TransportError) -> bool:
+    if error.status_code == 405:
+        return True
+    reason = f"{error.error} {error.info}".lower()
+    return error.status_code == 400 and any(
+        marker in reason for marker in POINT_IN_TIME_UNSUPPORTED_REASONS
+    )
 
 
 class Elasticsearch(metaclass=Singleton):
@@ -16,33 +40,96 @@ class Elasticsearch(metaclass=Singleton):
     def __init__(self):
         self.logger = Logger()
         self.client = None
+        self.open_scroll_contexts = metrics.gauge(
+            "elastic_open_scroll_contexts",
+            "Scroll and point-in-time contexts held open by this worker",
+        )
+        self._point_in_time_supported = settings.ES_POINT_IN_TIME_ENABLED
+        self.policy = ResiliencePolicy(
+            "elastic",
+            default_timeout=settings.REQUEST_TIMEOUT,
+            max_retries=settings.ES_MAX_RETRIES,
+            backoff_base=settings.ES_RETRY_BACKOFF,
+            backoff_max=settings.ES_RETRY_BACKOFF_MAX,
+            failure_threshold=settings.ES_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.ES_CIRCUIT_RESET_TIMEOUT,
+            hedging_enabled=settings.ES_HEDGING_ENABLED,
+            hedge_percentile=settings.ES_HEDGE_PERCENTILE,
+            hedge_min_samples=settings.ES_HEDGE_MIN_SAMPLES,
+        )
 
     async def initialize(self):
         """
         Initialize the OpenSearch client.
         """
-        self.client = AsyncOpenSearch([settings.ES_WITCHER_URL], maxsize=25)
+        self.client = AsyncOpenSearch(
+            settings.ES_HOSTS,
+            connection_class=PooledAsyncHttpConnection,
+            # Retries are left to the resilience policy
+            max_retries=0,
+            maxsize=settings.ES_POOL_MAXSIZE,
+            http_compress=settings.ES_HTTP_COMPRESS,
+            keepalive_timeout=settings.ES_KEEPALIVE_TIMEOUT,
+            sniff_on_start=settings.ES_SNIFF_ON_START,
+            sniff_on_connection_fail=settings.ES_SNIFF_ON_CONNECTION_FAIL,
+            sniffer_timeout=settings.ES_SNIFFER_TIMEOUT or None,
+        )
+        metrics.gauge(
+            "elastic_pool_in_use",
+            "Requests in flight to OpenSearch from this worker",
+            lambda: sum(c.in_flight for c in self._pool_connections()),
+        )
+        metrics.gauge(
+            "elastic_pool_capacity",
+            "Pooled connections available to this worker, across all nodes",
+            lambda: settings.ES_POOL_MAXSIZE * len(self._pool_connections()),
+        )
         self.logger.info("OpenSearch client initialized successfully.")
 
+    def _pool_connections(self) -> list:
+        # The transport builds its pool lazily and rebuilds it when sniffing
+        connection_pool = getattr(self.client.transport, "connection_pool", None)
+        return list(getattr(connection_pool, "connections", ()))
+
     async def close(self):
         """
         Close the OpenSearch client.
         """
         await self.client.close()
 
+    @timed_stage("opensearch")
+    async def _call(
+        self,
+        method: str,
+        timeout: Optional[float],
+        retry: bool = True,
+        hedge: bool = False,
+        **kwargs,
+    ):
+        """
+        Call a client method through the resilience policy, bounding each
+        attempt by `timeout` and by what is left of the request deadline.
+
+        Only idempotent calls may be retried or hedged: scroll calls move a
+        server-side cursor and must not be repeated.
+        """
+        client_method = self.client
+        for name in method.split("."):  # e.g. "indices.refresh"
+            client_method = getattr(client_method, name)
+        return await self.policy.call(
+            lambda left: client_method(**kwargs, request_timeout=left),
+            timeout=timeout,
+            retry=retry,
+            hedge=hedge,
+        )
+
     async def search_async_scan(self, request: ESBaseRequest) -> ElasticsearchResponse:
         """
-        Execute a search query on OpenSearch using async_scan.
+        Execute a search query on OpenSearch, scanning every matching hit.
         """
         try:
             hits = []
-            async for hit in async_scan(
-                client=self.client,
-                index=request.index,  # Pass index as a parameter
-                query=request.body,   # Pass only the query/body
-                scroll=request.scroll,
-                size=request.size,
-            ):
+            async for hit in self.iter_async_scan(request):
                 hits.append(hit)
 
             return ElasticsearchResponse(
@@ -50,6 +137,8 @@ class Elasticsearch(metaclass=Singleton):
                 total=len(hits),
             )
 
+        except HTTPException:
+            raise
         except ValidationError as e:
             self.logger.error(f"Error validating search request: {e}")
             raise HTTPException(status_code=400, detail="Invalid search request")
@@ -57,34 +146,411 @@ class Elasticsearch(metaclass=Singleton):
             self.logger.error(f"Error executing search query: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    async def search(self, request: ESSearchRequest) -> ElasticsearchResponse:
+    async def iter_async_scan(
+        self, request: ESBaseRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Execute a search query on Elasticsearch.
+        Yield every matching hit one by one without buffering them.
+
+        When the body defines a `sort` (which must end with a unique
+        tiebreaker) and the cluster supports it, hits are read from a
+        point-in-time with search_after; otherwise a scroll is used. The next
+        page is only requested once the consumer has processed the current
+        one, so memory stays bounded by `size`. The context is released when
+        the scan ends, fails, is closed early or its task is cancelled.
         """
         try:
-            response = await self.client.search(**request.model_dump())
-            scroll_id = response["_scroll_id"]
+            pit_id = None
+            if self._point_in_time_supported and "sort" in request.body:
+                pit_id = await self._open_point_in_time(request)
+            if pit_id:
+                scan = self._scan_point_in_time(request, pit_id)
+            else:
+                scan = self._scan_scroll(request)
+            async with aclosing(scan):
+                async for hit in scan:
+                    yield hit
+        except Exception as e:
+            self.logger.error(f"Error executing scan query: {e}")
+            raise
+
+    async def _scan_scroll(self, request: ESBaseRequest) -> AsyncIterator[dict]:
+        # Scrolls are fastest in index order; a scan never preserves scores.
+        body = {**request.body, "size": request.size, "sort": "_doc"}
+        response = await self._call(
+            "search",
+            request.request_timeout,
+            retry=False,
+            index=request.index,
+            body=body,
+            scroll=request.scroll,
+        )
+        scroll_id = response.get("_scroll_id")
+        if scroll_id:
+            self.open_scroll_contexts.inc()
+        try:
+            while scroll_id and response["hits"]["hits"]:
+                self._check_shards(response)
+                for hit in response["hits"]["hits"]:
+                    yield hit
+                response = await self._call(
+                    "scroll",
+                    request.request_timeout,
+                    retry=False,
+                    body={"scroll_id": scroll_id, "scroll": request.scroll},
+                )
+                scroll_id = response.get("_scroll_id") or scroll_id
+        finally:
+            if scroll_id:
+                await self._release_context(self.clear_scroll(scroll_id))
+
+    async def _scan_point_in_time(
+        self, request: ESBaseRequest, pit_id: str
+    ) -> AsyncIterator[dict]:
+        self.open_scroll_contexts.inc()
+        search_after = None
+        try:
             while True:
-                scroll_response = await self.client.scroll(
-                    scroll_id=scroll_id, scroll="1m"
+                body = {
+                    **request.body,
+                    "size": request.size,
+                    "pit": {"id": pit_id, "keep_alive": request.scroll},
+                    "track_total_hits": False,
+                }
+                if search_after:
+                    body["search_after"] = search_after
+                response = await self._call(
+                    "search", request.request_timeout, body=body
                 )
-                if not scroll_response["hits"]["hits"]:
+                self._check_shards(response)
+                pit_id = response.get("pit_id") or pit_id
+                hits = response["hits"]["hits"]
+                for hit in hits:
+                    yield hit
+                if len(hits) < request.size:
                     break
+                search_after = hits[-1]["sort"]
+        finally:
+            await self._release_context(self.delete_point_in_time(pit_id))
+
+    async def _open_point_in_time(self, request: ESBaseRequest) -> Optional[str]:
+        try:
+            response = await self._call(
+                "create_pit",
+                request.request_timeout,
+                retry=False,
+                index=request.index,
+                keep_alive=request.scroll,
+            )
+            return response["pit_id"]
+        except TransportError as e:
+            # Other errors, e.g. a 404 for an index missing mid-reindex, say
+            # nothing about the cluster supporting point-in-time
+            if not _point_in_time_unsupported(e):
+                raise
+            self._point_in_time_supported = False
+            self.logger.warning(f"Point-in-time unavailable, using scroll: {e}")
+            return None
+
+    async def _release_context(self, release: Awaitable):
+        """
+        Release a scroll/PIT context even if the scanning task was cancelled:
+        the release runs in its own shielded task.
+        """
+        try:
+            await asyncio.shield(asyncio.ensure_future(release))
+        finally:
+            self.open_scroll_contexts.dec()
+
+    @staticmethod
+    def _check_shards(response: dict):
+        shards = response.get("_shards") or {}
+        successful = shards.get("successful", 0) + shards.get("skipped", 0)
+        if successful < shards.get("total", 0):
+            raise ScanError(
+                response.get("_scroll_id"),
+                f"Search succeeded on {successful} of {shards['total']} shards.",
+            )
+
+    async def search_page(self, request: ESSearchRequest) -> ElasticsearchResponse:
+        """
+        Fetch a single page of results with `from`/`size` or `search_after`.
 
-                return ElasticsearchResponse(
-                    hits=scroll_response["hits"]["hits"],
-                    total=scroll_response["hits"]["total"]["value"],
+        The body must define a deterministic `sort` when `search_after` is
+        used. Each hit keeps its `sort` values so callers can build the
+        cursor for the next page.
+        """
+        body = {**request.body, "size": request.size}
+        if request.search_after:
+            body["search_after"] = request.search_after
+        elif request.from_:
+            body["from"] = request.from_
+        try:
+            response = await self._call(
+                "search",
+                request.request_timeout,
+                hedge=True,
+                index=request.index,
+                body=body,
+            )
+            hits = response["hits"]["hits"]
+            # `total` is left out of the response when track_total_hits is off
+            total = response["hits"].get("total", {}).get("value", len(hits))
+            return ElasticsearchResponse(hits=hits, total=total)
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error executing search query: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    async def msearch(
+        self,
+        index: str,
+        bodies: List[Dict[str, Any]],
+        max_concurrent_searches: Optional[int] = None,
+        request_timeout: Optional[float] = None,
+    ) -> List[ElasticsearchResponse]:
+        """
+        Execute several searches on the same index in one _msearch round trip.
+
+        Returns one response per body, in the same order.
+        """
+        payload = []
+        for body in bodies:
+            payload.append({"index": index})
+            payload.append(body)
+        try:
+            response = await self._call(
+                "msearch",
+                request_timeout,
+                hedge=True,
+                body=payload,
+                max_concurrent_searches=max_concurrent_searches,
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error executing msearch query: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+        results = []
+        for item in response["responses"]:
+            if "error" in item:
+                self.logger.error(f"Error executing msearch query: {item['error']}")
+                raise HTTPException(status_code=500, detail="Internal Server Error")
+            results.append(
+                ElasticsearchResponse(
+                    hits=item["hits"]["hits"], total=item["hits"]["total"]["value"]
                 )
+            )
+        return results
 
-            return ElasticsearchResponse(
-                hits=response["hits"]["hits"], total=response["hits"]["total"]["value"]
+    async def search(self, request: ESSearchRequest) -> ElasticsearchResponse:
+        """
+        Execute a search query on Elasticsearch, following its scroll until
+        every hit has been fetched. The scroll context is always cleared.
+        """
+        scroll_id = None
+        try:
+            response = await self._call(
+                "search",
+                request.request_timeout,
+                retry=False,
+                index=request.index,
+                body={**request.body, "size": request.size},
+                scroll=request.scroll,
             )
+            scroll_id = response.get("_scroll_id")
+            if scroll_id:
+                self.open_scroll_contexts.inc()
+            hits = list(response["hits"]["hits"])
+            total = response["hits"]["total"]["value"]
+            while scroll_id and len(hits) < total:
+                response = await self._call(
+                    "scroll",
+                    request.request_timeout,
+                    retry=False,
+                    body={"scroll_id": scroll_id, "scroll": request.scroll},
+                )
+                scroll_id = response.get("_scroll_id") or scroll_id
+                if not response["hits"]["hits"]:
+                    break
+                hits.extend(response["hits"]["hits"])
+
+            return ElasticsearchResponse(hits=hits, total=total)
+        except HTTPException:
+            raise
         except ValidationError as e:
             self.logger.error(f"Error validating search request: {e}")
             raise HTTPException(status_code=400, detail="Invalid search request")
         except Exception as e:
             self.logger.error(f"Error executing search query: {e}")
             raise
+        finally:
+            if scroll_id:
+                await self._release_context(self.clear_scroll(scroll_id))
+
+    async def aggregate(
+        self,
+        index: str,
+        aggs: Dict[str, Any],
+        query: Optional[Dict[str, Any]] = None,
+        request_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run aggregations without fetching any document (`size=0`).
+
+        Args:
+            index (str): nome do index
+            aggs (dict): corpo da agregação
+            query (dict): corpo da query, todos os documentos por padrão
+            request_timeout (float): tempo máximo da chamada, limitado pelo
+                deadline da requisição
+
+        Returns:
+            dict: resultado da agregação
+        """
+        body = {"size": 0, "aggs": aggs, "track_total_hits": True}
+        if query:
+            body["query"] = query
+        try:
+            response = await self._call(
+                "search", request_timeout, hedge=True, index=index, body=body
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error executing aggregation query: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+        return {
+            "total": response["hits"]["total"]["value"],
+            **response["aggregations"],
+        }
+
+    async def bulk(
+        self,
+        body: bytes,
+        request_timeout: Optional[float] = None,
+        refresh: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send a prepared NDJSON `_bulk` body and return the result of each
+        action. Failed actions are reported in their item, not raised.
+
+        Bulk actions must carry an explicit `_id`, so that the whole request
+        can be safely retried. With `refresh="wait_for"` the call returns once
+        the changes are visible to searches.
+        """
+        params = {"refresh": refresh} if refresh else {}
+        try:
+            response = await self._call("bulk", request_timeout, body=body, **params)
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error executing bulk request: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+        return [next(iter(item.values())) for item in response["items"]]
+
+    async def get_index_setting(self, index: str, name: str) -> Optional[Any]:
+        """Current value of an index setting, e.g. `refresh_interval`."""
+        response = await self._call(
+            "indices.get_settings", None, index=index, name=f"index.{name}"
+        )
+        return next(
+            (
+                data["settings"]["index"][name]
+                for data in response.values()
+                if name in data["settings"].get("index", {})
+            ),
+            None,
+        )
+
+    async def put_index_settings(self, index: str, index_settings: Dict[str, Any]):
+        await self._call(
+            "indices.put_settings", None, index=index, body={"index": index_settings}
+        )
+
+    async def refresh(self, index: str):
+        await self._call("indices.refresh", None, index=index)
+
+    async def create_index(
+        self, index: str, mappings: Dict[str, Any], index_settings: Dict[str, Any]
+    ):
+        await self._call(
+            "indices.create",
+            None,
+            retry=False,
+            index=index,
+            body={"settings": {"index": index_settings}, "mappings": mappings},
+        )
+
+    async def delete_index(self, index: str):
+        await self._call("indices.delete", None, index=index, ignore_unavailable=True)
+
+    async def wait_for_green(self, index: str, timeout: float) -> bool:
+        """
+        Wait up to `timeout` seconds for every shard of `index`, replicas
+        included, to be allocated. Returns False if it timed out.
+        """
+        try:
+            response = await self._call(
+                "cluster.health",
+                timeout + 10,
+                retry=False,
+                index=index,
+                wait_for_status="green",
+                timeout=f"{int(timeout)}s",
+            )
+        except TransportError as e:
+            if e.status_code == 408:
+                return False
+            raise
+        return not response.get("timed_out", False)
+
+    async def count(self, index: str) -> int:
+        response = await self._call("count", None, index=index)
+        return response["count"]
+
+    async def index_exists(self, index: str) -> bool:
+        """Whether `index` names an index or an alias."""
+        return await self._call("indices.exists", None, index=index)
+
+    async def get_alias(self, alias: str) -> List[str]:
+        """Indices behind `alias`, empty when there is no such alias."""
+        if not await self._call("indices.exists_alias", None, name=alias):
+            return []
+        response = await self._call("indices.get_alias", None, name=alias)
+        return sorted(response)
+
+    async def update_aliases(self, actions: List[Dict[str, Any]]):
+        """Apply alias `actions` atomically, readers see all of them or none."""
+        await self._call("indices.update_aliases", None, body={"actions": actions})
+
+    async def reindex(self, source: str, dest: str, timeout: float) -> Dict[str, Any]:
+        """Copy every document of `source` into `dest` server-side."""
+        return await self._call(
+            "reindex",
+            timeout,
+            retry=False,
+            body={"source": {"index": source}, "dest": {"index": dest}},
+            wait_for_completion=True,
+        )
+
+    async def delete_point_in_time(self, pit_id: str):
+        """Release a point-in-time, ignoring ones that already expired."""
+        try:
+            await self.client.delete_pit(body={"pit_id": [pit_id]}, ignore=(404,))
+        except Exception as e:
+            self.logger.warning(f"Error deleting point-in-time: {e}")
+
+    async def clear_scroll(self, scroll_id: str):
+        """Release a scroll context, ignoring contexts that already expired."""
+        try:
+            await self.client.clear_scroll(
+                body={"scroll_id": [scroll_id]}, ignore=(404,)
+            )
+        except Exception as e:
+            self.logger.warning(f"Error clearing scroll context: {e}")
 
     @staticmethod
     def build_match_query(
@@ -133,26 +599,44 @@ class Elasticsearch(metaclass=Singleton):
             query = {"bool": {"minimum_should_match": 1, "should": queries_should_list}}
         return query
 
-    def scan_with_aggs(self, index, query, aggs):
+    async def scan_with_aggs(self, index, query, aggs, scroll="1m"):
         """Faz um scan com agregações
 
         Args:
             index (str): nome do index
             query (dict): corpo da query
             aggs (dict): corpo da agregação
+            scroll (str): tempo de vida do contexto de scroll
 
         Returns:
             first: resultado da agregação
-            second: resultado da query
+            second: resultado da query, uma página de hits por vez
         """
-        result = self.client.search(
-            index=index, query=query, aggregations=aggs, scroll="1m", source=False
+        result = await self._call(
+            "search",
+            None,
+            retry=False,
+            index=index,
+            body={"query": query, "aggs": aggs, "_source": False},
+            scroll=scroll,
         )
-        yield result["aggregations"]
-        yield result["hits"]["hits"]
-        scroll_id = result["_scroll_id"]
-        while True:
-            result = self.client.scroll(scroll_id=scroll_id, scroll="1m")
-            if not result["hits"]["hits"]:
-                break
+        scroll_id = result.get("_scroll_id")
+        if scroll_id:
+            self.open_scroll_contexts.inc()
+        try:
+            yield result["aggregations"]
             yield result["hits"]["hits"]
+            while scroll_id:
+                result = await self._call(
+                    "scroll",
+                    None,
+                    retry=False,
+                    body={"scroll_id": scroll_id, "scroll": scroll},
+                )
+                scroll_id = result.get("_scroll_id") or scroll_id
+                if not result["hits"]["hits"]:
+                    break
+                yield result["hits"]["hits"]
+        finally:
+            if scroll_id:
+                await self._release_context(self.clear_scroll(scroll_id))
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any
+
+import aiohttp
+from opensearchpy import AsyncHttpConnection
+from opensearchpy._async.http_aiohttp import OpenSearchClientResponse
+
+from utils.metrics import metrics
+
+
+class PooledAsyncHttpConnection(AsyncHttpConnection):
+    """
+    AsyncHttpConnection with a configurable keep-alive for idle pooled
+    sockets and usage counters for sizing the pool.
+
+    One instance exists per OpenSearch node; each one owns an aiohttp
+    connector of up to `maxsize` sockets.
+    """
+
+    def __init__(self, *args, keepalive_timeout: float = 15.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.keepalive_timeout = keepalive_timeout
+        self.in_flight = 0
+        self.requests = metrics.counter(
+            "elastic_pool_requests", "Requests sent to OpenSearch"
+        )
+        self.saturated = metrics.counter(
+            "elastic_pool_saturated",
+            "Requests that had to wait for a free pooled connection",
+        )
+
+    async def perform_request(self, *args, **kwargs) -> Any:
+        self.requests.inc()
+        if self.in_flight >= self._limit:
+            self.saturated.inc()
+        self.in_flight += 1
+        try:
+            return await super().perform_request(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    async def _create_aiohttp_session(self) -> Any:
+        # Mirrors AsyncHttpConnection._create_aiohttp_session, adding the
+        # keep-alive of idle sockets, which the parent leaves to aiohttp.
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            skip_auto_headers=("accept", "accept-encoding"),
+            auto_decompress=True,
+            loop=self.loop,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            response_class=OpenSearchClientResponse,
+            connector=aiohttp.TCPConnector(
+                limit=self._limit,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                enable_cleanup_closed=True,
+                ssl=self._ssl_context,
+            ),
+            trust_env=self._trust_env,
+        )
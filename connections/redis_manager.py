@@ -1,16 +1,20 @@
-import json
+import asyncio
 from os import environ
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from google.cloud import redis_v1beta1
 from pydantic import BaseModel, Field, field_validator
-from redis import ConnectionPool, Redis
-from redis.exceptions import RedisError
-from rediscluster import RedisCluster, RedisClusterException
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis, RedisCluster
+from redis.asyncio.connection import SSLConnection
+from redis.asyncio.lock import Lock
+from redis.exceptions import RedisClusterException, RedisError
 
 from config import settings
+from utils import cache_codec
+from utils.local_cache import LocalCache
 from utils.logger import Logger
 from utils.singleton import Singleton
+from utils.timing import timed_stage
 
 
 class RedisInstanceData(BaseModel):
@@ -52,7 +56,7 @@ class RedisConnectionGoogleInstance:
 
 
 class RedisConnectionFactory:
-    _pool: ConnectionPool = None
+    _pool: BlockingConnectionPool = None
     _ssl_environ: str = "SSL_CERT_FILE"
     _ca_path: str = "/tmp/redis_ca.pem"
 
@@ -67,14 +71,21 @@ class RedisConnectionFactory:
         environ[cls._ssl_environ] = ca_path
 
     @classmethod
-    async def pool(cls, nodes: List[dict], ssl: bool) -> ConnectionPool:
+    def pool(cls, host: str, port: int, ssl: bool) -> BlockingConnectionPool:
         if cls._pool:
             return cls._pool
 
-        cls._pool = ConnectionPool(
-            startup_nodes=nodes,
-            decode_responses=True,
-            ssl=ssl,
+        connection_kwargs = {}
+        if ssl:
+            connection_kwargs["connection_class"] = SSLConnection
+            connection_kwargs["ssl_ca_certs"] = cls._ca_path
+        cls._pool = BlockingConnectionPool(
+            host=host,
+            port=port,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            **connection_kwargs,
         )
         return cls._pool
 
@@ -84,15 +95,33 @@ class RedisConnectionFactory:
             cls.save_certificate(data.ca_data)
             cls.activate_certificate()
 
-        return Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+        pool = cls.pool(
+            host=settings.REDIS_HOST, port=settings.REDIS_PORT, ssl=data.ssl
+        )
+        return Redis(connection_pool=pool)
+
+
+def _escape_glob(pattern: str) -> str:
+    for char in "\\*?[]":
+        pattern = pattern.replace(char, f"\\{char}")
+    return pattern
 
 
 class RedisManager(metaclass=Singleton):
     def __init__(self):
         self.redis_client = None
         self.logger = Logger()
+        self.local_cache = None
+        self._invalidation_handlers: Dict[str, Callable[[str], None]] = {}
+        if settings.LOCAL_CACHE_ENABLED:
+            self.local_cache = LocalCache(
+                max_items=settings.LOCAL_CACHE_MAX_ITEMS,
+                max_bytes=settings.LOCAL_CACHE_MAX_BYTES,
+                ttl=settings.LOCAL_CACHE_TTL,
+                name="local_cache",
+            )
 
-    def initialize(self):
+    async def initialize(self):
         """Initializes the RedisCluster connection."""
         if self.redis_client is None:
             try:
@@ -100,8 +129,9 @@ class RedisManager(metaclass=Singleton):
                 if settings.REDIS_URL:
                     self.redis_client = RedisCluster.from_url(
                         url=settings.REDIS_URL,
-                        decode_responses=True,
-                        skip_full_coverage_check=True,
+                        require_full_coverage=False,
+                        max_connections=settings.REDIS_MAX_CONNECTIONS,
+                        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
                     )
                 # Initialize Redis connection with Google instance path
                 elif settings.REDIS_INSTANCE_PATH:
@@ -111,59 +141,257 @@ class RedisManager(metaclass=Singleton):
                     )
                     instance_data = google_instance.get_connection_data()
                     self.redis_client = RedisConnectionFactory.new(instance_data)
-                self.redis_client.ping()
+                await self.redis_client.ping()
                 self.logger.info("RedisCluster connection initialized successfully.")
             except RedisClusterException as e:
                 self.logger.warning(f"Error initializing RedisCluster connection: {e}")
+                await self.redis_client.aclose()
                 if settings.REDIS_URL:
-                    self.redis_client = Redis.from_url(
+                    pool = BlockingConnectionPool.from_url(
                         url=settings.REDIS_URL,
-                        decode_responses=True,
+                        max_connections=settings.REDIS_MAX_CONNECTIONS,
+                        timeout=settings.REDIS_POOL_TIMEOUT,
+                        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
                     )
+                    self.redis_client = Redis(connection_pool=pool)
                 elif settings.REDIS_INSTANCE_PATH:
                     instance_path = settings.REDIS_INSTANCE_PATH
                     google_instance = RedisConnectionGoogleInstance(instance_path)
                     instance_data = google_instance.get_connection_data()
                     self.redis_client = RedisConnectionFactory.new(instance_data)
-                self.redis_client.ping()
+                await self.redis_client.ping()
                 self.logger.info("Redis connection initialized successfully.")
             except RedisError as e:
                 self.logger.error(f"Error initializing Redis connection: {e}")
                 raise
 
-    def close(self):
+    async def close(self):
         """Closes the RedisCluster connection."""
         if self.redis_client is not None:
-            self.redis_client.close()
+            await self.redis_client.aclose()
             self.logger.info("Redis connection closed.")
             self.redis_client = None
 
-    def set(self, key: str, value: str, ex: Optional[int] = None):
-        """Sets a key-value pair in Redis."""
+    async def set(self, key: str, value: str, ex: Optional[int] = None):
+        """Sets a key-value pair in Redis and in the local cache."""
         try:
-            serialized = json.dumps(value) if value else ""
-            self.redis_client.set(key, serialized, ex=ex)
+            serialized = cache_codec.encode(value) if value else b""
+            await self.redis_client.set(key, serialized, ex=ex)
             self.logger.debug(f"Key '{key}' set with expiration {ex}.")
         except RedisError as e:
             self.logger.error(f"Error setting value for key '{key}': {e}")
             raise
+        if self.local_cache is not None and value:
+            ttl = min(settings.LOCAL_CACHE_TTL, ex) if ex else None
+            self.local_cache.set(key, value, size=len(serialized), ttl=ttl)
+
+    @timed_stage("cache")
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Gets a value by key from the local cache, falling back to Redis. Values
+        read from Redis are kept locally for at most their remaining Redis TTL.
+        """
+        if self.local_cache is None:
+            try:
+                raw_value = await self.redis_client.get(key)
+            except RedisError as e:
+                self.logger.error(f"Error getting value for key '{key}': {e}")
+                return None
+            return cache_codec.decode(raw_value) if raw_value else None
 
-    def get(self, key: str) -> Optional[str]:
-        """Gets a value by key from Redis."""
+        value = self.local_cache.get(key)
+        if value is not None:
+            return value
         try:
-            raw_value = self.redis_client.get(key)
-            value = json.loads(raw_value) if raw_value else None
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                raw_value, pttl = await pipe.execute()
+            value = cache_codec.decode(raw_value) if raw_value else None
             self.logger.debug(f"Value retrieved for key '{key}'.")
-            return value
         except RedisError as e:
             self.logger.error(f"Error getting value for key '{key}': {e}")
             return None
+        if value is not None:
+            self._set_local(key, value, raw_value, pttl)
+        return value
+
+    def _set_local(self, key: str, value: Any, raw_value: bytes, pttl: int):
+        # PTTL is -1 for keys without expiration; 0 or less means expired
+        if pttl == -1:
+            ttl = None
+        elif pttl > 0:
+            ttl = min(settings.LOCAL_CACHE_TTL, pttl / 1000)
+        else:
+            return
+        self.local_cache.set(key, value, size=len(raw_value), ttl=ttl)
+
+    @timed_stage("cache")
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Gets several keys in one round trip, in the same order. Missing keys
+        (and every key, if Redis fails) are returned as None.
+        """
+        values: List[Optional[Any]] = [None] * len(keys)
+        missing = []
+        for position, key in enumerate(keys):
+            if self.local_cache is not None:
+                values[position] = self.local_cache.get(key)
+            if values[position] is None:
+                missing.append(position)
+        if not missing:
+            return values
+        try:
+            # A non-transactional pipeline works across cluster slots, unlike MGET
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for position in missing:
+                    pipe.get(keys[position])
+                    if self.local_cache is not None:
+                        pipe.pttl(keys[position])
+                results = await pipe.execute()
+        except RedisError as e:
+            self.logger.error(f"Error getting values for {len(missing)} keys: {e}")
+            return values
+        if self.local_cache is None:
+            raw_values, pttls = results, [None] * len(results)
+        else:
+            raw_values, pttls = results[::2], results[1::2]
+        for position, raw_value, pttl in zip(missing, raw_values, pttls):
+            if not raw_value:
+                continue
+            values[position] = cache_codec.decode(raw_value)
+            if self.local_cache is not None:
+                self._set_local(keys[position], values[position], raw_value, pttl)
+        return values
+
+    async def mset(self, mapping: Dict[str, Any], ex: Optional[int] = None):
+        """Sets several key-value pairs in one round trip."""
+        serialized = {key: cache_codec.encode(value) for key, value in mapping.items()}
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, raw_value in serialized.items():
+                    pipe.set(key, raw_value, ex=ex)
+                await pipe.execute()
+        except RedisError as e:
+            self.logger.error(f"Error setting values for {len(mapping)} keys: {e}")
+            raise
+        if self.local_cache is not None:
+            ttl = min(settings.LOCAL_CACHE_TTL, ex) if ex else None
+            for key, value in mapping.items():
+                self.local_cache.set(key, value, size=len(serialized[key]), ttl=ttl)
 
-    def delete(self, key: str):
-        """Deletes a key from Redis."""
+    async def delete(self, key: str):
+        """Deletes a key from Redis and from the local cache of every worker."""
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
         try:
-            self.redis_client.delete(key)
+            await self.redis_client.delete(key)
             self.logger.debug(f"Key '{key}' deleted.")
         except RedisError as e:
             self.logger.error(f"Error deleting key '{key}': {e}")
             raise
+        if self.local_cache is not None:
+            await self.publish_invalidation(key)
+
+    async def delete_prefix(self, prefix: str, batch_size: int = 1000) -> int:
+        """
+        Deletes every key starting with `prefix` from Redis and from the local
+        cache of every worker. Returns the number of keys deleted from Redis.
+        """
+        if self.local_cache is not None:
+            self.local_cache.delete_prefix(prefix)
+        deleted = 0
+        keys = []
+        try:
+            async for key in self.redis_client.scan_iter(
+                match=f"{_escape_glob(prefix)}*", count=batch_size
+            ):
+                keys.append(key)
+                if len(keys) >= batch_size:
+                    deleted += await self.redis_client.unlink(*keys)
+                    keys = []
+            if keys:
+                deleted += await self.redis_client.unlink(*keys)
+            self.logger.debug(f"{deleted} keys with prefix '{prefix}' deleted.")
+        except RedisError as e:
+            self.logger.error(f"Error deleting keys with prefix '{prefix}': {e}")
+            raise
+        if self.local_cache is not None:
+            await self.publish_invalidation(f"{prefix}*")
+        return deleted
+
+    async def publish_invalidation(self, key: str):
+        """
+        Asks the other workers to evict `key` from their local cache. A key
+        ending with `*` evicts every key with that prefix. Keys starting with
+        an `on_invalidation` prefix are passed to its handler instead.
+        """
+        try:
+            await self.redis_client.execute_command(
+                "PUBLISH", settings.CACHE_INVALIDATION_CHANNEL, key
+            )
+        except RedisError as e:
+            self.logger.warning(f"Error publishing invalidation of '{key}': {e}")
+
+    def on_invalidation(self, prefix: str, handler: Callable[[str], None]):
+        """
+        Routes the messages published on the invalidation channel starting
+        with `prefix` to `handler`, called with the rest of the message in
+        every worker, instead of evicting them from the local cache. Used for
+        in-process state other than the local cache.
+        """
+        self._invalidation_handlers[prefix] = handler
+
+    def apply_invalidation(self, key: str):
+        """Applies one message of the invalidation channel to this worker."""
+        for prefix, handler in self._invalidation_handlers.items():
+            if key.startswith(prefix):
+                handler(key[len(prefix):])
+                return
+        if self.local_cache is None:
+            return
+        if key.endswith("*"):
+            self.local_cache.delete_prefix(key[:-1])
+        else:
+            self.local_cache.delete(key)
+
+    async def listen_invalidations(self, retry_interval: float = 1.0):
+        """
+        Applies every message published on the invalidation channel: local
+        cache evictions and the messages of `on_invalidation` handlers. Runs
+        until cancelled, reconnecting on Redis errors.
+        """
+        while True:
+            client = self._pubsub_client()
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    try:
+                        self.apply_invalidation(message["data"].decode())
+                    except Exception as e:
+                        self.logger.error(f"Error applying invalidation: {e}")
+            except RedisError as e:
+                self.logger.warning(f"Cache invalidation listener failed: {e}")
+            finally:
+                await pubsub.aclose()
+                if client is not self.redis_client:
+                    await client.aclose()
+            await asyncio.sleep(retry_interval)
+
+    def _pubsub_client(self) -> Redis:
+        # Cluster PUBLISH reaches every node, so any node can be subscribed to.
+        if isinstance(self.redis_client, RedisCluster):
+            node = self.redis_client.get_default_node()
+            # Same credentials and SSL settings as the cluster connections,
+            # but no socket timeout: the subscription is idle between messages
+            pool = ConnectionPool(
+                connection_class=node.connection_class,
+                **{**node.connection_kwargs, "socket_timeout": None},
+            )
+            return Redis(connection_pool=pool)
+        return self.redis_client
+
+    def lock(self, key: str, timeout: float) -> Lock:
+        """Returns a non-blocking distributed lock that expires after `timeout`."""
+        return self.redis_client.lock(f"lock:{key}", timeout=timeout, blocking=False)
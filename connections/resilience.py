@@ -0,0 +1,218 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from opensearchpy import ConnectionError, TransportError
+
+from utils.deadline import remaining_time
+from utils.exceptions import RequestDeadlineExceeded, SearchUnavailable
+from utils.logger import Logger
+from utils.metrics import metrics
+
+T = TypeVar("T")
+
+# Status codes meaning the cluster is overloaded or degraded, as opposed to
+# a bad request: worth retrying and counted by the circuit breaker.
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, ConnectionError):
+        return True
+    return (
+        isinstance(error, TransportError)
+        and error.status_code in RETRYABLE_STATUS_CODES
+    )
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failures. Once open, it
+    lets a single trial call through every `reset_timeout` seconds and closes
+    again when one succeeds.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        metrics.gauge(
+            f"{name}_circuit_state",
+            "0 = closed, 1 = open, 2 = half-open",
+            lambda: self.state,
+        )
+        self.rejected = metrics.counter(
+            f"{name}_circuit_rejected", "Calls rejected while the circuit was open"
+        )
+
+    def before_call(self):
+        """Raises SearchUnavailable if the call must not be attempted."""
+        if self.state == self.CLOSED:
+            return
+        if (
+            self.state == self.OPEN
+            and time.monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            self.state = self.HALF_OPEN
+            return
+        self.rejected.inc()
+        raise SearchUnavailable()
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+
+    def record_abort(self):
+        """The call ended without an answer (e.g. it was cancelled)."""
+        if self.state == self.HALF_OPEN:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+
+class LatencyWindow:
+    """Latencies of the last `size` successful calls."""
+
+    def __init__(self, size: int = 1000):
+        self._samples = deque(maxlen=size)
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int) -> Optional[float]:
+        if len(self._samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class ResiliencePolicy:
+    """
+    Runs calls to a backend with a per-call timeout derived from the request
+    deadline, jittered retries of idempotent calls, optional hedging and a
+    circuit breaker.
+
+    Calls are given as `func(timeout)` factories so that every attempt gets
+    the time actually left. Transient failures that outlive the retries are
+    raised as SearchUnavailable (503), or RequestDeadlineExceeded (504) once
+    the request deadline has passed; any other error is raised unchanged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        default_timeout: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        failure_threshold: int,
+        reset_timeout: float,
+        hedging_enabled: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 50,
+    ):
+        self.logger = Logger()
+        self.default_timeout = default_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedging_enabled = hedging_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self.latency = LatencyWindow()
+        self.retries = metrics.counter(f"{name}_retries", "Retried calls")
+        self.hedges = metrics.counter(f"{name}_hedges", "Hedged calls")
+
+    async def call(
+        self,
+        func: Callable[[float], Awaitable[T]],
+        timeout: Optional[float] = None,
+        retry: bool = True,
+        hedge: bool = False,
+    ) -> T:
+        attempt = 0
+        while True:
+            attempt_timeout = remaining_time(timeout or self.default_timeout)
+            if attempt_timeout <= 0:
+                raise RequestDeadlineExceeded()
+            self.breaker.before_call()
+            started = time.monotonic()
+            settled = False
+            try:
+                if hedge and self.hedging_enabled:
+                    result = await self._hedged(func, attempt_timeout)
+                else:
+                    result = await func(attempt_timeout)
+                settled = True
+            except Exception as e:
+                settled = True
+                if not is_retryable(e):
+                    # The backend answered; a client error says nothing about its health
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                left = remaining_time(timeout or self.default_timeout)
+                if left <= 0:
+                    raise RequestDeadlineExceeded() from e
+                attempt += 1
+                delay = random.uniform(
+                    0, min(self.backoff_max, self.backoff_base * 2**attempt)
+                )
+                if not retry or attempt > self.max_retries or delay >= left:
+                    self.logger.error(f"Backend unavailable: {e}")
+                    raise SearchUnavailable() from e
+                self.retries.inc()
+                self.logger.warning(f"Retrying call in {delay:.3f}s after: {e}")
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                # A half-open trial must always end, or the breaker never closes
+                if not settled:
+                    self.breaker.record_abort()
+            self.latency.observe(time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _hedged(self, func: Callable[[float], Awaitable[T]], timeout: float) -> T:
+        """
+        Sends a second, identical call if the first one is slower than the
+        configured latency percentile, and returns whichever succeeds first.
+        """
+        hedge_delay = self.latency.percentile(
+            self.hedge_percentile, self.hedge_min_samples
+        )
+        if hedge_delay is None or hedge_delay >= timeout:
+            return await func(timeout)
+
+        pending = {asyncio.ensure_future(func(timeout))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                self.hedges.inc()
+                pending.add(asyncio.ensure_future(func(timeout - hedge_delay)))
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                task = done.pop()
+                if task.exception() is None or not pending and not done:
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,15 @@
+from enum import Enum
+
+# Bump whenever the layout of cached values changes, so that entries written
+# by older releases are never read back.
+CACHE_SCHEMA_VERSION = 3
+
+
+class CacheNamespace(str, Enum):
+    """Key prefixes of the cached endpoints, used for targeted invalidation."""
+
+    movies_list = "v1:movies:list"
+    movies_search = "v1:movies:search"
+    movies_stats = "v1:movies:stats"
+    movie_by_id = "v1:movies:id"
+    movie_by_imdb_id = "v1:movies:imdb_id"
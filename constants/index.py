@@ -2,6 +2,11 @@ from enum import Enum
 
 
 class Index(str, Enum):
+    # `movie` is an alias to a versioned index, swapped by reindex.py
     movie = "movie"
     genre = "genre"
     director = "director"
+
+
+# Default `index.max_result_window`: from + size can never go past it.
+MAX_RESULT_WINDOW = 10000
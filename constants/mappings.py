@@ -0,0 +1,26 @@
+# Mappings of the physical movie indices, created behind the `movie` alias.
+MOVIE_MAPPINGS = {
+    "properties": {
+        "id": {"type": "integer"},
+        "imdb_id": {"type": "keyword"},
+        "title": {
+            "type": "text",
+            "fields": {"keyword": {"type": "keyword"}},
+        },
+        "title_normalized": {
+            "type": "text",
+            "fields": {
+                "keyword": {"type": "keyword"},
+                "suggest": {"type": "search_as_you_type"},
+            },
+        },
+        "release_year": {"type": "integer"},
+        "genre": {"type": "keyword"},
+        "director": {"type": "keyword"},
+        "additional_data": {"type": "object", "enabled": True},
+    }
+}
+
+# Index settings while a new index is loaded: no refreshes and no replicas to
+# keep in sync. Both are restored before the index is swapped in.
+BULK_BUILD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
@@ -0,0 +1,67 @@
+"""Load movies into the OpenSearch index.
+
+Reads an NDJSON (one movie per line, `_bulk` action lines allowed) or CSV
+file, computes `title_normalized` with the API's own normalization and
+writes it with concurrent `_bulk` requests.
+
+Usage:
+    python ingest.py movies.json --concurrency 8 --batch-size 2000
+"""
+
+import argparse
+import asyncio
+
+from config import settings
+from connections.elastic import Elasticsearch
+from constants.index import Index
+from services.ingestion import IngestionService, read_movies
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="NDJSON or .csv file with the movies")
+    parser.add_argument("--index", default=Index.movie.value)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE)
+    parser.add_argument(
+        "--max-batch-bytes", type=int, default=settings.INGEST_MAX_BATCH_BYTES
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.INGEST_CONCURRENCY
+    )
+    parser.add_argument(
+        "--max-retries", type=int, default=settings.INGEST_MAX_RETRIES
+    )
+    parser.add_argument(
+        "--keep-refresh",
+        action="store_true",
+        help="Keep index refreshes enabled during the load",
+    )
+    return parser.parse_args()
+
+
+async def main(args):
+    elastic = Elasticsearch()
+    await elastic.initialize()
+    try:
+        service = IngestionService(
+            index=args.index,
+            batch_size=args.batch_size,
+            max_batch_bytes=args.max_batch_bytes,
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+        )
+        report = await service.ingest(
+            read_movies(args.source), pause_refresh=not args.keep_refresh
+        )
+    finally:
+        await elastic.close()
+    print(
+        f"{report.indexed}/{report.read} movies indexed in {report.seconds:.1f}s "
+        f"({report.docs_per_second:.0f} docs/s): {report.invalid} invalid, "
+        f"{report.failed} failed, {report.retried} retried"
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main(parse_args())))
@@ -7,9 +7,14 @@ until curl -s http://localhost:9200/_cluster/health | grep -q '"status":"green"\
   sleep 2
 done
 
-# Create the 'movie' index with a mapping that includes a .keyword field for title
-curl -X PUT "localhost:9200/movie" -H 'Content-Type: application/json' -d'
+# Create the first versioned movie index behind the 'movie' alias, so that
+# reindex.py can later build a new one and swap the alias without downtime.
+# Keep the mappings in sync with constants/mappings.py
+curl -X PUT "localhost:9200/movie_v1" -H 'Content-Type: application/json' -d'
 {
+  "aliases": {
+    "movie": {}
+  },
   "mappings": {
     "properties": {
       "id": { "type": "integer" },
@@ -20,7 +25,13 @@ curl -X PUT "localhost:9200/movie" -H 'Content-Type: application/json' -d'
           "keyword": { "type": "keyword" }
         }
       },
-      "title_normalized": { "type": "text" },
+      "title_normalized": {
+        "type": "text",
+        "fields": {
+          "keyword": { "type": "keyword" },
+          "suggest": { "type": "search_as_you_type" }
+        }
+      },
       "release_year": { "type": "integer" },
       "genre": { "type": "keyword" },
       "director": { "type": "keyword" },
@@ -33,7 +44,7 @@ curl -X PUT "localhost:9200/movie" -H 'Content-Type: application/json' -d'
 # Ensure final newline for bulk file
 echo >> /usr/local/bin/movies.json
 
-# Bulk load the mock data
+# Bulk load the mock data, written through the alias
 curl -X POST "localhost:9200/_bulk" -H "Content-Type: application/json" --data-binary @/usr/local/bin/movies.json
 
 echo "OpenSearch initialized with mock movie data."
@@ -1,34 +1,115 @@
-from contextlib import asynccontextmanager
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from api import api_router
 from config import settings
 from connections.elastic import Elasticsearch
 from connections.redis_manager import RedisManager
+from services.movies import MoviesService
+from utils.deadline import reset_request_deadline, set_request_deadline
+from utils.metrics import metrics
+from utils.timing import (
+    TimedJSONResponse,
+    get_request_timings,
+    reset_request_timings,
+    server_timing_header,
+    start_request_timings,
+)
 
 
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):
     cache = RedisManager()
-    cache.initialize()
+    await cache.initialize()
+    # Also keeps the title index and suggestions of every worker current
+    invalidation_listener = asyncio.create_task(cache.listen_invalidations())
     elastic = Elasticsearch()
     await elastic.initialize()
+    title_index_refresher = None
+    if settings.TITLE_INDEX_ENABLED:
+        title_index_refresher = asyncio.create_task(
+            MoviesService().refresh_title_index(settings.TITLE_INDEX_REFRESH_INTERVAL)
+        )
 
     yield
 
     # Cleanup resources
-    cache.close()
+    for task in (invalidation_listener, title_index_refresher):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await cache.close()
     await elastic.close()
 
 
 app = FastAPI(
-    title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION, lifespan=lifespan
+    title=settings.PROJECT_NAME,
+    version=settings.PROJECT_VERSION,
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 app.include_router(api_router)
 
 
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    """
+    Bound every backend call made while serving the request by its deadline.
+    Clients may ask for a shorter one with the `X-Request-Timeout` header, a
+    positive number of seconds.
+    """
+    timeout = settings.REQUEST_TIMEOUT
+    if "X-Request-Timeout" in request.headers:
+        try:
+            requested = float(request.headers["X-Request-Timeout"])
+        except ValueError:
+            requested = math.nan
+        # nan and inf would disable the deadline, 0 or less fail every call
+        if not math.isfinite(requested) or requested <= 0:
+            return JSONResponse(
+                status_code=400,
+                content={"detail": "X-Request-Timeout must be a positive number"},
+            )
+        timeout = min(timeout, requested)
+    token = set_request_deadline(timeout)
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_deadline(token)
+
+
+@app.middleware("http")
+async def request_timings(request: Request, call_next):
+    """
+    Collect the time spent per stage (cache, query, opensearch, validation,
+    serialization) while serving the request into the /metrics counters and,
+    with SERVER_TIMING_ENABLED, into a `Server-Timing` response header.
+    """
+    token = start_request_timings()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+        timings = get_request_timings()
+    finally:
+        reset_request_timings(token)
+    for name, (seconds, _) in timings.items():
+        metrics.counter(
+            f"request_stage_{name}_seconds", f"Time spent in {name} by requests"
+        ).inc(seconds)
+    if settings.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing_header(
+            timings, time.perf_counter() - started
+        )
+    return response
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Movie Database API"}
@@ -16,3 +16,10 @@ class BaseAPIModel(BaseModel):
         from_attributes = True
         # Strip whitespace from all string values
         str_strip_whitespace = True
+
+    def cache_key_data(self) -> dict:
+        """
+        Data identifying this model in cache keys. Override it to normalize
+        fields whose order or duplicates do not change the result.
+        """
+        return self.model_dump(mode="json")
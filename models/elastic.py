@@ -23,6 +23,9 @@ class ESSearchRequest(ESBaseRequest):
     from_: Optional[int] = Field(
         0, ge=0, description="Simple pagination offset from which to fetch results."
     )
+    search_after: Optional[List[Any]] = Field(
+        None, description="Sort values of the last hit of the previous page."
+    )
 
 
 class ElasticsearchResponse(BaseAPIModel):
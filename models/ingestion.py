@@ -0,0 +1,18 @@
+from pydantic import Field
+
+from models.base import BaseAPIModel
+
+
+class IngestionReport(BaseAPIModel):
+    """Outcome of a bulk ingestion run."""
+
+    read: int = Field(0, description="Documents read from the source.")
+    indexed: int = Field(0, description="Documents indexed successfully.")
+    invalid: int = Field(0, description="Source documents skipped as invalid.")
+    failed: int = Field(0, description="Documents rejected by OpenSearch.")
+    retried: int = Field(0, description="Document retries after rejections.")
+    seconds: float = Field(0.0, description="Wall time of the run.")
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.indexed / self.seconds if self.seconds else 0.0
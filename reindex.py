@@ -0,0 +1,63 @@
+"""Rebuild the movie index behind its alias and swap it in.
+
+Creates a new versioned index with the current mappings, loads it from a
+file (NDJSON or CSV, as ingest.py) or copies the live index when no file is
+given, checks its document count and atomically moves the alias to it.
+
+Usage:
+    python reindex.py [movies.json] --delete-previous
+"""
+
+import argparse
+import asyncio
+
+from config import settings
+from connections.elastic import Elasticsearch
+from connections.redis_manager import RedisManager
+from constants.index import Index
+from services.ingestion import read_movies
+from services.reindex import ReindexService
+from utils.exceptions import ReindexFailed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "source", nargs="?", help="NDJSON or .csv file, the live index if omitted"
+    )
+    parser.add_argument("--alias", default=Index.movie.value)
+    parser.add_argument("--replicas", type=int, default=settings.REINDEX_REPLICAS)
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.INGEST_CONCURRENCY
+    )
+    parser.add_argument(
+        "--delete-previous",
+        action="store_true",
+        help="Delete the indices the alias pointed to before the swap",
+    )
+    return parser.parse_args()
+
+
+async def main(args):
+    elastic, cache = Elasticsearch(), RedisManager()
+    await elastic.initialize()
+    await cache.initialize()
+    try:
+        service = ReindexService(alias=args.alias, replicas=args.replicas)
+        movies = read_movies(args.source) if args.source else None
+        options = {"concurrency": args.concurrency} if args.source else {}
+        index = await service.reindex(
+            movies, delete_previous=args.delete_previous, **options
+        )
+    except ReindexFailed as e:
+        print(f"Reindex failed, {args.alias} was not changed: {e}")
+        return 1
+    finally:
+        await elastic.close()
+        await cache.close()
+    print(f"{args.alias} now points to {index}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main(parse_args())))
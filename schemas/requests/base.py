@@ -3,24 +3,41 @@ from typing import List, Optional
 from fastapi import Query
 from pydantic import computed_field
 
+from constants.index import MAX_RESULT_WINDOW
 from models.base import BaseAPIModel
 
 
-class BaseRequest(BaseAPIModel):
-    """Base params."""
+class FieldsRequest(BaseAPIModel):
+    """Response projection params."""
 
     fields: Optional[str] = Query(
         default="",
         description="List of fields to be returned in the response (comma separated)",
     )
-    page: Optional[int] = Query(default=1, description="Page number")
-    size: Optional[int] = Query(
-        default=10000,
-        description="Number of records to be returned in the response",
-    )
 
     @computed_field(return_type=List[str])
     def fields_list(self) -> List[str]:
         if self.fields is None or self.fields.strip() == "":
             return []
-        return list(set(self.fields.strip().replace(" ", "").split(",")))
+        return sorted(set(self.fields.strip().replace(" ", "").split(",")) - {""})
+
+    def cache_key_data(self) -> dict:
+        # `fields_list` already holds the normalized projection
+        return self.model_dump(mode="json", exclude={"fields"})
+
+
+class BaseRequest(FieldsRequest):
+    """Base params."""
+
+    page: Optional[int] = Query(default=1, ge=1, description="Page number")
+    size: Optional[int] = Query(
+        default=100,
+        ge=1,
+        le=MAX_RESULT_WINDOW,
+        description="Number of records to be returned in the response",
+    )
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor returned as `next_cursor` by the previous "
+        "page. When given, `page` is ignored.",
+    )
@@ -1,8 +1,9 @@
 from typing import List, Optional
 
+from fastapi import Query
 from pydantic import Field, field_validator, model_validator
 
-from schemas.requests.base import BaseAPIModel
+from schemas.requests.base import BaseAPIModel, FieldsRequest
 from utils import string_utils
 
 
@@ -46,6 +47,18 @@ class SearchMoviesRequest(BaseAPIModel):
     n_titles_slop: int = Field(
         1, description="Slop value for searching the 'n_titles' list."
     )
+    top_k: Optional[int] = Field(
+        None,
+        ge=1,
+        le=10000,
+        description="If set, return only the `top_k` best matches ranked by "
+        "relevance, with their scores, instead of scanning every match.",
+    )
+    min_score: Optional[float] = Field(
+        None,
+        ge=0,
+        description="Minimum relevance score of the matches returned by `top_k`.",
+    )
     @staticmethod
     @field_validator("fuzziness", mode="before")
     def validate_fuzziness(value):
@@ -55,23 +68,157 @@ class SearchMoviesRequest(BaseAPIModel):
     @model_validator(mode="after")
     def validate_titles(cls, values):
         if values.titles:
-            titles = []
-            for title in values.titles:
-                if values.exact_match:
-                    title = title.lower()
-                else:
-                    title = string_utils.normalized_text(title).lower()
-                if title:
-                    titles.append(title)
-            values.titles = titles
+            if values.exact_match:
+                titles = [title.lower() for title in values.titles]
+            else:
+                titles = string_utils.normalized_titles(values.titles)
+            values.titles = [title for title in titles if title]
         if values.n_titles:
-            n_titles = []
-            for n_title in values.n_titles:
-                if values.n_titles_exact_match:
-                    n_title = n_title.lower()
-                else:
-                    n_title = string_utils.normalized_text(n_title).lower()
-                if n_title:
-                    n_titles.append(n_title)
-            values.n_titles = n_titles
+            if values.n_titles_exact_match:
+                n_titles = [n_title.lower() for n_title in values.n_titles]
+            else:
+                n_titles = string_utils.normalized_titles(values.n_titles)
+            values.n_titles = [n_title for n_title in n_titles if n_title]
         return values
+
+    def cache_key_data(self) -> dict:
+        # Title lists are searched as sets
+        data = self.model_dump(mode="json")
+        data["titles"] = sorted(set(self.titles))
+        data["n_titles"] = sorted(set(self.n_titles))
+        return data
+
+
+class ExportMoviesRequest(FieldsRequest):
+    compress: bool = Query(
+        default=False, description="If True, gzip-compress the NDJSON stream."
+    )
+    batch_size: int = Query(
+        default=500,
+        ge=1,
+        le=10000,
+        description="Number of movies fetched per scroll page and written per chunk.",
+    )
+
+
+class BatchSearchMoviesRequest(BaseAPIModel):
+    titles: List[str] = Field(
+        ...,
+        min_length=1,
+        title="Titles",
+        description="Titles to search for. Each one is searched independently "
+        "and its matches are returned under the title as given.",
+        examples=[["The Godfather", "Inception"]],
+    )
+    size: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum number of matches returned per title.",
+    )
+    exact_match: bool = Field(
+        False, description="If True, search 'titles' with exact match."
+    )
+    keep_order_span: bool = Field(
+        True, description="If True, search 'titles' with all words in order."
+    )
+    fuzziness: str = Field(
+        "AUTO:1,8", description="Fuzziness value for searching the 'titles' list."
+    )
+    slop: int = Field(1, description="Slop value for searching the 'titles' list.")
+
+    @field_validator("fuzziness", mode="before")
+    @classmethod
+    def validate_fuzziness(cls, value):
+        if isinstance(value, int):
+            value = str(value)
+        return value
+
+    def normalized_title(self, title: str) -> str:
+        if self.exact_match:
+            return title.lower()
+        return string_utils.normalized_title(title)
+
+
+class MoviesByIdsRequest(FieldsRequest):
+    ids: List[int] = Field(
+        [],
+        title="IDs",
+        description="IDs of the movies to be fetched.",
+        examples=[[1, 2]],
+    )
+    imdb_ids: List[str] = Field(
+        [],
+        title="IMDB IDs",
+        description="IMDB IDs of the movies to be fetched.",
+        examples=[["tt0111161"]],
+    )
+
+
+class SuggestMoviesRequest(BaseAPIModel):
+    prefix: str = Query(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Beginning of the title typed so far.",
+        examples=["godf"],
+    )
+    size: int = Query(
+        default=10, ge=1, le=50, description="Number of suggestions to be returned."
+    )
+
+    def normalized_prefix(self) -> str:
+        # Normalized like the indexed `title_normalized`, so punctuation is
+        # dropped the same way ("Spider-M" -> "spiderm")
+        return string_utils.normalized_title(self.prefix)
+
+
+class MoviesStatsRequest(BaseAPIModel):
+    genres_size: int = Query(
+        default=20, ge=1, le=1000, description="Number of genres to be returned."
+    )
+    directors_size: int = Query(
+        default=20, ge=1, le=1000, description="Number of directors to be returned."
+    )
+    release_year_interval: int = Query(
+        default=10,
+        ge=1,
+        description="Width, in years, of each release year bucket.",
+    )
+
+
+class MovieRequest(BaseAPIModel):
+    imdb_id: Optional[str] = Field(
+        None, description="IMDB ID of the movie.", examples=["tt0111161"]
+    )
+    title: str = Field(
+        ...,
+        min_length=1,
+        description="Title of the movie, `title_normalized` is computed from it.",
+        examples=["The Shawshank Redemption"],
+    )
+    release_year: Optional[int] = Field(
+        None, description="Year the movie was released.", examples=[1994]
+    )
+    genre: Optional[str] = Field(
+        None, description="Genre of the movie.", examples=["Drama"]
+    )
+    director: Optional[str] = Field(
+        None, description="Director of the movie.", examples=["Frank Darabont"]
+    )
+    additional_data: Optional[dict | list] = Field(
+        None, description="Additional data about the movie."
+    )
+
+
+class MovieUpsertRequest(MovieRequest):
+    id: int = Field(..., description="ID of the movie.", examples=[1])
+
+
+class MoviesChangesRequest(BaseAPIModel):
+    upsert: List[MovieUpsertRequest] = Field(
+        [], description="Movies to be created or replaced, by id."
+    )
+    delete: List[int] = Field(
+        [], description="IDs of the movies to be deleted.", examples=[[1, 2]]
+    )
@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from models.base import BaseAPIModel
 
@@ -15,3 +15,4 @@ class PaginatedResponse(BaseResponse, Generic[T]):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
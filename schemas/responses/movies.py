@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import Field
 
@@ -68,3 +68,103 @@ class MoviesCountPerGenreResponse(BaseResponse):
         description="Number of movies found for each genre.",
         examples=[0],
     )
+
+
+class MoviesCountPerDirectorResponse(BaseResponse):
+    director: Optional[str] = Field(
+        None,
+        title="Director",
+        description="Director of the movie.",
+        examples=["Frank Darabont"],
+    )
+    doc_count: Optional[int] = Field(
+        0,
+        title="Document Count",
+        description="Number of movies found for each director.",
+        examples=[0],
+    )
+
+
+class MoviesCountPerReleaseYearResponse(BaseResponse):
+    release_year: Optional[int] = Field(
+        None,
+        title="Release Year",
+        description="First year of the release year bucket.",
+        examples=[1990],
+    )
+    doc_count: Optional[int] = Field(
+        0,
+        title="Document Count",
+        description="Number of movies released in the bucket.",
+        examples=[0],
+    )
+
+
+class MoviesStatsResponse(BaseResponse):
+    total: int = Field(
+        0,
+        title="Total",
+        description="Number of movies in the database.",
+        examples=[250],
+    )
+    genres: List[MoviesCountPerGenreResponse] = Field(
+        [], title="Genres", description="Movies count of the most common genres."
+    )
+    directors: List[MoviesCountPerDirectorResponse] = Field(
+        [],
+        title="Directors",
+        description="Movies count of the most common directors.",
+    )
+    release_years: List[MoviesCountPerReleaseYearResponse] = Field(
+        [],
+        title="Release Years",
+        description="Movies count per release year bucket.",
+    )
+
+
+class MovieSuggestionResponse(BaseResponse):
+    id: int = Field(
+        ...,
+        title="Movie ID",
+        description="ID of the movie in the database.",
+        examples=[2],
+    )
+    title: str = Field(
+        ...,
+        title="Title",
+        description="Title of the movie.",
+        examples=["The Godfather"],
+    )
+
+
+class MoviesByIdsResponse(BaseResponse):
+    items: List[dict] = Field(
+        [],
+        title="Items",
+        description="Movies found, in the order their ids were requested.",
+    )
+    missing_ids: List[int] = Field(
+        [], title="Missing IDs", description="Requested IDs with no movie."
+    )
+    missing_imdb_ids: List[str] = Field(
+        [],
+        title="Missing IMDB IDs",
+        description="Requested IMDB IDs with no movie.",
+    )
+
+
+class MoviesChangesResponse(BaseResponse):
+    upserted: List[int] = Field(
+        [], title="Upserted", description="IDs of the movies written."
+    )
+    deleted: List[int] = Field(
+        [], title="Deleted", description="IDs of the movies deleted."
+    )
+    not_found: List[int] = Field(
+        [], title="Not Found", description="IDs to be deleted with no movie."
+    )
+    failed: List[dict] = Field(
+        [],
+        title="Failed",
+        description="Changes rejected by the index, with their `id` and `error`.",
+    )
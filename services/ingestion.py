@@ -0,0 +1,209 @@
+import asyncio
+import csv
+import json
+import random
+import time
+from typing import Iterable, Iterator, List, Tuple
+
+import orjson
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from config import settings
+from constants.index import Index
+from models.ingestion import IngestionReport
+from schemas.responses.movies import MoviesResponse
+from services.base import BaseService
+from utils import string_utils
+
+# Bulk rejections worth retrying: the node's write queue was full.
+RETRYABLE_BULK_STATUS = 429
+
+# CSV columns holding numbers or JSON, everything else is read as text.
+CSV_INT_COLUMNS = ("id", "release_year")
+CSV_JSON_COLUMNS = ("additional_data",)
+
+# One bulk action and its source, serialized: (id, action + document lines).
+BulkLine = Tuple[int, bytes]
+
+
+def read_movies(path: str) -> Iterator[dict]:
+    """
+    Stream the movies of a `.csv` file or of an NDJSON file, one document per
+    line. `_bulk` action lines (as in movies.json) are skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as source:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(source):
+                yield _parse_csv_row(row)
+            return
+        for line in source:
+            if not line.strip():
+                continue
+            document = orjson.loads(line)
+            if set(document) & {"index", "create"}:
+                continue
+            yield document
+
+
+def _parse_csv_row(row: dict) -> dict:
+    movie = {key: value for key, value in row.items() if value not in (None, "")}
+    for column in CSV_INT_COLUMNS:
+        if column in movie:
+            movie[column] = int(movie[column])
+    for column in CSV_JSON_COLUMNS:
+        if column in movie:
+            movie[column] = json.loads(movie[column])
+    return movie
+
+
+def prepare_movie(movie: dict) -> dict:
+    """
+    Validate a source movie and compute `title_normalized` with the same
+    normalization used for title queries.
+    """
+    movie = {**movie, "title_normalized": string_utils.normalized_title(movie["title"])}
+    return MoviesResponse.model_validate(movie).model_dump(exclude_none=True)
+
+
+class IngestionService(BaseService):
+    """
+    Loads movies into an index with concurrent `_bulk` requests.
+
+    Documents are grouped in batches of at most `batch_size` documents and
+    `max_batch_bytes` bytes, sent by `concurrency` workers. Documents
+    rejected because the cluster is overloaded (429) are resent with
+    jittered backoff up to `max_retries` times; other rejections are counted
+    as failed.
+    """
+
+    def __init__(
+        self,
+        index: str = Index.movie,
+        batch_size: int = settings.INGEST_BATCH_SIZE,
+        max_batch_bytes: int = settings.INGEST_MAX_BATCH_BYTES,
+        concurrency: int = settings.INGEST_CONCURRENCY,
+        max_retries: int = settings.INGEST_MAX_RETRIES,
+        retry_backoff: float = 0.5,
+        progress_interval: float = 10.0,
+    ):
+        super().__init__()
+        self.index = index
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.progress_interval = progress_interval
+
+    async def ingest(
+        self, movies: Iterable[dict], pause_refresh: bool = True
+    ) -> IngestionReport:
+        """
+        Index every movie. With `pause_refresh`, index refreshes are disabled
+        during the load and the index is refreshed once at the end.
+        """
+        report = IngestionReport()
+        started_at = time.monotonic()
+        refresh_interval = None
+        if pause_refresh:
+            refresh_interval = await self.es.get_index_setting(
+                self.index, "refresh_interval"
+            )
+            await self.es.put_index_settings(self.index, {"refresh_interval": "-1"})
+        try:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+            workers = [
+                asyncio.create_task(self._worker(queue, report))
+                for _ in range(self.concurrency)
+            ]
+            progress = asyncio.create_task(self._log_progress(report, started_at))
+            try:
+                for batch in self._batches(movies, report):
+                    await queue.put(batch)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                progress.cancel()
+                for worker in workers:
+                    worker.cancel()
+        finally:
+            if pause_refresh:
+                await self.es.put_index_settings(
+                    self.index, {"refresh_interval": refresh_interval}
+                )
+                await self.es.refresh(self.index)
+        report.seconds = time.monotonic() - started_at
+        return report
+
+    def _batches(
+        self, movies: Iterable[dict], report: IngestionReport
+    ) -> Iterator[List[BulkLine]]:
+        batch, batch_bytes = [], 0
+        for movie in movies:
+            report.read += 1
+            try:
+                line = self._bulk_line(prepare_movie(movie))
+            except (KeyError, TypeError, ValueError, ValidationError) as e:
+                report.invalid += 1
+                self.logger.warning(f"Skipping invalid movie {movie.get('id')}: {e}")
+                continue
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_bytes + len(line[1]) > self.max_batch_bytes
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(line)
+            batch_bytes += len(line[1])
+        if batch:
+            yield batch
+
+    def _bulk_line(self, movie: dict) -> BulkLine:
+        action = {"index": {"_index": self.index, "_id": movie["id"]}}
+        return movie["id"], orjson.dumps(action) + b"\n" + orjson.dumps(movie) + b"\n"
+
+    async def _worker(self, queue: asyncio.Queue, report: IngestionReport):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            await self._send(batch, report)
+
+    async def _send(self, batch: List[BulkLine], report: IngestionReport):
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                report.retried += len(batch)
+                backoff = min(30.0, self.retry_backoff * 2**attempt)
+                await asyncio.sleep(random.uniform(0, backoff))
+            try:
+                items = await self.es.bulk(b"".join(line for _, line in batch))
+            except HTTPException as e:
+                self.logger.error(f"Bulk request of {len(batch)} movies failed: {e}")
+                report.failed += len(batch)
+                return
+            rejected = []
+            for line, item in zip(batch, items):
+                status = item.get("status", 500)
+                if status < 300:
+                    report.indexed += 1
+                elif status == RETRYABLE_BULK_STATUS:
+                    rejected.append(line)
+                else:
+                    report.failed += 1
+                    self.logger.warning(f"Movie {line[0]} rejected: {item.get('error')}")
+            if not rejected:
+                return
+            batch = rejected
+        report.failed += len(batch)
+        self.logger.warning(f"{len(batch)} movies still rejected after retries")
+
+    async def _log_progress(self, report: IngestionReport, started_at: float):
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            elapsed = time.monotonic() - started_at
+            self.logger.info(
+                f"Ingestion: {report.indexed} indexed, {report.failed} failed "
+                f"({report.indexed / elapsed:.0f} docs/s)"
+            )
@@ -1,103 +1,792 @@
-from typing import List
+import asyncio
+import zlib
+from contextlib import aclosing
+from math import ceil
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
+import orjson
 from fastapi import HTTPException
 from pydantic import ValidationError
+from redis.exceptions import RedisError
 
-from constants.index import Index
-from models.elastic import ESBaseRequest
+from config import settings
+from constants.cache import CACHE_SCHEMA_VERSION, CacheNamespace
+from constants.index import MAX_RESULT_WINDOW, Index
+from models.elastic import ElasticsearchResponse, ESBaseRequest, ESSearchRequest
 from schemas.requests.base import BaseRequest
-from schemas.requests.movies import SearchMoviesRequest
-from schemas.responses.movies import MoviesCountPerGenreResponse, MoviesResponse
+from schemas.requests.movies import (
+    BatchSearchMoviesRequest,
+    ExportMoviesRequest,
+    MoviesByIdsRequest,
+    MoviesStatsRequest,
+    SearchMoviesRequest,
+    SuggestMoviesRequest,
+)
+from schemas.responses.base import PaginatedResponse
+from schemas.responses.movies import (
+    MoviesByIdsResponse,
+    MoviesChangesResponse,
+    MoviesResponse,
+    MoviesStatsResponse,
+)
 from services.base import BaseService
-from utils.elastic_query import build_query_movie
+from services.ingestion import prepare_movie
+from utils.elastic_query import (
+    build_query_movie,
+    build_query_suggest,
+    build_query_title,
+)
+from utils.exceptions import EmptySizeQueryNotAllowed, QueryResultTooLarge
+from utils.local_cache import LocalCache
+from utils.pagination import decode_cursor, encode_cursor
+from utils.timing import stage
+from utils.title_index import title_index
+
+# `id` is unique per movie, so it is a stable tiebreaker for search_after.
+MOVIES_SORT = [{"id": "asc"}]
+
+MOVIES_RESPONSE_FIELDS = frozenset(MoviesResponse.model_fields)
+
+# Fields returned by the title search.
+MOVIES_SEARCH_FIELDS = ["title_normalized"]
+
+# Fields kept by cached responses, which are hydrated from the movie cache.
+MOVIE_REFERENCE_FIELDS = ["id"]
+
+# Fields counted by the stats aggregations.
+MOVIES_STATS_FIELDS = ("genre", "director", "release_year")
+
+# Suggestions for hot prefixes, so repeated keystrokes skip OpenSearch.
+suggestions_cache = LocalCache(
+    max_items=settings.SUGGEST_CACHE_MAX_ITEMS,
+    max_bytes=settings.SUGGEST_CACHE_MAX_BYTES,
+    ttl=settings.SUGGEST_CACHE_TTL,
+    name="suggest_cache",
+)
+
+# Prefixes of the messages published on CACHE_INVALIDATION_CHANNEL to update
+# the title index and the suggestions held in-process by every worker.
+TITLE_INDEX_INVALIDATION = "title_index:"
+SUGGESTIONS_INVALIDATION = "suggestions:"
+
+# zlib window bits that produce a gzip container instead of a raw stream.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
 
 class MoviesService(BaseService):
     def __init__(self):
         super().__init__()
         self.index = Index.movie
+        self.title_index = title_index
+        self.suggestions_cache = suggestions_cache
+        self.cache.on_invalidation(
+            TITLE_INDEX_INVALIDATION, self._apply_title_index_change
+        )
+        self.cache.on_invalidation(
+            SUGGESTIONS_INVALIDATION, lambda _: self.suggestions_cache.clear()
+        )
 
-    async def get_all_movies(self, request: BaseRequest) -> List[dict]:
-        """Get all movies from the Elasticsearch index."""
-        query = {"query": {"match_all": {}}}
-        result = await self.search(query, request)
-        return result
+    async def get_all_movies(self, request: BaseRequest) -> dict:
+        """
+        Get one page of movies from the Elasticsearch index, ordered by id.
+
+        The first pages can be addressed by `page`; deeper pages must follow
+        the `next_cursor` of the previous page, which resumes the sort with
+        `search_after` so each request only fetches `size` documents.
+        """
+        if not request.size:
+            raise EmptySizeQueryNotAllowed()
+        fields = self._invalidate_unknown_fields(request.fields_list)
+        if request.size > MAX_RESULT_WINDOW:
+            raise QueryResultTooLarge(f"size cannot exceed {MAX_RESULT_WINDOW}")
+
+        page = request.page
+        search_after = None
+        if request.cursor:
+            cursor = decode_cursor(request.cursor)
+            page, search_after = cursor["page"], cursor["search_after"]
+        elif page * request.size > MAX_RESULT_WINDOW:
+            raise QueryResultTooLarge(
+                f"page * size cannot exceed {MAX_RESULT_WINDOW}, "
+                "use next_cursor to fetch deeper pages"
+            )
+
+        body = {
+            "query": {"match_all": {}},
+            "sort": MOVIES_SORT,
+            "track_total_hits": True,
+        }
+        if fields:
+            body["_source"] = sorted(fields)
+        elastic_request = ESSearchRequest(
+            index=self.index,
+            body=body,
+            size=request.size,
+            from_=0 if search_after else (page - 1) * request.size,
+            search_after=search_after,
+        )
+        movies = await self.es.search_page(elastic_request)
+        items = self._build_response(movies, fields)
+
+        total_pages = ceil(movies.total / request.size)
+        next_cursor = None
+        if items and page < total_pages:
+            next_cursor = encode_cursor(movies.hits[-1]["sort"], page + 1)
+
+        return PaginatedResponse(
+            items=items,
+            total=movies.total,
+            page=page,
+            page_size=request.size,
+            total_pages=total_pages,
+            next_cursor=next_cursor,
+        ).model_dump()
+
+    def export_movies(self, request: ExportMoviesRequest) -> AsyncIterator[bytes]:
+        """
+        Stream every movie in the index as NDJSON chunks.
+
+        Each chunk holds at most `batch_size` lines, so only one scroll page
+        is held in memory per connection. When `compress` is set the chunks
+        form a single gzip stream, flushed after every chunk so clients can
+        decode it incrementally.
+
+        The requested fields are validated before the stream is returned, so
+        unknown fields fail with a 400 instead of breaking a started response.
+        """
+        fields = self._invalidate_unknown_fields(request.fields_list)
+        body = {"query": {"match_all": {}}, "sort": MOVIES_SORT}
+        if fields:
+            body["_source"] = sorted(fields)
+        elastic_request = ESBaseRequest(
+            index=self.index,
+            body=body,
+            size=request.batch_size,
+            scroll=settings.ES_SCROLL_KEEP_ALIVE,
+        )
+        return self._iter_ndjson(elastic_request, fields, request.compress)
+
+    async def _iter_ndjson(
+        self,
+        elastic_request: ESBaseRequest,
+        fields: Optional[Set[str]],
+        compress: bool,
+    ) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(wbits=GZIP_WBITS) if compress else None
+        lines = []
+        async for hit in self.es.iter_async_scan(elastic_request):
+            movie = MoviesResponse.model_validate(hit["_source"])
+            lines.append(movie.model_dump_json(include=fields))
+            if len(lines) >= elastic_request.size:
+                yield self._encode_ndjson_chunk(lines, compressor)
+                lines = []
+        if lines:
+            yield self._encode_ndjson_chunk(lines, compressor)
+        if compressor:
+            yield compressor.flush()
+
+    @staticmethod
+    def _encode_ndjson_chunk(lines: List[str], compressor=None) -> bytes:
+        chunk = ("\n".join(lines) + "\n").encode()
+        if compressor:
+            chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return chunk
 
     async def search_movies(
-        self, request: SearchMoviesRequest
-    ) -> List[MoviesCountPerGenreResponse]:
-        body = {"query": build_query_movie(request), "_source": ["title_normalized"]}
-        result = await self.search(body, request)
+        self,
+        request: SearchMoviesRequest,
+        fields: Optional[List[str]] = MOVIES_SEARCH_FIELDS,
+    ) -> List[dict]:
+        with stage("query"):
+            body = {"query": build_query_movie(request)}
+        if fields:
+            body["_source"] = fields
+        if request.top_k:
+            result = await self.search_top_k(body, request)
+        else:
+            result = await self.search(body, request)
         return result
 
+    async def search_top_k(self, body: dict, params: SearchMoviesRequest) -> List[dict]:
+        """
+        Return the `top_k` best matches ranked by score, in one round trip.
+        """
+        if params.min_score is not None:
+            body = {**body, "min_score": params.min_score}
+        elastic_request = ESSearchRequest(index=self.index, body=body, size=params.top_k)
+        movies = await self.es.search_page(elastic_request)
+        result = self._build_response(movies, body.get("_source"))
+        for movie, hit in zip(result, movies.hits):
+            movie["score"] = hit["_score"]
+        return result
+
+    async def suggest(self, request: SuggestMoviesRequest) -> List[dict]:
+        """
+        Suggest up to `size` titles for the prefix typed so far, served from
+        the hot prefix cache when possible, then from the titles starting
+        with the prefix in the title index. Prefixes matching fewer than
+        `size` titles there are suggested by OpenSearch, which also matches
+        the words after the first one.
+        """
+        prefix = request.normalized_prefix()
+        if not prefix:
+            return []
+        cache_key = f"{request.size}:{prefix}"
+        suggestions = self.suggestions_cache.get(cache_key)
+        if suggestions is not None:
+            return suggestions
+
+        if self.title_index.ready:
+            movies = self.title_index.prefix(prefix, limit=request.size)
+            if len(movies) == request.size:
+                self.title_index.hits.inc()
+                return [{"id": movie["id"], "title": movie["title"]} for movie in movies]
+            self.title_index.misses.inc()
+
+        elastic_request = ESSearchRequest(
+            index=self.index,
+            body={
+                "query": build_query_suggest(prefix),
+                "_source": ["id", "title"],
+                "track_total_hits": False,
+            },
+            size=request.size,
+        )
+        movies = await self.es.search_page(elastic_request)
+        suggestions = [
+            {"id": hit["_source"]["id"], "title": hit["_source"]["title"]}
+            for hit in movies.hits
+        ]
+        self.suggestions_cache.set(
+            cache_key,
+            suggestions,
+            size=sum(len(movie["title"]) + 16 for movie in suggestions) + 1,
+        )
+        return suggestions
+
+    async def search_movies_batch(
+        self, request: BatchSearchMoviesRequest
+    ) -> Dict[str, List[dict]]:
+        """
+        Search each title independently and group the matches by title.
+
+        One sub-query per distinct title is sent through _msearch, in batches
+        of MSEARCH_BATCH_SIZE titles. Titles that normalize to an empty string
+        have no matches.
+        """
+        if len(request.titles) > settings.MSEARCH_MAX_TITLES:
+            raise QueryResultTooLarge(
+                f"At most {settings.MSEARCH_MAX_TITLES} titles can be searched at once"
+            )
+
+        normalized = {title: request.normalized_title(title) for title in request.titles}
+        distinct_titles = sorted({title for title in normalized.values() if title})
+        bodies = [
+            {
+                "query": build_query_title(
+                    title,
+                    exact_match=request.exact_match,
+                    keep_order_span=request.keep_order_span,
+                    fuzziness=request.fuzziness,
+                    slop=request.slop,
+                ),
+                "size": request.size,
+            }
+            for title in distinct_titles
+        ]
+        batches = await self._msearch_batches(bodies)
+        responses = [response for batch in batches for response in batch]
+        matches = {
+            title: self._build_response(response)
+            for title, response in zip(distinct_titles, responses)
+        }
+        return {
+            title: matches.get(normalized_title, [])
+            for title, normalized_title in normalized.items()
+        }
+
+    async def _msearch_batches(
+        self, bodies: List[dict]
+    ) -> List[List[ElasticsearchResponse]]:
+        """
+        Send `bodies` through _msearch in batches of MSEARCH_BATCH_SIZE, with
+        at most MSEARCH_MAX_CONCURRENT_BATCHES batches in flight, so no more
+        than batches x MSEARCH_MAX_CONCURRENT_SEARCHES sub-searches run at once.
+        """
+        semaphore = asyncio.Semaphore(settings.MSEARCH_MAX_CONCURRENT_BATCHES)
+
+        async def send(batch: List[dict]) -> List[ElasticsearchResponse]:
+            async with semaphore:
+                return await self.es.msearch(
+                    index=self.index,
+                    bodies=batch,
+                    max_concurrent_searches=settings.MSEARCH_MAX_CONCURRENT_SEARCHES,
+                )
+
+        batch_size = settings.MSEARCH_BATCH_SIZE
+        return await asyncio.gather(
+            *(
+                send(bodies[start : start + batch_size])
+                for start in range(0, len(bodies), batch_size)
+            )
+        )
+
+    async def get_movies_by_ids(self, request: MoviesByIdsRequest) -> dict:
+        """
+        Resolve many ids and IMDB ids at once from the movie cache, fetching
+        only the misses.
+        """
+        fields = self._invalidate_unknown_fields(request.fields_list)
+        if len(request.ids) + len(request.imdb_ids) > settings.IDS_LOOKUP_MAX_IDS:
+            raise QueryResultTooLarge(
+                f"At most {settings.IDS_LOOKUP_MAX_IDS} ids can be fetched at once"
+            )
+        ids = list(dict.fromkeys(request.ids))
+        imdb_ids = list(dict.fromkeys(request.imdb_ids))
+        by_id, by_imdb_id = await asyncio.gather(
+            self.get_movies("id", ids), self.get_movies("imdb_id", imdb_ids)
+        )
+
+        movies = {}
+        for movie in [*by_id.values(), *by_imdb_id.values()]:
+            movies.setdefault(movie["id"], movie)
+        items = self._build_response(
+            ElasticsearchResponse(
+                hits=[{"_source": movie} for movie in movies.values()],
+                total=len(movies),
+            ),
+            fields,
+        )
+        return MoviesByIdsResponse(
+            items=items,
+            missing_ids=[value for value in ids if value not in by_id],
+            missing_imdb_ids=[value for value in imdb_ids if value not in by_imdb_id],
+        ).model_dump()
+
+    async def get_movies(self, field: str, values: List[Any]) -> Dict[Any, dict]:
+        """
+        Map each value of `field` (`id` or `imdb_id`) to its movie.
+
+        Movies are read from the movie cache first; the misses are fetched
+        with `terms` queries of IDS_LOOKUP_CHUNK_SIZE values sent through
+        _msearch, and cached. Values without a movie are left out.
+        """
+        if not values:
+            return {}
+        if field == "imdb_id":
+            # IMDB id entries only point to the id entry holding the movie
+            movie_ids = await self.cache.mget(
+                [_movie_key(CacheNamespace.movie_by_imdb_id, v) for v in values]
+            )
+            cached = await self._get_cached_movies(
+                [movie_id for movie_id in movie_ids if movie_id is not None]
+            )
+            found = {
+                value: cached[movie_id]
+                for value, movie_id in zip(values, movie_ids)
+                if movie_id in cached
+            }
+        else:
+            found = await self._get_cached_movies(values)
+
+        misses = [value for value in values if value not in found]
+        if misses:
+            fetched = await self._search_by_terms(field, misses)
+            await self.cache_movies(list(fetched.values()))
+            found.update(fetched)
+        return {value: found[value] for value in values if value in found}
+
+    async def _get_cached_movies(self, movie_ids: List[int]) -> Dict[int, dict]:
+        if not movie_ids:
+            return {}
+        movies = await self.cache.mget(
+            [_movie_key(CacheNamespace.movie_by_id, movie_id) for movie_id in movie_ids]
+        )
+        return {
+            movie_id: movie for movie_id, movie in zip(movie_ids, movies) if movie
+        }
+
+    async def _search_by_terms(self, field: str, values: List[Any]) -> Dict[Any, dict]:
+        chunk_size = settings.IDS_LOOKUP_CHUNK_SIZE
+        bodies = [
+            {
+                "query": {"terms": {field: values[start : start + chunk_size]}},
+                "size": len(values[start : start + chunk_size]),
+                "sort": MOVIES_SORT,
+            }
+            for start in range(0, len(values), chunk_size)
+        ]
+        batches = await self._msearch_batches(bodies)
+        fetched = {}
+        for batch in batches:
+            for response in batch:
+                for hit in response.hits:
+                    fetched.setdefault(hit["_source"][field], hit["_source"])
+        return fetched
+
+    async def cache_movies(self, movies: List[dict]):
+        """
+        Store each movie under its id, plus a pointer from its IMDB id, so a
+        movie is invalidated by deleting a single key.
+        """
+        mapping = {}
+        for movie in movies:
+            movie = {k: v for k, v in movie.items() if k in MOVIES_RESPONSE_FIELDS}
+            mapping[_movie_key(CacheNamespace.movie_by_id, movie["id"])] = movie
+            if movie.get("imdb_id"):
+                imdb_key = _movie_key(CacheNamespace.movie_by_imdb_id, movie["imdb_id"])
+                mapping[imdb_key] = movie["id"]
+        if not mapping:
+            return
+        try:
+            await self.cache.mset(mapping, ex=settings.MOVIE_CACHE_EXPIRATION)
+        except RedisError:
+            pass  # Already logged; caching is best effort
+
+    async def apply_changes(
+        self, upserts: List[dict], deletes: List[int]
+    ) -> Dict[str, List]:
+        """
+        Write movie upserts and deletes in one `_bulk` request, then drop
+        the cache entries they made stale.
+
+        The movie entries of every written id are always dropped. Cached
+        lists and searches only hold ids, so they are dropped only when the
+        change alters which movies they hold: lists when movies are added or
+        deleted, searches when movies are added or retitled (deleted ones
+        are left out on hydration), stats when a counted field changes.
+        """
+        if len(upserts) + len(deletes) > settings.MOVIE_CHANGES_MAX_ITEMS:
+            raise QueryResultTooLarge(
+                f"At most {settings.MOVIE_CHANGES_MAX_ITEMS} changes can be applied at once"
+            )
+        movies = [prepare_movie(movie) for movie in upserts]
+        actions = [
+            (movie["id"], {"index": {"_index": self.index, "_id": movie["id"]}}, movie)
+            for movie in movies
+        ] + [
+            (movie_id, {"delete": {"_index": self.index, "_id": movie_id}}, None)
+            for movie_id in deletes
+        ]
+        if not actions:
+            return MoviesChangesResponse().model_dump()
+        previous = await self.get_movies("id", list({id_ for id_, _, _ in actions}))
+
+        body = b"".join(
+            orjson.dumps(action) + b"\n" + (orjson.dumps(movie) + b"\n" if movie else b"")
+            for _, action, movie in actions
+        )
+        items = await self.es.bulk(body, refresh="wait_for")
+
+        result = MoviesChangesResponse()
+        written = {}
+        for (movie_id, action, movie), item in zip(actions, items):
+            status = item.get("status", 500)
+            if movie is None and status == 404:
+                result.not_found.append(movie_id)
+            elif status >= 300:
+                result.failed.append({"id": movie_id, "error": item.get("error")})
+            elif movie is None:
+                result.deleted.append(movie_id)
+                written[movie_id] = None
+            else:
+                result.upserted.append(movie_id)
+                written[movie_id] = movie
+        await self._invalidate_changes(previous, written)
+        return result.model_dump()
+
+    async def _invalidate_changes(
+        self, previous: Dict[int, dict], written: Dict[int, Optional[dict]]
+    ):
+        if not written:
+            return
+        keys = [_movie_key(CacheNamespace.movie_by_id, movie_id) for movie_id in written]
+        keys += [
+            _movie_key(CacheNamespace.movie_by_imdb_id, movie["imdb_id"])
+            for movie_id, movie in previous.items()
+            if movie_id in written and movie.get("imdb_id")
+        ]
+        await asyncio.gather(*(self.cache.delete(key) for key in keys))
+
+        namespaces, retitled = set(), False
+        stale_namespaces = (
+            CacheNamespace.movies_list,
+            CacheNamespace.movies_search,
+            CacheNamespace.movies_stats,
+        )
+        await self._publish_title_index_change(
+            "remove", [movie_id for movie_id, movie in written.items() if movie is None]
+        )
+        await self._publish_title_index_change(
+            "upsert", [movie for movie in written.values() if movie is not None]
+        )
+        for movie_id, movie in written.items():
+            old = previous.get(movie_id)
+            if old is None and movie is None:
+                continue
+            if old is None:
+                namespaces.update(stale_namespaces)
+            elif movie is None:
+                namespaces.update(
+                    (CacheNamespace.movies_list, CacheNamespace.movies_stats)
+                )
+                retitled = True
+            else:
+                if old.get("title") != movie.get("title"):
+                    namespaces.add(CacheNamespace.movies_search)
+                    retitled = True
+                if any(old.get(f) != movie.get(f) for f in MOVIES_STATS_FIELDS):
+                    namespaces.add(CacheNamespace.movies_stats)
+        if retitled or CacheNamespace.movies_search in namespaces:
+            # Suggestions hold titles, not references
+            await self._clear_suggestions()
+        for namespace in stale_namespaces:
+            if namespace in namespaces:
+                await self.cache.delete_prefix(f"{namespace.value}:")
+
+    async def invalidate_movie(self, movie_id: int):
+        """
+        Drop a movie from the movie cache and from the title index and
+        suggestions of every worker. Cached lists only reference it by id, so
+        they serve its next version once it is fetched again.
+        """
+        await self._publish_title_index_change("remove", [movie_id])
+        await self._clear_suggestions()
+        await self.cache.delete(_movie_key(CacheNamespace.movie_by_id, movie_id))
+
+    async def _publish_title_index_change(self, action: str, data: List[Any]):
+        """
+        Apply a title index change (`remove` ids or `upsert` movies) here and
+        in every other worker. Applying it twice is harmless.
+        """
+        if not data:
+            return
+        change = f"{action}:{orjson.dumps(data).decode()}"
+        self._apply_title_index_change(change)
+        await self.cache.publish_invalidation(f"{TITLE_INDEX_INVALIDATION}{change}")
+
+    def _apply_title_index_change(self, change: str):
+        action, _, data = change.partition(":")
+        if action == "remove":
+            for movie_id in orjson.loads(data):
+                self.title_index.remove(movie_id)
+        elif action == "upsert" and self.title_index.ready:
+            for movie in orjson.loads(data):
+                self.title_index.upsert(movie)
+
+    async def _clear_suggestions(self):
+        self.suggestions_cache.clear()
+        await self.cache.publish_invalidation(f"{SUGGESTIONS_INVALIDATION}*")
+
+    def validate_fields(self, fields: Optional[List[str]]) -> Optional[Set[str]]:
+        """Reject unknown `fields` before any query is sent."""
+        return self._invalidate_unknown_fields(fields)
+
+    async def hydrate(
+        self, references: List[dict], fields: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        Replace movie references (an `id` plus values that are not movie
+        fields, e.g. `score`) with the movies, restricted to `fields`. Movies
+        are read from the movie cache and only the misses are fetched; movies
+        deleted since the references were made are left out.
+        """
+        self._invalidate_unknown_fields(fields)
+        movies = await self.get_movies(
+            "id", list(dict.fromkeys(reference["id"] for reference in references))
+        )
+        references = [ref for ref in references if ref["id"] in movies]
+        items = self._build_response(
+            ElasticsearchResponse(
+                hits=[{"_source": movies[ref["id"]]} for ref in references],
+                total=len(references),
+            ),
+            fields,
+        )
+        for item, reference in zip(items, references):
+            item.update((k, v) for k, v in reference.items() if k != "id")
+        return items
+
+    async def get_stats(self, request: MoviesStatsRequest) -> dict:
+        """
+        Count movies per genre, director and release year bucket with
+        aggregations, without fetching any document.
+        """
+        aggs = {
+            "genres": {"terms": {"field": "genre", "size": request.genres_size}},
+            "directors": {
+                "terms": {"field": "director", "size": request.directors_size}
+            },
+            "release_years": {
+                "histogram": {
+                    "field": "release_year",
+                    "interval": request.release_year_interval,
+                    "min_doc_count": 1,
+                }
+            },
+        }
+        result = await self.es.aggregate(index=self.index, aggs=aggs)
+        return MoviesStatsResponse(
+            total=result["total"],
+            genres=[
+                {"genre": bucket["key"], "doc_count": bucket["doc_count"]}
+                for bucket in result["genres"]["buckets"]
+            ],
+            directors=[
+                {"director": bucket["key"], "doc_count": bucket["doc_count"]}
+                for bucket in result["directors"]["buckets"]
+            ],
+            release_years=[
+                {"release_year": int(bucket["key"]), "doc_count": bucket["doc_count"]}
+                for bucket in result["release_years"]["buckets"]
+            ],
+        ).model_dump()
+
     async def search(
         self,
         body: dict,
         params: SearchMoviesRequest,
-        scroll: str = "1m",
+        scroll: Optional[str] = None,
     ):
         elastic_request = ESBaseRequest(
-            index=self.index, body=body, size=params.size, scroll=scroll
+            index=self.index,
+            body={**body, "sort": MOVIES_SORT},
+            size=params.size,
+            scroll=scroll or settings.ES_SCROLL_KEEP_ALIVE,
         )
         movies = await self.es.search_async_scan(elastic_request)
-        filtered_fields = self._filter_fields(movies, body.get("_source"))
-        result = self._build_response(filtered_fields)
+        result = self._build_response(movies, body.get("_source"))
         return result
 
-    def _build_response(self, filtered_fields):
-        result = []
-        for field in filtered_fields:
-            response = MoviesResponse(**field)
-            result.append(response.model_dump())
-        return result
+    def _build_response(
+        self, movies: ElasticsearchResponse, fields: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        Validate each hit once and dump it restricted to `fields`.
 
-    def _filter_fields(self, movies, fields):
+        The requested fields are checked against `MoviesResponse` once per
+        request instead of once per hit.
+        """
+        include = self._invalidate_unknown_fields(fields)
         try:
-            filtered = []
-            for movie in movies.hits:
-                response = MoviesResponse(**movie["_source"])
-                self._invalidate_unknown_fields(response, fields)
-                filtered_data = (
-                    response.model_dump(include=fields)
-                    if fields
-                    else response.model_dump()
-                )
-                filtered.append(filtered_data)
-            return filtered
+            with stage("validation"):
+                return [
+                    MoviesResponse.model_validate(movie["_source"]).model_dump(
+                        include=include
+                    )
+                    for movie in movies.hits
+                ]
         except ValidationError as e:
             raise HTTPException(
                 status_code=500, detail=f"Error validating search movies response: {e}"
             )
 
     @staticmethod
-    def _invalidate_unknown_fields(response, fields):
+    def _invalidate_unknown_fields(fields) -> Optional[Set[str]]:
         fields_set = set(fields) if fields else None
-        if fields_set and not fields_set.issubset(set(response.dict().keys())):
+        if fields_set and not fields_set.issubset(MOVIES_RESPONSE_FIELDS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unknown fields: {fields_set.difference(response.dict().keys())}",
+                detail=f"Unknown fields: {fields_set.difference(MOVIES_RESPONSE_FIELDS)}",
             )
+        return fields_set
 
     async def filter_movies(self, value: str):
+        if self.title_index.ready:
+            movies = self._lookup_title_index(value)
+            if movies:
+                self.title_index.hits.inc()
+                return self._build_response(
+                    ElasticsearchResponse(
+                        hits=[{"_source": movie} for movie in movies],
+                        total=len(movies),
+                    )
+                )
+            self.title_index.misses.inc()
+
         try:
             # Try to interpret as integer ID
-            query = {"query": {"term": {"id": int(value)}}}
+            movie_id = int(value)
+            cached = await self._get_cached_movies([movie_id])
+            if cached:
+                return self._build_response(
+                    ElasticsearchResponse(
+                        hits=[{"_source": cached[movie_id]}], total=1
+                    )
+                )
+            query = {"query": {"term": {"id": movie_id}}}
         except ValueError:
             # Try exact normalized title
             normalized_title = value.lower()
             query = {"query": {"term": {"title_normalized": normalized_title}}}
         request = ESBaseRequest(
-            index=self.index, body=query, size=10, scroll="1m"
+            index=self.index,
+            body=query,
+            size=10,
+            scroll=settings.ES_SCROLL_KEEP_ALIVE,
         )
         movies = await self.es.search_async_scan(request)
-        filtered_fields = self._filter_fields(movies, None)
-        result = self._build_response(filtered_fields)
+        result = self._build_response(movies)
         # Fallback to match if no results and not an ID search
         if not result and not value.isdigit():
             query = {"query": {"match": {"title": value}}}
             request = ESBaseRequest(
-                index=self.index, body=query, size=10, scroll="1m"
+                index=self.index,
+                body=query,
+                size=10,
+                scroll=settings.ES_SCROLL_KEEP_ALIVE,
             )
             movies = await self.es.search_async_scan(request)
-            filtered_fields = self._filter_fields(movies, None)
-            result = self._build_response(filtered_fields)
-        return result 
\ No newline at end of file
+            result = self._build_response(movies)
+        await self.cache_movies(result)
+        return result
+
+    def _lookup_title_index(self, value: str) -> List[dict]:
+        try:
+            movie = self.title_index.get(int(value))
+            return [movie] if movie else []
+        except ValueError:
+            return self.title_index.find_title(value)
+
+    async def load_title_index(self):
+        """
+        Load the whole catalogue into the title index. When the catalogue is
+        larger than TITLE_INDEX_MAX_DOCUMENTS or cannot be read, the index is
+        cleared, leaving lookups to OpenSearch rather than to a snapshot that
+        would no longer be refreshed.
+        """
+        request = ESBaseRequest(
+            index=self.index,
+            body={"query": {"match_all": {}}, "sort": MOVIES_SORT},
+            size=1000,
+            scroll=settings.ES_SCROLL_KEEP_ALIVE,
+        )
+        movies = []
+        try:
+            async with aclosing(self.es.iter_async_scan(request)) as hits:
+                async for hit in hits:
+                    if len(movies) >= settings.TITLE_INDEX_MAX_DOCUMENTS:
+                        self.logger.warning(
+                            "Catalogue exceeds TITLE_INDEX_MAX_DOCUMENTS, "
+                            "title index cleared"
+                        )
+                        self.title_index.clear()
+                        return
+                    movies.append(hit["_source"])
+        except Exception:
+            self.title_index.clear()
+            raise
+        self.title_index.replace(movies)
+        self.logger.info(f"Title index loaded with {len(movies)} movies")
+
+    async def refresh_title_index(self, interval: float):
+        """Reloads the title index every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await self.load_title_index()
+            except Exception as e:
+                self.logger.warning(f"Error loading title index: {e}")
+            await asyncio.sleep(interval)
+
+
+def _movie_key(namespace: CacheNamespace, value: Any) -> str:
+    return f"{namespace.value}:{settings.PROJECT_VERSION}:{CACHE_SCHEMA_VERSION}:{value}"
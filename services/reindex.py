@@ -0,0 +1,125 @@
+import time
+from typing import Iterable, List, Optional
+
+from config import settings
+from constants.cache import CacheNamespace
+from constants.index import Index
+from constants.mappings import BULK_BUILD_SETTINGS, MOVIE_MAPPINGS
+from services.base import BaseService
+from services.ingestion import IngestionService
+from utils.exceptions import ReindexFailed
+
+# Cached responses built from the movie index, dropped once it is swapped.
+MOVIE_CACHE_NAMESPACES = (
+    CacheNamespace.movies_list,
+    CacheNamespace.movies_search,
+    CacheNamespace.movies_stats,
+    CacheNamespace.movie_by_id,
+    CacheNamespace.movie_by_imdb_id,
+)
+
+
+def versioned_index_name(alias: str) -> str:
+    return f"{alias}_{time.strftime('%Y%m%d%H%M%S', time.gmtime())}"
+
+
+class ReindexService(BaseService):
+    """
+    Rebuilds the index behind the `alias` with blue/green swaps.
+
+    A new versioned index is created with the current mappings, refreshes
+    disabled and no replicas, then loaded from a source or copied from the
+    live index. Once its document count matches the expected one and its
+    replicas are allocated (green health), the alias is moved to it in a
+    single atomic update and the movie caches are dropped. Until then readers keep using the previous index; a failed
+    build is deleted and leaves the alias untouched.
+
+    Writes sent to the alias during a copy only reach the previous index.
+    """
+
+    def __init__(
+        self,
+        alias: str = Index.movie,
+        replicas: int = settings.REINDEX_REPLICAS,
+        timeout: float = settings.REINDEX_TIMEOUT,
+        health_timeout: float = settings.REINDEX_HEALTH_TIMEOUT,
+    ):
+        super().__init__()
+        self.alias = alias
+        self.replicas = replicas
+        self.timeout = timeout
+        self.health_timeout = health_timeout
+
+    async def reindex(
+        self,
+        movies: Optional[Iterable[dict]] = None,
+        delete_previous: bool = False,
+        **ingestion_options,
+    ) -> str:
+        """
+        Build a new index from `movies`, or from the live index when no
+        movies are given, swap the alias to it and return its name.
+        """
+        index = versioned_index_name(self.alias)
+        await self.es.create_index(index, MOVIE_MAPPINGS, BULK_BUILD_SETTINGS)
+        try:
+            expected = await self._load(index, movies, ingestion_options)
+            await self.es.put_index_settings(
+                index, {"refresh_interval": None, "number_of_replicas": self.replicas}
+            )
+            await self.es.refresh(index)
+            indexed = await self.es.count(index)
+            if indexed != expected:
+                raise ReindexFailed(f"{index} holds {indexed} movies, expected {expected}")
+            # Swap only once replicas can share the reads, not onto lone primaries
+            if not await self.es.wait_for_green(index, self.health_timeout):
+                raise ReindexFailed(
+                    f"{index} replicas not allocated after {self.health_timeout}s"
+                )
+        except BaseException:
+            await self.es.delete_index(index)
+            raise
+
+        previous = await self._swap_alias(index)
+        self.logger.info(f"Alias {self.alias} moved to {index} ({indexed} movies)")
+        await self._invalidate_caches()
+        if delete_previous:
+            for old_index in previous:
+                await self.es.delete_index(old_index)
+        return index
+
+    async def _load(
+        self, index: str, movies: Optional[Iterable[dict]], ingestion_options: dict
+    ) -> int:
+        if movies is None:
+            expected = await self.es.count(self.alias)
+            response = await self.es.reindex(self.alias, index, self.timeout)
+            if response.get("failures"):
+                raise ReindexFailed(f"Copy into {index} failed: {response['failures'][:3]}")
+            return expected
+
+        ingestion = IngestionService(index=index, **ingestion_options)
+        ingestion.es = self.es
+        report = await ingestion.ingest(movies, pause_refresh=False)
+        if report.failed:
+            raise ReindexFailed(f"{report.failed} movies rejected while loading {index}")
+        return report.indexed
+
+    async def _swap_alias(self, index: str) -> List[str]:
+        """Point the alias to `index` only, returning the indices it left."""
+        previous = await self.es.get_alias(self.alias)
+        actions = [
+            {"remove": {"index": old_index, "alias": self.alias}}
+            for old_index in previous
+        ]
+        if not previous and await self.es.index_exists(self.alias):
+            # The alias name is taken by a concrete index from before aliases
+            # were used: it is deleted in the same atomic update
+            actions.append({"remove_index": {"index": self.alias}})
+        actions.append({"add": {"index": index, "alias": self.alias}})
+        await self.es.update_aliases(actions)
+        return previous
+
+    async def _invalidate_caches(self):
+        for namespace in MOVIE_CACHE_NAMESPACES:
+            await self.cache.delete_prefix(f"{namespace.value}:")
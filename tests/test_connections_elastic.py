@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import AsyncMock
+from connections.elastic import Elasticsearch
+from models.elastic import ESSearchRequest
+
+def page(hits, scroll_id='scroll-1', total=3):
+    return {'_scroll_id': scroll_id, 'hits': {'hits': hits, 'total': {'value': total}}}
+
+@pytest.mark.asyncio
+async def test_search_follows_scroll_and_clears_it():
+    elastic = Elasticsearch()
+    elastic.client = AsyncMock()
+    elastic.client.search = AsyncMock(return_value=page([{'_id': 1}, {'_id': 2}]))
+    elastic.client.scroll = AsyncMock(return_value=page([{'_id': 3}]))
+    result = await elastic.search(ESSearchRequest(index='movie', body={'query': {'match_all': {}}}, size=2))
+    assert [hit['_id'] for hit in result.hits] == [1, 2, 3]
+    assert result.total == 3
+    elastic.client.clear_scroll.assert_awaited_once()
+    assert elastic.open_scroll_contexts.value == 0
+    assert 'request_timeout' in elastic.client.scroll.call_args.kwargs
+
+@pytest.mark.asyncio
+async def test_scan_with_aggs_yields_aggregations_then_pages():
+    elastic = Elasticsearch()
+    elastic.client = AsyncMock()
+    elastic.client.search = AsyncMock(return_value={**page([{'_id': 1}]), 'aggregations': {'genres': {}}})
+    elastic.client.scroll = AsyncMock(side_effect=[page([{'_id': 2}]), page([])])
+    results = [result async for result in elastic.scan_with_aggs('movie', {'match_all': {}}, {'genres': {}})]
+    assert results == [{'genres': {}}, [{'_id': 1}], [{'_id': 2}]]
+    elastic.client.clear_scroll.assert_awaited_once()
+    assert elastic.open_scroll_contexts.value == 0
+    assert 'request_timeout' in elastic.client.search.call_args.kwargs
+
+@pytest.mark.asyncio
+async def test_iter_async_scan_uses_point_in_time_when_sorted():
+    from models.elastic import ESBaseRequest
+    elastic = Elasticsearch()
+    elastic._point_in_time_supported = True
+    elastic.client = AsyncMock()
+    elastic.client.create_pit = AsyncMock(return_value={'pit_id': 'pit-1'})
+    elastic.client.search = AsyncMock(side_effect=[
+        {'pit_id': 'pit-1', 'hits': {'hits': [{'_id': 1, 'sort': [1]}, {'_id': 2, 'sort': [2]}]}},
+        {'pit_id': 'pit-1', 'hits': {'hits': [{'_id': 3, 'sort': [3]}]}},
+    ])
+    request = ESBaseRequest(index='movie', body={'query': {'match_all': {}}, 'sort': [{'id': 'asc'}]}, size=2)
+    hits = [hit async for hit in elastic.iter_async_scan(request)]
+    assert [hit['_id'] for hit in hits] == [1, 2, 3]
+    assert elastic.client.search.call_args.kwargs['body']['search_after'] == [2]
+    elastic.client.delete_pit.assert_awaited_once()
+    assert elastic.open_scroll_contexts.value == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_scan_clears_scroll_context():
+    import asyncio
+    from models.elastic import ESBaseRequest
+    elastic = Elasticsearch()
+    elastic.client = AsyncMock()
+    elastic.client.search = AsyncMock(return_value=page([{'_id': 1}]))
+
+    async def slow_scroll(**kwargs):
+        await asyncio.sleep(10)
+
+    elastic.client.scroll = slow_scroll
+    request = ESBaseRequest(index='movie', body={'query': {'match_all': {}}}, size=1)
+    task = asyncio.ensure_future(elastic.search_async_scan(request))
+    await asyncio.sleep(0.01)
+    assert elastic.open_scroll_contexts.value == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    elastic.client.clear_scroll.assert_awaited_once()
+    assert elastic.open_scroll_contexts.value == 0
+
+@pytest.mark.asyncio
+async def test_point_in_time_is_only_disabled_when_unsupported():
+    from opensearchpy import NotFoundError, TransportError
+    from models.elastic import ESBaseRequest
+    elastic = Elasticsearch()
+    elastic._point_in_time_supported = True
+    elastic.client = AsyncMock()
+    request = ESBaseRequest(index='movie', body={'query': {'match_all': {}}, 'sort': [{'id': 'asc'}]}, size=2)
+    try:
+        elastic.client.create_pit = AsyncMock(side_effect=NotFoundError(404, 'index_not_found_exception', {}))
+        with pytest.raises(NotFoundError):
+            await elastic._open_point_in_time(request)
+        assert elastic._point_in_time_supported
+
+        elastic.client.create_pit = AsyncMock(side_effect=TransportError(
+            400, 'illegal_argument_exception',
+            {'error': {'reason': 'no handler found for uri [/movie/_search/point_in_time] and method [POST]'}},
+        ))
+        assert await elastic._open_point_in_time(request) is None
+        assert not elastic._point_in_time_supported
+    finally:
+        elastic._point_in_time_supported = True
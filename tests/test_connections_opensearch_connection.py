@@ -0,0 +1,18 @@
+import asyncio
+import pytest
+from opensearchpy import AsyncHttpConnection
+from connections.opensearch_connection import PooledAsyncHttpConnection
+
+@pytest.mark.asyncio
+async def test_requests_beyond_pool_size_are_counted_as_saturated(monkeypatch):
+    async def perform_request(self, *args, **kwargs):
+        await asyncio.sleep(0.01)
+        return 200, {}, '{}'
+
+    monkeypatch.setattr(AsyncHttpConnection, 'perform_request', perform_request)
+    connection = PooledAsyncHttpConnection(maxsize=2)
+    saturated = connection.saturated.value
+
+    await asyncio.gather(*(connection.perform_request('GET', '/') for _ in range(3)))
+    assert connection.saturated.value - saturated == 1
+    assert connection.in_flight == 0
@@ -0,0 +1,143 @@
+import pytest
+from unittest.mock import AsyncMock
+from connections.redis_manager import RedisManager
+
+@pytest.mark.asyncio
+async def test_get_awaits_client_and_decodes_value():
+    manager = RedisManager()
+    manager.redis_client = AsyncMock()
+    manager.redis_client.get = AsyncMock(return_value=b'\x01[{"id":1}]')
+    result = await manager.get('key')
+    manager.redis_client.get.assert_awaited_once_with('key')
+    assert result == [{'id': 1}]
+
+@pytest.mark.asyncio
+async def test_set_awaits_client_with_serialized_value():
+    manager = RedisManager()
+    manager.redis_client = AsyncMock()
+    await manager.set('key', [{'id': 1}], ex=10)
+    manager.redis_client.set.assert_awaited_once_with('key', b'\x01[{"id":1}]', ex=10)
+
+@pytest.mark.asyncio
+async def test_delete_awaits_client():
+    manager = RedisManager()
+    manager.redis_client = AsyncMock()
+    await manager.delete('key')
+    manager.redis_client.delete.assert_awaited_once_with('key')
+
+def pipeline_returning(results):
+    from unittest.mock import MagicMock
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+@pytest.mark.asyncio
+async def test_get_is_served_from_local_cache_after_first_read():
+    from unittest.mock import MagicMock
+    from utils.local_cache import LocalCache
+    manager = RedisManager()
+    manager.redis_client = MagicMock()
+    manager.redis_client.execute_command = AsyncMock()
+    manager.redis_client.delete = AsyncMock()
+    pipe = pipeline_returning([b'[{"id": 1}]', -1])
+    manager.redis_client.pipeline.return_value = pipe
+    manager.local_cache = LocalCache(max_items=10, max_bytes=1024, ttl=60, name='test_manager')
+    try:
+        assert await manager.get('key') == [{'id': 1}]
+        assert await manager.get('key') == [{'id': 1}]
+        pipe.execute.assert_awaited_once()
+        await manager.delete('key')
+        assert manager.local_cache.get('key') is None
+        manager.redis_client.execute_command.assert_awaited_once()
+    finally:
+        manager.local_cache = None
+
+@pytest.mark.asyncio
+async def test_local_cache_entries_expire_with_their_redis_key(monkeypatch):
+    from unittest.mock import MagicMock
+    from utils import local_cache
+    from utils.local_cache import LocalCache
+    manager = RedisManager()
+    manager.redis_client = MagicMock()
+    manager.local_cache = LocalCache(max_items=10, max_bytes=1024, ttl=60, name='test_manager_ttl')
+    now = [1000.0]
+    monkeypatch.setattr(local_cache.time, 'monotonic', lambda: now[0])
+    try:
+        manager.redis_client.pipeline.return_value = pipeline_returning([b'\x01{"id":1}', 2000])
+        assert await manager.get('a') == {'id': 1}
+        manager.redis_client.pipeline.return_value = pipeline_returning([b'\x01{"id":2}', 1500, None, -2])
+        assert await manager.mget(['b', 'c']) == [{'id': 2}, None]
+        now[0] += 1.8
+        assert manager.local_cache.get('a') == {'id': 1}
+        assert manager.local_cache.get('b') is None
+        now[0] += 0.5
+        assert manager.local_cache.get('a') is None
+    finally:
+        manager.local_cache = None
+
+@pytest.mark.asyncio
+async def test_delete_prefix_unlinks_scanned_keys():
+    async def scan_iter(match, count):
+        assert match == 'v1:movies:list:*'
+        for key in (b'v1:movies:list:a', b'v1:movies:list:b', b'v1:movies:list:c'):
+            yield key
+
+    manager = RedisManager()
+    manager.redis_client = AsyncMock()
+    manager.redis_client.scan_iter = scan_iter
+    manager.redis_client.unlink = AsyncMock(side_effect=lambda *keys: len(keys))
+    assert await manager.delete_prefix('v1:movies:list:', batch_size=2) == 3
+    assert manager.redis_client.unlink.await_count == 2
+
+@pytest.mark.asyncio
+async def test_mget_reads_keys_in_one_pipeline():
+    from unittest.mock import MagicMock
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[b'\x01{"id":1}', None])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    manager = RedisManager()
+    manager.redis_client = MagicMock()
+    manager.redis_client.pipeline.return_value = pipe
+    assert await manager.mget(['a', 'b']) == [{'id': 1}, None]
+    assert [call.args for call in pipe.get.call_args_list] == [('a',), ('b',)]
+    pipe.execute.assert_awaited_once()
+
+def test_apply_invalidation_routes_handler_prefixes():
+    from utils.local_cache import LocalCache
+    manager = RedisManager()
+    manager.local_cache = LocalCache(max_items=10, max_bytes=1024, ttl=60, name='test_handlers')
+    received = []
+    manager.on_invalidation('test_handler:', received.append)
+    try:
+        manager.local_cache.set('key', 1, size=1)
+        manager.apply_invalidation('test_handler:remove:[1]')
+        assert received == ['remove:[1]'] and manager.local_cache.get('key') == 1
+        manager.apply_invalidation('key')
+        assert manager.local_cache.get('key') is None
+    finally:
+        manager.local_cache = None
+        del manager._invalidation_handlers['test_handler:']
+
+@pytest.mark.asyncio
+async def test_cluster_pubsub_client_keeps_credentials_and_ssl():
+    from redis.asyncio import RedisCluster
+    from redis.asyncio.cluster import ClusterNode
+    from redis.asyncio.connection import SSLConnection
+    node = ClusterNode('10.0.0.1', 6379, connection_class=SSLConnection, username='user', password='secret', socket_timeout=2.0)
+    manager = RedisManager()
+    previous = manager.redis_client
+    manager.redis_client = AsyncMock(spec=RedisCluster)
+    manager.redis_client.get_default_node = lambda: node
+    try:
+        client = manager._pubsub_client()
+        pool = client.connection_pool
+        assert pool.connection_class is SSLConnection
+        assert pool.connection_kwargs['password'] == 'secret'
+        assert pool.connection_kwargs['username'] == 'user'
+        assert pool.connection_kwargs['socket_timeout'] is None
+        await client.aclose()
+    finally:
+        manager.redis_client = previous
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from opensearchpy import ConnectionError, TransportError
+from connections.resilience import ResiliencePolicy
+from utils.deadline import reset_request_deadline, set_request_deadline
+from utils.exceptions import RequestDeadlineExceeded, SearchUnavailable
+
+def make_policy(**kwargs):
+    options = dict(
+        default_timeout=5, max_retries=2, backoff_base=0.001, backoff_max=0.001,
+        failure_threshold=3, reset_timeout=60,
+    )
+    options.update(kwargs)
+    return ResiliencePolicy('test', **options)
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    func = AsyncMock(side_effect=[ConnectionError('N/A', 'refused', None), {'ok': True}])
+    assert await make_policy().call(func) == {'ok': True}
+    assert func.await_count == 2
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    func = AsyncMock(side_effect=TransportError(400, 'bad request'))
+    with pytest.raises(TransportError):
+        await make_policy().call(func)
+    assert func.await_count == 1
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast():
+    policy = make_policy(max_retries=0)
+    func = AsyncMock(side_effect=TransportError(503, 'unavailable'))
+    for _ in range(3):
+        with pytest.raises(SearchUnavailable):
+            await policy.call(func)
+    with pytest.raises(SearchUnavailable):
+        await policy.call(func)
+    assert func.await_count == 3
+
+@pytest.mark.asyncio
+async def test_attempt_timeout_is_bounded_by_request_deadline():
+    func = AsyncMock(return_value={})
+    token = set_request_deadline(1)
+    try:
+        await make_policy().call(func, timeout=120)
+    finally:
+        reset_request_deadline(token)
+    assert func.await_args.args[0] <= 1
+
+@pytest.mark.asyncio
+async def test_expired_deadline_is_not_attempted():
+    func = AsyncMock(return_value={})
+    token = set_request_deadline(-1)
+    try:
+        with pytest.raises(RequestDeadlineExceeded):
+            await make_policy().call(func)
+    finally:
+        reset_request_deadline(token)
+    func.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged():
+    policy = make_policy(hedging_enabled=True, hedge_min_samples=1)
+    policy.latency.observe(0.01)
+    delays = [1, 0]
+
+    async def func(timeout):
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await policy.call(func, hedge=True) == 0
+
+@pytest.mark.asyncio
+async def test_half_open_trial_always_settles_the_breaker():
+    policy = make_policy(max_retries=0, failure_threshold=1, reset_timeout=0)
+    with pytest.raises(SearchUnavailable):
+        await policy.call(AsyncMock(side_effect=TransportError(503, 'unavailable')))
+    assert policy.breaker.state == policy.breaker.OPEN
+
+    # A client error during the trial proves the backend answers
+    with pytest.raises(TransportError):
+        await policy.call(AsyncMock(side_effect=TransportError(404, 'not found')))
+    assert policy.breaker.state == policy.breaker.CLOSED
+
+    with pytest.raises(SearchUnavailable):
+        await policy.call(AsyncMock(side_effect=TransportError(503, 'unavailable')))
+    trial = asyncio.ensure_future(policy.call(lambda timeout: asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    assert policy.breaker.state == policy.breaker.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert policy.breaker.state == policy.breaker.OPEN
+    assert await policy.call(AsyncMock(return_value={'ok': True})) == {'ok': True}
+    assert policy.breaker.state == policy.breaker.CLOSED
@@ -0,0 +1,12 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+@pytest.mark.parametrize('value', ['0', '-1', 'nan', 'inf', 'soon'])
+def test_invalid_request_timeout_is_rejected(value):
+    response = TestClient(app).get('/healthcheck', headers={'X-Request-Timeout': value})
+    assert response.status_code == 400
+
+def test_valid_request_timeout_is_accepted():
+    response = TestClient(app).get('/healthcheck', headers={'X-Request-Timeout': '2.5'})
+    assert response.status_code == 200
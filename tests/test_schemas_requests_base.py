@@ -0,0 +1,11 @@
+import pytest
+from pydantic import ValidationError
+from schemas.requests.base import BaseRequest
+
+@pytest.mark.parametrize('size', [-3, 0, 10001])
+def test_base_request_rejects_out_of_range_size(size):
+    with pytest.raises(ValidationError):
+        BaseRequest(size=size)
+
+def test_base_request_accepts_size_up_to_result_window():
+    assert BaseRequest(size=10000).size == 10000
@@ -0,0 +1,42 @@
+import pytest
+from unittest.mock import AsyncMock
+from services.ingestion import IngestionService, prepare_movie
+
+def movies(count):
+    return [{'id': i, 'title': f'Movie Número {i}'} for i in range(count)]
+
+def make_service(**kwargs):
+    service = IngestionService(index='movie', **kwargs)
+    service.es = AsyncMock()
+    service.es.bulk = AsyncMock(side_effect=lambda body: [{'status': 201}] * body.count(b'"_index"'))
+    return service
+
+def test_prepare_movie_normalizes_title_like_queries():
+    assert prepare_movie({'id': 1, 'title': 'Amélie: O Fabuloso!'})['title_normalized'] == 'amelie o fabuloso'
+
+@pytest.mark.asyncio
+async def test_ingest_chunks_by_documents_and_bytes():
+    service = make_service(batch_size=3, max_batch_bytes=10_000, concurrency=2)
+    report = await service.ingest(movies(7) + [{'id': 99}])
+    assert report.indexed == 7
+    assert report.invalid == 1
+    assert service.es.bulk.await_count == 3
+    service.es.put_index_settings.assert_awaited()
+    service.es.refresh.assert_awaited_once_with('movie')
+
+    service = make_service(batch_size=100, max_batch_bytes=300, concurrency=1)
+    report = await service.ingest(movies(4), pause_refresh=False)
+    assert report.indexed == 4
+    assert service.es.bulk.await_count > 1
+    service.es.put_index_settings.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_ingest_retries_only_rejected_documents():
+    service = make_service(batch_size=10, concurrency=1, max_retries=2, retry_backoff=0)
+    service.es.bulk = AsyncMock(side_effect=[
+        [{'status': 201}, {'status': 429}, {'status': 400, 'error': 'mapper_parsing_exception'}],
+        [{'status': 201}],
+    ])
+    report = await service.ingest(movies(3), pause_refresh=False)
+    assert (report.indexed, report.failed, report.retried) == (2, 1, 1)
+    assert service.es.bulk.await_args.args[0].count(b'"_id":1') == 1
@@ -1,7 +1,16 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
+from fastapi import HTTPException
 from services.movies import MoviesService
 
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    mock_cache = AsyncMock()
+    mock_cache.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+    mock_cache.on_invalidation = Mock()
+    monkeypatch.setattr('services.base.RedisManager', lambda: mock_cache)
+    return mock_cache
+
 @pytest.mark.asyncio
 async def test_filter_movies_by_id():
     mock_es = AsyncMock()
@@ -28,4 +37,414 @@ async def test_filter_movies_by_title_match_fallback():
     service = MoviesService()
     service.es = mock_es
     result = await service.filter_movies('Another')
-    assert result[0]['title'] == 'Another' 
\ No newline at end of file
+    assert result[0]['title'] == 'Another' 
+
+@pytest.mark.asyncio
+async def test_get_all_movies_returns_page_with_next_cursor():
+    from schemas.requests.base import BaseRequest
+    from utils.pagination import decode_cursor
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 5, 'hits': [{'_source': {'id': 1, 'title': 'A'}, 'sort': [1]}, {'_source': {'id': 2, 'title': 'B'}, 'sort': [2]}]}))
+    service = MoviesService()
+    service.es = mock_es
+    result = await service.get_all_movies(BaseRequest(page=1, size=2))
+    assert [item['id'] for item in result['items']] == [1, 2]
+    assert result['total'] == 5
+    assert result['total_pages'] == 3
+    assert decode_cursor(result['next_cursor']) == {'search_after': [2], 'page': 2}
+
+@pytest.mark.asyncio
+async def test_get_all_movies_resumes_from_cursor():
+    from schemas.requests.base import BaseRequest
+    from utils.pagination import encode_cursor
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 3, 'hits': [{'_source': {'id': 3, 'title': 'C'}, 'sort': [3]}]}))
+    service = MoviesService()
+    service.es = mock_es
+    result = await service.get_all_movies(BaseRequest(size=2, cursor=encode_cursor([2], 2)))
+    elastic_request = mock_es.search_page.call_args.args[0]
+    assert elastic_request.search_after == [2]
+    assert result['page'] == 2
+    assert result['next_cursor'] is None
+
+@pytest.mark.asyncio
+async def test_export_movies_streams_ndjson_chunks():
+    import gzip
+    import json
+    from schemas.requests.movies import ExportMoviesRequest
+
+    async def hits(_):
+        for i in range(3):
+            yield {'_source': {'id': i, 'title': f'Movie {i}'}}
+
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.iter_async_scan = hits
+    chunks = [c async for c in service.export_movies(ExportMoviesRequest(batch_size=2))]
+    assert len(chunks) == 2
+    lines = b''.join(chunks).decode().splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [0, 1, 2]
+
+    chunks = [c async for c in service.export_movies(ExportMoviesRequest(batch_size=2, compress=True))]
+    lines = gzip.decompress(b''.join(chunks)).decode().splitlines()
+    assert [json.loads(line)['title'] for line in lines] == ['Movie 0', 'Movie 1', 'Movie 2']
+
+def test_build_response_projects_fields_and_rejects_unknown_ones():
+    from fastapi import HTTPException
+    service = MoviesService()
+    movies = type('obj', (object,), {'hits': [{'_source': {'id': 1, 'title': 'A', 'genre': 'Drama'}}]})
+    assert service._build_response(movies, ['id', 'title']) == [{'id': 1, 'title': 'A'}]
+    with pytest.raises(HTTPException) as exc:
+        service._build_response(type('obj', (object,), {'hits': []}), ['rating'])
+    assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_get_all_movies_pushes_fields_down_to_source():
+    from schemas.requests.base import BaseRequest
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 1, 'hits': [{'_source': {'title': 'A', 'id': 1}, 'sort': [1]}]}))
+    service = MoviesService()
+    service.es = mock_es
+    result = await service.get_all_movies(BaseRequest(fields='title, id'))
+    elastic_request = mock_es.search_page.call_args.args[0]
+    assert elastic_request.body['_source'] == ['id', 'title']
+    assert result['items'] == [{'id': 1, 'title': 'A'}]
+
+@pytest.mark.asyncio
+async def test_get_all_movies_rejects_unknown_fields_before_querying():
+    from fastapi import HTTPException
+    from schemas.requests.base import BaseRequest
+    mock_es = AsyncMock()
+    service = MoviesService()
+    service.es = mock_es
+    with pytest.raises(HTTPException) as exc:
+        await service.get_all_movies(BaseRequest(fields='title,rating'))
+    assert exc.value.status_code == 400
+    mock_es.search_page.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_search_movies_batch_groups_matches_by_title(monkeypatch):
+    from schemas.requests.movies import BatchSearchMoviesRequest
+    from services import movies as movies_module
+    monkeypatch.setattr(movies_module.settings, 'MSEARCH_BATCH_SIZE', 1)
+
+    async def msearch(index, bodies, max_concurrent_searches):
+        return [
+            type('obj', (object,), {'hits': [{'_source': {'id': len(str(body)), 'title': 'Match'}}]})
+            for body in bodies
+        ]
+
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(side_effect=msearch)
+    request = BatchSearchMoviesRequest(titles=['The Godfather', 'the godfather!', 'Inception', '!!!'])
+    result = await service.search_movies_batch(request)
+    assert service.es.msearch.await_count == 2
+    assert result['The Godfather'] == result['the godfather!']
+    assert result['Inception'][0]['title'] == 'Match'
+    assert result['!!!'] == []
+
+@pytest.mark.asyncio
+async def test_search_movies_top_k_returns_scored_page():
+    from schemas.requests.movies import SearchMoviesRequest
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'hits': [{'_source': {'title_normalized': 'godfather'}, '_score': 7.5}]}))
+    service = MoviesService()
+    service.es = mock_es
+    result = await service.search_movies(SearchMoviesRequest(titles=['The Godfather'], top_k=5, min_score=1.0))
+    elastic_request = mock_es.search_page.call_args.args[0]
+    assert elastic_request.size == 5
+    assert elastic_request.body['min_score'] == 1.0
+    assert result == [{'title_normalized': 'godfather', 'score': 7.5}]
+    mock_es.search_async_scan.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_stats_maps_aggregation_buckets():
+    from schemas.requests.movies import MoviesStatsRequest
+    mock_es = AsyncMock()
+    mock_es.aggregate = AsyncMock(return_value={
+        'total': 3,
+        'genres': {'buckets': [{'key': 'Drama', 'doc_count': 2}]},
+        'directors': {'buckets': [{'key': 'Frank Darabont', 'doc_count': 1}]},
+        'release_years': {'buckets': [{'key': 1990.0, 'doc_count': 3}]},
+    })
+    service = MoviesService()
+    service.es = mock_es
+    result = await service.get_stats(MoviesStatsRequest())
+    assert mock_es.aggregate.call_args.kwargs['aggs']['genres']['terms']['field'] == 'genre'
+    assert result['total'] == 3
+    assert result['genres'] == [{'genre': 'Drama', 'doc_count': 2}]
+    assert result['directors'] == [{'director': 'Frank Darabont', 'doc_count': 1}]
+    assert result['release_years'] == [{'release_year': 1990, 'doc_count': 3}]
+
+@pytest.mark.asyncio
+async def test_filter_movies_is_served_from_title_index():
+    from utils.title_index import TitleIndex
+    mock_es = AsyncMock()
+    service = MoviesService()
+    service.es = mock_es
+    service.title_index = TitleIndex()
+    service.title_index.replace([{'id': 2, 'title': 'The Godfather', 'title_normalized': 'godfather'}])
+    assert (await service.filter_movies('2'))[0]['title'] == 'The Godfather'
+    assert (await service.filter_movies('Godfather'))[0]['id'] == 2
+    mock_es.search_async_scan.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_filter_movies_falls_back_to_search_on_title_index_miss():
+    from utils.title_index import TitleIndex
+    mock_es = AsyncMock()
+    mock_es.search_async_scan = AsyncMock(return_value=type('obj', (object,), {'hits': [{'_source': {'id': 3, 'title': 'Another', 'title_normalized': 'another'}}]}))
+    service = MoviesService()
+    service.es = mock_es
+    service.title_index = TitleIndex()
+    service.title_index.replace([])
+    result = await service.filter_movies('Anothr')
+    assert result[0]['id'] == 3
+
+@pytest.mark.asyncio
+async def test_suggest_caches_hot_prefixes():
+    from schemas.requests.movies import SuggestMoviesRequest
+    from utils.local_cache import LocalCache
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 1, 'hits': [{'_source': {'id': 2, 'title': 'The Godfather'}}]}))
+    service = MoviesService()
+    service.es = mock_es
+    service.suggestions_cache = LocalCache(max_items=10, max_bytes=1000, ttl=60, name='test_suggest')
+    request = SuggestMoviesRequest(prefix=' Godf', size=5)
+    assert await service.suggest(request) == [{'id': 2, 'title': 'The Godfather'}]
+    assert await service.suggest(request) == [{'id': 2, 'title': 'The Godfather'}]
+    mock_es.search_page.assert_awaited_once()
+    elastic_request = mock_es.search_page.call_args.args[0]
+    assert elastic_request.body['query']['multi_match']['query'] == 'godf'
+    assert elastic_request.size == 5
+
+@pytest.mark.asyncio
+async def test_suggest_serves_prefixes_from_title_index():
+    from schemas.requests.movies import SuggestMoviesRequest
+    from utils.title_index import TitleIndex
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 0, 'hits': []}))
+    service = MoviesService()
+    service.es = mock_es
+    service.title_index = TitleIndex()
+    service.title_index.replace([
+        {'id': 1, 'title': 'The Godfather', 'title_normalized': 'the godfather'},
+        {'id': 2, 'title': 'The Godfather Part II', 'title_normalized': 'the godfather part ii'},
+        {'id': 3, 'title': 'Heat', 'title_normalized': 'heat'},
+    ])
+    assert await service.suggest(SuggestMoviesRequest(prefix='the god', size=2)) == [
+        {'id': 1, 'title': 'The Godfather'},
+        {'id': 2, 'title': 'The Godfather Part II'},
+    ]
+    mock_es.search_page.assert_not_awaited()
+    # Too few titles start with the prefix, so OpenSearch suggests them
+    assert await service.suggest(SuggestMoviesRequest(prefix='god', size=2)) == []
+    mock_es.search_page.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_get_movies_by_ids_fetches_only_cache_misses():
+    from schemas.requests.movies import MoviesByIdsRequest
+    mock_es = AsyncMock()
+    mock_es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': [{'_source': {'id': 2, 'title': 'B'}}]})])
+    service = MoviesService()
+    service.es = mock_es
+    service.cache = AsyncMock()
+    service.cache.mget = AsyncMock(return_value=[{'id': 1, 'title': 'A'}, None, None])
+    result = await service.get_movies_by_ids(MoviesByIdsRequest(ids=[1, 2, 3, 1], fields='id,title'))
+    assert result['items'] == [{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]
+    assert result['missing_ids'] == [3]
+    bodies = mock_es.msearch.call_args.kwargs['bodies']
+    assert bodies[0]['query'] == {'terms': {'id': [2, 3]}}
+    cached = service.cache.mset.call_args.args[0]
+    assert list(cached.values()) == [{'id': 2, 'title': 'B'}]
+
+@pytest.mark.asyncio
+async def test_references_are_hydrated_from_movie_cache(cache):
+    entities = {}
+    cache.mset = AsyncMock(side_effect=lambda mapping, ex=None: entities.update(mapping))
+    cache.mget = AsyncMock(side_effect=lambda keys: [entities.get(key) for key in keys])
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': [{'_source': {'id': 2, 'title': 'B'}}]})])
+    await service.cache_movies([{'id': 1, 'imdb_id': 'tt1', 'title': 'A'}])
+    references = [{'id': 1, 'score': 2.0}, {'id': 2, 'score': 1.0}]
+    assert await service.hydrate(references, ['title']) == [{'title': 'A', 'score': 2.0}, {'title': 'B', 'score': 1.0}]
+    # Only the movie missing from the cache is fetched
+    assert service.es.msearch.call_args.kwargs['bodies'][0]['query'] == {'terms': {'id': [2]}}
+
+@pytest.mark.asyncio
+async def test_invalidate_movie_evicts_movie_cache_and_title_index(cache):
+    from utils.title_index import TitleIndex
+    cache.delete = AsyncMock()
+    service = MoviesService()
+    service.title_index = TitleIndex()
+    service.title_index.replace([{'id': 1, 'title': 'A'}])
+    await service.invalidate_movie(1)
+    from constants.cache import CacheNamespace
+    from services.movies import _movie_key
+    cache.delete.assert_awaited_once_with(_movie_key(CacheNamespace.movie_by_id, 1))
+    assert service.title_index.get(1) is None
+
+def test_validate_fields_rejects_unknown_fields():
+    service = MoviesService()
+    assert service.validate_fields(['id', 'title']) is not None
+    with pytest.raises(HTTPException):
+        service.validate_fields(['unknown'])
+
+@pytest.mark.asyncio
+async def test_hydrate_leaves_out_movies_that_no_longer_exist(cache):
+    mock_es = AsyncMock()
+    mock_es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': [{'_source': {'id': 1, 'title': 'A'}}]})])
+    service = MoviesService()
+    service.es = mock_es
+    assert await service.hydrate([{'id': 1}, {'id': 2}], ['id']) == [{'id': 1}]
+    assert mock_es.msearch.call_args.kwargs['bodies'][0]['query'] == {'terms': {'id': [1, 2]}}
+
+@pytest.mark.asyncio
+async def test_msearch_batches_in_flight_are_bounded(monkeypatch):
+    import asyncio
+    from services import movies as movies_module
+    monkeypatch.setattr(movies_module.settings, 'MSEARCH_BATCH_SIZE', 1)
+    monkeypatch.setattr(movies_module.settings, 'MSEARCH_MAX_CONCURRENT_BATCHES', 2)
+    in_flight, peak = 0, 0
+
+    async def msearch(index, bodies, max_concurrent_searches):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [type('obj', (object,), {'hits': []}) for _ in bodies]
+
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(side_effect=msearch)
+    batches = await service._msearch_batches([{'query': {}}] * 6)
+    assert len(batches) == 6
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_apply_changes_drops_only_affected_cache_entries(cache):
+    from constants.cache import CacheNamespace
+    from services.movies import _movie_key
+    from utils.title_index import TitleIndex
+    cache.delete = AsyncMock()
+    cache.mget = AsyncMock(side_effect=lambda keys: [
+        {'id': 1, 'imdb_id': 'tt1', 'title': 'A', 'genre': 'Drama'} if key.endswith(':1') else None
+        for key in keys
+    ])
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': []})])
+    service.es.bulk = AsyncMock(return_value=[{'status': 200}])
+    service.title_index = TitleIndex()
+    service.title_index.replace([{'id': 1, 'title': 'A', 'title_normalized': 'a'}])
+
+    # Same title, new director: searches and lists still hold the right ids
+    result = await service.apply_changes([{'id': 1, 'imdb_id': 'tt1', 'title': 'A', 'genre': 'Drama', 'director': 'X'}], [])
+    assert result['upserted'] == [1]
+    assert service.es.bulk.await_args.kwargs['refresh'] == 'wait_for'
+    body = service.es.bulk.await_args.args[0]
+    assert b'"index":{"_index":"movie","_id":1}' in body and b'"title_normalized":"a"' in body
+    assert {call.args[0] for call in cache.delete.await_args_list} == {
+        _movie_key(CacheNamespace.movie_by_id, 1), _movie_key(CacheNamespace.movie_by_imdb_id, 'tt1')
+    }
+    assert [call.args[0] for call in cache.delete_prefix.await_args_list] == ['v1:movies:stats:']
+    assert service.title_index.get(1)['director'] == 'X'
+
+    # A new movie and a deleted one change lists, searches and stats
+    cache.delete_prefix.reset_mock()
+    service.es.bulk = AsyncMock(return_value=[{'status': 201}, {'status': 200}])
+    result = await service.apply_changes([{'id': 2, 'title': 'B'}], [1])
+    assert (result['upserted'], result['deleted']) == ([2], [1])
+    assert [call.args[0] for call in cache.delete_prefix.await_args_list] == [
+        'v1:movies:list:', 'v1:movies:search:', 'v1:movies:stats:'
+    ]
+    assert service.title_index.get(1) is None and service.title_index.get(2)['title'] == 'B'
+
+@pytest.mark.asyncio
+async def test_apply_changes_reports_missing_and_rejected_movies(cache):
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': []})])
+    service.es.bulk = AsyncMock(return_value=[{'status': 400, 'error': 'mapper_parsing_exception'}, {'status': 404}])
+    result = await service.apply_changes([{'id': 3, 'title': 'C'}], [4])
+    assert result['failed'] == [{'id': 3, 'error': 'mapper_parsing_exception'}]
+    assert result['not_found'] == [4]
+    cache.delete_prefix.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_title_index_changes_reach_every_worker(cache):
+    from utils.local_cache import LocalCache
+    from utils.title_index import TitleIndex
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.es.msearch = AsyncMock(return_value=[type('obj', (object,), {'hits': [{'_source': {'id': 1, 'title': 'A'}}]})])
+    service.es.bulk = AsyncMock(return_value=[{'status': 200}, {'status': 200}])
+    service.title_index = TitleIndex()
+    service.title_index.replace([])
+    await service.apply_changes([{'id': 2, 'title': 'B'}], [1])
+    published = [call.args[0] for call in cache.publish_invalidation.await_args_list]
+    assert 'title_index:remove:[1]' in published and 'suggestions:*' in published
+
+    # Another worker applies the published messages through its handlers
+    worker = MoviesService()
+    worker.title_index = TitleIndex()
+    worker.title_index.replace([{'id': 1, 'title': 'A', 'title_normalized': 'a'}])
+    worker.suggestions_cache = LocalCache(max_items=10, max_bytes=1000, ttl=60, name='test_worker_suggest')
+    worker.suggestions_cache.set('5:a', [{'id': 1, 'title': 'A'}], size=10)
+    handlers = {call.args[0]: call.args[1] for call in cache.on_invalidation.call_args_list[-2:]}
+    for message in published:
+        prefix = next(p for p in handlers if message.startswith(p))
+        handlers[prefix](message[len(prefix):])
+    assert worker.title_index.get(1) is None
+    assert worker.title_index.get(2)['title'] == 'B'
+    assert worker.suggestions_cache.get('5:a') is None
+
+@pytest.mark.asyncio
+async def test_load_title_index_clears_snapshot_it_cannot_refresh(monkeypatch):
+    from services import movies as movies_module
+    from utils.title_index import TitleIndex
+
+    def scan(hits, error=None):
+        async def iter_async_scan(request):
+            for hit in hits:
+                yield hit
+            if error:
+                raise error
+        return iter_async_scan
+
+    service = MoviesService()
+    service.es = AsyncMock()
+    service.title_index = TitleIndex()
+    service.es.iter_async_scan = scan([{'_source': {'id': 1, 'title': 'A', 'title_normalized': 'a'}}])
+    await service.load_title_index()
+    assert service.title_index.ready
+
+    monkeypatch.setattr(movies_module.settings, 'TITLE_INDEX_MAX_DOCUMENTS', 1)
+    service.es.iter_async_scan = scan([{'_source': {'id': i, 'title': 'A'}} for i in range(2)])
+    await service.load_title_index()
+    assert not service.title_index.ready and service.title_index.get(1) is None
+
+    monkeypatch.setattr(movies_module.settings, 'TITLE_INDEX_MAX_DOCUMENTS', 10)
+    await service.load_title_index()
+    service.es.iter_async_scan = scan([], error=RuntimeError('scroll failed'))
+    with pytest.raises(RuntimeError):
+        await service.load_title_index()
+    assert not service.title_index.ready and len(service.title_index) == 0
+
+@pytest.mark.asyncio
+async def test_suggest_matches_punctuated_titles():
+    from schemas.requests.movies import SuggestMoviesRequest
+    from services.ingestion import prepare_movie
+    from utils.title_index import TitleIndex
+    mock_es = AsyncMock()
+    mock_es.search_page = AsyncMock(return_value=type('obj', (object,), {'total': 0, 'hits': []}))
+    service = MoviesService()
+    service.es = mock_es
+    service.title_index = TitleIndex()
+    service.title_index.replace([prepare_movie({'id': 1, 'title': 'Spider-Man'})])
+    request = SuggestMoviesRequest(prefix='Spider-M', size=1)
+    assert request.normalized_prefix() == 'spiderm'
+    assert await service.suggest(request) == [{'id': 1, 'title': 'Spider-Man'}]
+    mock_es.search_page.assert_not_awaited()
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock
+from services.reindex import ReindexService
+from utils.exceptions import ReindexFailed
+
+def make_service(live_count=3, new_count=3, previous=('movie_20260101000000',)):
+    service = ReindexService(alias='movie', replicas=1)
+    service.es = AsyncMock()
+    service.cache = AsyncMock()
+    service.es.count = AsyncMock(side_effect=lambda index: live_count if index == 'movie' else new_count)
+    service.es.reindex = AsyncMock(return_value={'failures': []})
+    service.es.get_alias = AsyncMock(return_value=list(previous))
+    service.es.index_exists = AsyncMock(return_value=True)
+    service.es.wait_for_green = AsyncMock(return_value=True)
+    return service
+
+@pytest.mark.asyncio
+async def test_reindex_builds_new_index_and_swaps_alias():
+    service = make_service()
+    index = await service.reindex(delete_previous=True)
+    assert index.startswith('movie_')
+    assert service.es.create_index.await_args.args[2] == {'refresh_interval': '-1', 'number_of_replicas': 0}
+    assert 'keyword' in service.es.create_index.await_args.args[1]['properties']['title_normalized']['fields']
+    service.es.put_index_settings.assert_awaited_once_with(index, {'refresh_interval': None, 'number_of_replicas': 1})
+    service.es.update_aliases.assert_awaited_once_with([
+        {'remove': {'index': 'movie_20260101000000', 'alias': 'movie'}},
+        {'add': {'index': index, 'alias': 'movie'}},
+    ])
+    service.es.delete_index.assert_awaited_once_with('movie_20260101000000')
+    prefixes = [call.args[0] for call in service.cache.delete_prefix.await_args_list]
+    assert 'v1:movies:list:' in prefixes and 'v1:movies:id:' in prefixes
+
+@pytest.mark.asyncio
+async def test_reindex_replaces_a_concrete_index_named_like_the_alias():
+    service = make_service(previous=())
+    index = await service.reindex()
+    service.es.update_aliases.assert_awaited_once_with([
+        {'remove_index': {'index': 'movie'}},
+        {'add': {'index': index, 'alias': 'movie'}},
+    ])
+
+@pytest.mark.asyncio
+async def test_reindex_keeps_alias_when_counts_differ():
+    service = make_service(live_count=3, new_count=2)
+    with pytest.raises(ReindexFailed):
+        await service.reindex()
+    service.es.update_aliases.assert_not_awaited()
+    service.cache.delete_prefix.assert_not_awaited()
+    service.es.delete_index.assert_awaited_once_with(service.es.create_index.await_args.args[0])
+
+@pytest.mark.asyncio
+async def test_reindex_loads_movies_into_the_new_index():
+    service = make_service(new_count=2)
+    service.es.bulk = AsyncMock(side_effect=lambda body: [{'status': 201}] * body.count(b'"_index"'))
+    index = await service.reindex([{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}], concurrency=1)
+    assert f'"_index":"{index}"'.encode() in service.es.bulk.await_args.args[0]
+    service.es.reindex.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_reindex_keeps_alias_until_replicas_are_allocated():
+    service = make_service()
+    service.es.wait_for_green = AsyncMock(return_value=False)
+    with pytest.raises(ReindexFailed):
+        await service.reindex()
+    index = service.es.create_index.await_args.args[0]
+    service.es.wait_for_green.assert_awaited_once_with(index, service.health_timeout)
+    service.es.update_aliases.assert_not_awaited()
+    service.es.delete_index.assert_awaited_once_with(index)
@@ -0,0 +1,19 @@
+import json
+from utils import cache_codec
+
+MOVIES = [{'id': i, 'title': f'Movie {i}', 'additional_data': {'rating': 9.1}} for i in range(50)]
+
+def test_small_values_are_not_compressed():
+    data = cache_codec.encode(MOVIES[:1], compression_threshold=1024)
+    assert data[0] == cache_codec.CODEC_ORJSON
+    assert cache_codec.decode(data) == MOVIES[:1]
+
+def test_large_values_are_compressed():
+    data = cache_codec.encode(MOVIES, compression_threshold=1024)
+    assert data[0] == cache_codec.CODEC_ORJSON_ZLIB
+    assert len(data) < len(json.dumps(MOVIES))
+    assert cache_codec.decode(data) == MOVIES
+
+def test_legacy_json_entries_are_still_readable():
+    assert cache_codec.decode(json.dumps(MOVIES)) == MOVIES
+    assert cache_codec.decode(json.dumps(MOVIES).encode()) == MOVIES
@@ -0,0 +1,14 @@
+import pytest
+from utils.deadline import remaining_time, reset_request_deadline, set_request_deadline, without_request_deadline
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_ignore_the_request_deadline():
+    async def chunks():
+        yield remaining_time(30)
+
+    token = set_request_deadline(-1)
+    try:
+        assert remaining_time(30) < 0
+        assert [left async for left in without_request_deadline(chunks())] == [30]
+    finally:
+        reset_request_deadline(token)
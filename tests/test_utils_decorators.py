@@ -0,0 +1,105 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from utils import decorators
+from utils.decorators import cached
+
+@pytest.fixture
+def cache(monkeypatch):
+    mock_cache = AsyncMock()
+    mock_cache.get = AsyncMock(return_value=None)
+    monkeypatch.setattr(decorators, 'cache_instance', mock_cache)
+    return mock_cache
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_the_backend_query_once(cache):
+    calls = []
+
+    @cached(expiration_seconds=10)
+    async def search(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return [{'id': 1}]
+
+    results = await asyncio.gather(*(search('godfather') for _ in range(20)))
+    assert len(calls) == 1
+    assert all(result == [{'id': 1}] for result in results)
+    cache.set.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load(cache):
+    calls = []
+
+    @cached(expiration_seconds=10)
+    async def search(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return [{'id': 1}]
+
+    first = asyncio.ensure_future(search('godfather'))
+    second = asyncio.ensure_future(search('godfather'))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == [{'id': 1}]
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_lock_loser_waits_for_cached_result(cache, monkeypatch):
+    monkeypatch.setattr(decorators.settings, 'CACHE_LOCK_ENABLED', True)
+    monkeypatch.setattr(decorators.settings, 'CACHE_LOCK_POLL_INTERVAL', 0)
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=False)
+    cache.lock = MagicMock(return_value=lock)
+    cache.get = AsyncMock(side_effect=[None, None, {'value': [{'id': 2}], 'fresh_until': time.time() + 10}])
+    backend = AsyncMock()
+
+    @cached(expiration_seconds=10)
+    async def search(request):
+        await backend()
+
+    assert await search('godfather') == [{'id': 2}]
+    backend.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshed_in_background(cache):
+    cache.get = AsyncMock(return_value={'value': [{'id': 1}], 'fresh_until': time.time() - 1})
+    backend = AsyncMock(return_value=[{'id': 2}])
+
+    @cached(expiration_seconds=10, stale_while_revalidate=60)
+    async def search(request):
+        return await backend()
+
+    results = await asyncio.gather(*(search('godfather') for _ in range(5)))
+    assert all(result == [{'id': 1}] for result in results)
+    await asyncio.sleep(0)
+    backend.assert_awaited_once()
+    entry = cache.set.call_args.args[1]
+    assert entry['value'] == [{'id': 2}]
+    assert cache.set.call_args.kwargs['ex'] == 70
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_when_backend_fails(cache):
+    from utils.exceptions import SearchUnavailable
+    cache.get = AsyncMock(return_value={'value': [{'id': 1}], 'fresh_until': time.time() - 100})
+
+    @cached(expiration_seconds=10, stale_while_revalidate=10, stale_if_error=3600)
+    async def search(request):
+        raise SearchUnavailable()
+
+    assert await search('godfather') == [{'id': 1}]
+
+@pytest.mark.asyncio
+async def test_shared_load_ignores_the_first_callers_deadline(cache):
+    from utils.deadline import remaining_time, reset_request_deadline, set_request_deadline
+
+    @cached(expiration_seconds=10)
+    async def search(request):
+        await asyncio.sleep(0)
+        return remaining_time(30)
+
+    token = set_request_deadline(0.01)
+    try:
+        assert await search('godfather') == 30
+    finally:
+        reset_request_deadline(token)
@@ -0,0 +1,22 @@
+from schemas.requests.base import BaseRequest
+from schemas.requests.movies import SearchMoviesRequest
+from services.movies import MoviesService
+from utils import generate_cache_key
+
+def test_cache_key_ignores_injected_dependencies():
+    key = generate_cache_key('prefix', request=BaseRequest(), service=MoviesService())
+    assert key == generate_cache_key('prefix', request=BaseRequest(), service=object())
+
+def test_cache_key_is_independent_of_fields_order():
+    first = generate_cache_key('prefix', request=BaseRequest(fields='title,id'))
+    second = generate_cache_key('prefix', request=BaseRequest(fields='id, title,title'))
+    assert first == second
+    assert first != generate_cache_key('prefix', request=BaseRequest(fields='id'))
+
+def test_cache_key_is_independent_of_titles_order():
+    first = generate_cache_key('prefix', request=SearchMoviesRequest(titles=['Inception', 'The Godfather']))
+    second = generate_cache_key('prefix', request=SearchMoviesRequest(titles=['the godfather', 'inception', 'Inception']))
+    assert first == second
+
+def test_cache_key_starts_with_prefix():
+    assert generate_cache_key('v1:movies:list:0.1.0:2', request=BaseRequest()).startswith('v1:movies:list:0.1.0:2:')
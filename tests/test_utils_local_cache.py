@@ -0,0 +1,35 @@
+import time
+from utils.local_cache import LocalCache
+
+def test_local_cache_get_counts_hits_and_misses():
+    cache = LocalCache(max_items=10, max_bytes=100, ttl=60, name='test_counts')
+    cache.set('a', [1], size=3)
+    assert cache.get('a') == [1]
+    assert cache.get('b') is None
+    assert cache.hits.value == 1
+    assert cache.misses.value == 1
+
+def test_local_cache_evicts_least_recently_used_entry():
+    cache = LocalCache(max_items=2, max_bytes=100, ttl=60, name='test_lru')
+    cache.set('a', 1, size=1)
+    cache.set('b', 2, size=1)
+    cache.get('a')
+    cache.set('c', 3, size=1)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.evictions.value == 1
+
+def test_local_cache_is_bounded_by_bytes():
+    cache = LocalCache(max_items=10, max_bytes=10, ttl=60, name='test_bytes')
+    cache.set('a', 1, size=6)
+    cache.set('b', 2, size=6)
+    assert len(cache) == 1
+    cache.set('huge', 3, size=11)
+    assert cache.get('huge') is None
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(max_items=10, max_bytes=100, ttl=60, name='test_ttl')
+    cache.set('a', 1, size=1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('a') is None
+    assert len(cache) == 0
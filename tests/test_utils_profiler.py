@@ -0,0 +1,20 @@
+import threading
+import time
+from utils import profiler
+
+def busy_loop(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+def test_sample_stacks_collapses_the_sampled_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,))
+    thread.start()
+    try:
+        stacks = profiler.sample_stacks(thread.ident, seconds=0.05, interval=0.005)
+    finally:
+        stop.set()
+        thread.join()
+    assert sum(stacks.values()) > 1
+    assert all(':busy_loop:' in stack for stack in stacks)
+    assert profiler.format_collapsed(stacks).endswith('\n')
@@ -13,4 +13,33 @@ def test_normalize_alphanumeric():
     assert string_utils.normalize_alphanumeric('abc123!@#') == 'abc123'
     assert string_utils.normalize_alphanumeric('João!@#', keep_whitespaces=True) == 'Joao'
     assert string_utils.normalize_alphanumeric('João!@#', keep_whitespaces=False) == 'Joao'
-    assert string_utils.normalize_alphanumeric('João!@#', remove_alphanumeric=False) == 'Joao!@#' 
\ No newline at end of file
+    assert string_utils.normalize_alphanumeric('João!@#', remove_alphanumeric=False) == 'Joao!@#' 
+def _legacy_normalized_text(text, keep_whitespaces=False, remove_alphanumeric=True):
+    # normalized_text as it was before the batch API, kept as the reference
+    import regex
+    from unicodedata import normalize
+    if not text:
+        return text
+    text = normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
+    text = normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
+    rex = regex.compile(r"[^A-Za-z0-9 ]+")
+    if remove_alphanumeric and keep_whitespaces:
+        text = regex.sub(r"\s+", " ", rex.sub(" ", text)).strip()
+    elif remove_alphanumeric:
+        text = rex.sub("", text)
+    return regex.sub(r"\s+", " ", text).strip()
+
+@pytest.mark.parametrize('keep_whitespaces', [False, True])
+@pytest.mark.parametrize('remove_alphanumeric', [False, True])
+def test_normalize_many_matches_legacy_normalization(keep_whitespaces, remove_alphanumeric):
+    import random
+    rng = random.Random(0)
+    alphabet = 'aZ09 -:!\t\n\x0b\x1c\x1f\x85\xa0éÉçñøßﬁ²½Ⅸ日本 ​'
+    texts = ['', None, 'The Godfather: Part II', '  Amélie   (2001) ', 'Se7en', 'WALL·E', 'Léon: The Professional']
+    texts += [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 20))) for _ in range(2000)]
+    expected = [_legacy_normalized_text(text, keep_whitespaces, remove_alphanumeric) for text in texts]
+    assert string_utils.normalize_many(texts, keep_whitespaces, remove_alphanumeric) == expected
+    assert [string_utils.normalized_text(text, keep_whitespaces, remove_alphanumeric) for text in texts] == expected
+
+def test_normalized_titles_lowercase_in_order():
+    assert string_utils.normalized_titles(['Amélie!', 'THE  Godfather']) == ['amelie', 'the godfather']
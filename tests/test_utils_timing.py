@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from utils import timing
+
+@pytest.mark.asyncio
+async def test_stages_are_recorded_only_inside_a_request():
+    with timing.stage('query'):
+        pass
+    assert timing.get_request_timings() == {}
+
+    @timing.timed_stage('cache')
+    async def lookup():
+        await asyncio.sleep(0.01)
+
+    token = timing.start_request_timings()
+    try:
+        # Tasks spawned by the request add to the same timings
+        await asyncio.gather(lookup(), asyncio.create_task(lookup()))
+        with timing.stage('query'):
+            pass
+        timings = timing.get_request_timings()
+    finally:
+        timing.reset_request_timings(token)
+    assert timings['cache'][1] == 2 and timings['cache'][0] >= 0.02
+    assert timings['query'][1] == 1
+    assert timing.get_request_timings() == {}
+
+def test_server_timing_header():
+    header = timing.server_timing_header({'cache': [0.0012, 2]}, 0.008)
+    assert header == 'cache;dur=1.2;desc="2 calls", total;dur=8.0'
+
+def test_orjson_response_is_rendered_once_and_timed():
+    token = timing.start_request_timings()
+    try:
+        response = timing.TimedORJSONResponse([{'id': 1, 'title': None}])
+        timings = timing.get_request_timings()
+    finally:
+        timing.reset_request_timings(token)
+    assert response.body == b'[{"id":1,"title":null}]'
+    assert timings['serialization'][1] == 1
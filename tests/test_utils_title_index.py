@@ -0,0 +1,32 @@
+from utils.title_index import TitleIndex
+
+MOVIES = [
+    {'id': 2, 'title': 'The Godfather', 'title_normalized': 'godfather'},
+    {'id': 3, 'title': 'The Godfather Part II', 'title_normalized': 'godfather part ii'},
+    {'id': 1, 'title': 'The Shawshank Redemption', 'title_normalized': 'shawshank redemption'},
+]
+
+def test_title_index_looks_up_by_id_and_exact_title():
+    index = TitleIndex()
+    index.replace(MOVIES)
+    assert index.ready
+    assert index.get(1)['title'] == 'The Shawshank Redemption'
+    assert [movie['id'] for movie in index.find_title('  Godfather ')] == [2]
+    assert index.find_title('godfather part') == []
+
+def test_title_index_prefix_lookup_is_ordered_by_title():
+    index = TitleIndex()
+    index.replace(MOVIES)
+    assert [movie['id'] for movie in index.prefix('god')] == [2, 3]
+    assert [movie['id'] for movie in index.prefix('god', limit=1)] == [2]
+    assert index.prefix('zzz') == []
+
+def test_title_index_upsert_and_remove_keep_lookups_consistent():
+    index = TitleIndex()
+    index.replace(MOVIES)
+    index.upsert({'id': 2, 'title': 'Goodfellas', 'title_normalized': 'goodfellas'})
+    assert index.find_title('godfather') == []
+    assert [movie['id'] for movie in index.prefix('go')] == [3, 2]
+    index.remove(3)
+    assert [movie['id'] for movie in index.prefix('go')] == [2]
+    assert len(index) == 2
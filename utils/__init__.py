@@ -1,7 +1,43 @@
 import hashlib
 import json
+from enum import Enum
 from typing import Any
 
+from pydantic import BaseModel
+
+# Only plain data and models take part in a cache key; anything else passed
+# to a cached function (services, connections, requests injected by FastAPI)
+# is a dependency and does not change its result.
+_CACHE_KEY_TYPES = (type(None), bool, int, float, str, list, tuple, dict, Enum, BaseModel)
+
+
+def canonical_cache_data(value: Any) -> Any:
+    """
+    Convert `value` into the canonical JSON-compatible form used in cache keys.
+
+    Pydantic models are replaced by their `cache_key_data()` (or their dumped
+    fields), enums by their values, and values that are not plain data are
+    dropped.
+    """
+    if isinstance(value, BaseModel):
+        key_data = getattr(value, "cache_key_data", None)
+        value = key_data() if key_data else value.model_dump(mode="json")
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {
+            str(key): canonical_cache_data(item)
+            for key, item in value.items()
+            if isinstance(item, _CACHE_KEY_TYPES)
+        }
+    if isinstance(value, (list, tuple)):
+        return [
+            canonical_cache_data(item)
+            for item in value
+            if isinstance(item, _CACHE_KEY_TYPES)
+        ]
+    return value
+
 
 def generate_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
     """
@@ -12,11 +48,11 @@ def generate_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
     :param kwargs: Keyword arguments for the method.
     :return: A unique cache key string.
     """
-    # Serialize args and kwargs to a JSON-like string
-    key_data = {"args": args, "kwargs": kwargs}
+    # Reduce args and kwargs to their canonical data
+    key_data = canonical_cache_data({"args": args, "kwargs": kwargs})
 
     # Ensure deterministic ordering for kwargs
-    serialized = json.dumps(key_data, sort_keys=True, default=str)
+    serialized = json.dumps(key_data, sort_keys=True, separators=(",", ":"))
 
     # Hash the serialized data for a compact and unique key
     hash_digest = hashlib.md5(serialized.encode()).hexdigest()
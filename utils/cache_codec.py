@@ -0,0 +1,50 @@
+"""Serialization of cached values stored in Redis
+
+Every entry starts with a header byte naming the codec used to write it, so
+the format can change without invalidating what is already stored. Entries
+written before the header existed are plain JSON text and are still read.
+"""
+
+import zlib
+from typing import Any, Union
+
+import orjson
+
+from config import settings
+
+# Header bytes. JSON text never starts with a control character, so these
+# cannot be confused with entries written without a header.
+CODEC_ORJSON = 0x01
+CODEC_ORJSON_ZLIB = 0x02
+
+
+def encode(
+    value: Any,
+    compression_threshold: int = None,
+    compression_level: int = None,
+) -> bytes:
+    """
+    Serialize `value` with orjson, compressing it with zlib when the payload
+    is at least `compression_threshold` bytes long.
+    """
+    if compression_threshold is None:
+        compression_threshold = settings.CACHE_COMPRESSION_THRESHOLD
+    if compression_level is None:
+        compression_level = settings.CACHE_COMPRESSION_LEVEL
+
+    payload = orjson.dumps(value)
+    if len(payload) >= compression_threshold:
+        return bytes([CODEC_ORJSON_ZLIB]) + zlib.compress(payload, compression_level)
+    return bytes([CODEC_ORJSON]) + payload
+
+
+def decode(data: Union[bytes, str]) -> Any:
+    """Deserialize a value written by `encode` or by the legacy JSON codec."""
+    if isinstance(data, str):
+        data = data.encode()
+    header = data[0]
+    if header == CODEC_ORJSON:
+        return orjson.loads(memoryview(data)[1:])
+    if header == CODEC_ORJSON_ZLIB:
+        return orjson.loads(zlib.decompress(memoryview(data)[1:]))
+    return orjson.loads(data)
@@ -0,0 +1,47 @@
+"""Deadline of the request being served, shared by every call it makes"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import AsyncIterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def set_request_deadline(timeout: float) -> Token:
+    """Sets the deadline of the current request to `timeout` seconds from now."""
+    return _request_deadline.set(time.monotonic() + timeout)
+
+
+def reset_request_deadline(token: Token):
+    _request_deadline.reset(token)
+
+
+def clear_request_deadline():
+    """Removes the deadline from the current context."""
+    _request_deadline.set(None)
+
+
+def remaining_time(default: float) -> float:
+    """
+    Seconds left until the request deadline, capped by `default`. Returns
+    `default` outside of a request with a deadline.
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return default
+    return min(default, deadline - time.monotonic())
+
+
+async def without_request_deadline(chunks: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Iterates `chunks` with no request deadline. Meant for streamed response
+    bodies, which outlive the request deadline; each backend call they make
+    is still bounded by its own timeout.
+    """
+    clear_request_deadline()
+    async for chunk in chunks:
+        yield chunk
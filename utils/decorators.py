@@ -1,35 +1,70 @@
-from functools import wraps
+import asyncio
+import contextvars
+import time
+from enum import Enum
+from functools import partial, wraps
 from inspect import iscoroutinefunction
-from typing import Callable
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from fastapi import HTTPException
+from redis.exceptions import LockError, RedisError
 
 from config import settings
 from connections.redis_manager import RedisManager
+from constants.cache import CACHE_SCHEMA_VERSION
 from utils import generate_cache_key
+from utils.deadline import clear_request_deadline
+from utils.logger import Logger
 
 cache_instance = RedisManager()
+logger = Logger()
+
+# Cache misses currently being computed by this process, by cache key.
+_in_flight: Dict[str, asyncio.Task] = {}
 
 
-def cached(expiration_seconds: int = settings.DEFAULT_CACHE_EXPIRATION):
+def cached(
+    expiration_seconds: int = settings.DEFAULT_CACHE_EXPIRATION,
+    stale_while_revalidate: Optional[int] = None,
+    namespace: Optional[Union[str, Enum]] = None,
+    stale_if_error: Optional[int] = None,
+):
     """
     A decorator for caching method results.
 
-    The method name will be used as the cache key prefix.
-    """
+    Keys are `<namespace>:<api version>:<cache schema version>:<hash>`, where
+    the namespace defaults to the method name and the hash covers the
+    canonical form of the arguments (see `utils.canonical_cache_data`), so
+    a whole namespace can be invalidated by prefix.
 
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Use the function's name as the cache key prefix
-            cache_key_prefix = func.__name__
+    Concurrent misses for the same key are coalesced: only the first caller
+    runs the method, the others await its result. With CACHE_LOCK_ENABLED,
+    a Redis lock extends this across instances, and callers that lose the
+    lock wait for the winner to fill the cache.
 
-            # Generate cache key
-            cache_key = generate_cache_key(cache_key_prefix, *args[1:], **kwargs)
+    With `stale_while_revalidate`, entries are kept that many seconds past
+    `expiration_seconds`. Callers in that window get the stale value at once
+    while a background task refreshes it; only callers after the hard expiry
+    wait for the method.
 
-            # Check cache
-            cached_data = cache_instance.get(cache_key)
-            if cached_data:
-                return cached_data
+    With `stale_if_error`, entries are kept that many seconds longer still.
+    Callers in that window wait for the method, but get the stale value if
+    it fails with a server error (e.g. the search cluster is unavailable).
+    """
+    stale_while_revalidate = stale_while_revalidate or 0
+    hard_expiration_seconds = (
+        expiration_seconds + stale_while_revalidate + (stale_if_error or 0)
+    )
+    if isinstance(namespace, Enum):
+        namespace = namespace.value
 
+    def decorator(func: Callable):
+        cache_key_prefix = (
+            f"{namespace or func.__name__}:"
+            f"{settings.PROJECT_VERSION}:{CACHE_SCHEMA_VERSION}"
+        )
+
+        async def compute(cache_key, args, kwargs):
             # Call the original function
             if iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
@@ -37,9 +72,104 @@ def cached(expiration_seconds: int = settings.DEFAULT_CACHE_EXPIRATION):
                 result = func(*args, **kwargs)
 
             # Store the result in cache
-            cache_instance.set(cache_key, result, ex=expiration_seconds)
+            entry = {"value": result, "fresh_until": time.time() + expiration_seconds}
+            await cache_instance.set(cache_key, entry, ex=hard_expiration_seconds)
             return result
 
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Generate cache key
+            cache_key = generate_cache_key(cache_key_prefix, *args, **kwargs)
+
+            load = partial(compute, cache_key, args, kwargs)
+            if settings.CACHE_LOCK_ENABLED:
+                load = partial(_load_with_lock, cache_key, load)
+
+            # Check cache
+            entry = await cache_instance.get(cache_key)
+            if not _is_entry(entry):
+                return await asyncio.shield(_start_load(cache_key, load))
+
+            now = time.time()
+            if entry["fresh_until"] > now:
+                return entry["value"]
+            if entry["fresh_until"] + stale_while_revalidate > now:
+                # Stale: refresh in the background, answer right away
+                _start_load(cache_key, load)
+                return entry["value"]
+
+            try:
+                return await asyncio.shield(_start_load(cache_key, load))
+            except HTTPException as e:
+                if e.status_code < 500:
+                    raise
+                logger.warning(f"Serving stale '{cache_key}' after error: {e.detail}")
+                return entry["value"]
+
         return wrapper
 
     return decorator
+
+
+def _is_entry(cached_data: Any) -> bool:
+    return isinstance(cached_data, dict) and "fresh_until" in cached_data
+
+
+def _start_load(cache_key: str, load: Callable[[], Awaitable]) -> asyncio.Task:
+    """
+    Starts `load` for the key unless it is already running in this process.
+
+    The load runs in its own task, so a caller that is cancelled (e.g. on
+    client disconnect) does not cancel it for the callers still waiting. It
+    is shared by every caller, so it does not run under the deadline of the
+    one that started it.
+    """
+    task = _in_flight.get(cache_key)
+    if task is None:
+        context = contextvars.copy_context()
+        context.run(clear_request_deadline)
+        task = context.run(asyncio.ensure_future, load())
+        _in_flight[cache_key] = task
+        task.add_done_callback(partial(_forget_in_flight, cache_key))
+    return task
+
+
+def _forget_in_flight(cache_key: str, task: asyncio.Task):
+    if _in_flight.get(cache_key) is task:
+        del _in_flight[cache_key]
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Error loading cache key '{cache_key}': {task.exception()}")
+
+
+async def _load_with_lock(cache_key: str, load: Callable[[], Awaitable]):
+    """
+    Runs `load` only if this instance wins the Redis lock for the key.
+
+    Otherwise, polls the cache until the lock holder stores the result and
+    falls back to running `load` if it does not show up within the lock
+    timeout.
+    """
+    lock = cache_instance.lock(cache_key, timeout=settings.CACHE_LOCK_TIMEOUT)
+    try:
+        acquired = await lock.acquire()
+    except RedisError as e:
+        logger.warning(f"Error acquiring cache lock for '{cache_key}': {e}")
+        return await load()
+
+    if acquired:
+        try:
+            return await load()
+        finally:
+            try:
+                await lock.release()
+            except (LockError, RedisError) as e:
+                logger.warning(f"Error releasing cache lock for '{cache_key}': {e}")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.CACHE_LOCK_TIMEOUT
+    while loop.time() < deadline:
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        entry = await cache_instance.get(cache_key)
+        if _is_entry(entry) and entry["fresh_until"] > time.time():
+            return entry["value"]
+    return await load()
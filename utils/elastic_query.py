@@ -133,6 +133,32 @@ def build_match_query(
     return query
 
 
+def build_query_title(
+    title: str, exact_match: bool, keep_order_span: bool, fuzziness: str, slop: int
+) -> dict:
+    """Builds the query matching a single movie title.
+    Args:
+        title (str): Normalized title to be searched.
+        exact_match (bool): Search the title with exact match.
+        keep_order_span (bool): Search the title with all words in order.
+        fuzziness (str): Fuzziness value of the search.
+        slop (int): Slop value of the search.
+    Returns:
+        dict: Elasticsearch query for the title in the movie index.
+    """
+    if exact_match:
+        return build_term_or_terms_query(
+            field="title_normalized.keyword", values=[title]
+        )
+    if keep_order_span:
+        return build_span_near_query(
+            field="title_normalized", values=[title], fuzziness=fuzziness, slop=slop
+        )
+    return build_match_query(
+        field="title_normalized", values=[title], fuzziness=fuzziness
+    )
+
+
 def build_query_movie(query: SearchMoviesRequest):
     """Builds a bool query with movie title fields for the movie index.
     Args:
@@ -188,3 +214,23 @@ def build_query_movie(query: SearchMoviesRequest):
     if queries_must_not_list:
         query_dict["bool"]["must_not"] = queries_must_not_list
     return query_dict
+
+
+def build_query_suggest(prefix: str) -> dict:
+    """Builds the as-you-type query matching titles by the prefix typed so far.
+    Args:
+        prefix (str): Normalized beginning of the title.
+    Returns:
+        dict: Elasticsearch query on the `title_normalized.suggest` subfields.
+    """
+    return {
+        "multi_match": {
+            "query": prefix,
+            "type": "bool_prefix",
+            "fields": [
+                "title_normalized.suggest",
+                "title_normalized.suggest._2gram",
+                "title_normalized.suggest._3gram",
+            ],
+        }
+    }
@@ -12,12 +12,57 @@ class EmptySizeQueryNotAllowed(HTTPException):
 
 
 class QueryResultTooLarge(HTTPException):
+    def __init__(self, message: str = "Query result is too large") -> None:
+        status_code = 400
+        super().__init__(status_code=status_code, detail=message)
+
+
+class InvalidPaginationCursor(HTTPException):
     def __init__(self) -> None:
-        message = "Query result is too large"
+        message = "Invalid pagination cursor"
         status_code = 400
         super().__init__(status_code=status_code, detail=message)
 
 
+class MovieNotFound(HTTPException):
+    def __init__(self, movie_id: int) -> None:
+        message = f"Movie {movie_id} not found"
+        status_code = 404
+        super().__init__(status_code=status_code, detail=message)
+
+
+class SearchUnavailable(HTTPException):
+    def __init__(self) -> None:
+        message = "Search backend is unavailable, try again later"
+        status_code = 503
+        super().__init__(status_code=status_code, detail=message)
+
+
+class RequestDeadlineExceeded(HTTPException):
+    def __init__(self) -> None:
+        message = "Request deadline exceeded"
+        status_code = 504
+        super().__init__(status_code=status_code, detail=message)
+
+
+class ProfilerDisabled(HTTPException):
+    def __init__(self) -> None:
+        message = "Profiler is disabled, set PROFILER_ENABLED to use it"
+        status_code = 404
+        super().__init__(status_code=status_code, detail=message)
+
+
+class ProfilerBusy(HTTPException):
+    def __init__(self) -> None:
+        message = "A profile is already running"
+        status_code = 409
+        super().__init__(status_code=status_code, detail=message)
+
+
+class ReindexFailed(Exception):
+    """A new index was not swapped in, the alias still points to the old one."""
+
+
 class APIGenericError(Exception):
     def __init__(self, message: str, body_payload=None, *args) -> None:
         super().__init__(message, *args)
@@ -0,0 +1,84 @@
+"""Bounded in-process cache used in front of Redis"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from utils.metrics import metrics
+
+
+class LocalCache:
+    """
+    LRU cache bounded by number of entries and total size, with a TTL per
+    entry. It is meant to be used from a single event loop, so it does no
+    locking.
+
+    Arguments:
+        max_items (int): Maximum number of entries
+        max_bytes (int): Maximum sum of the entries' sizes
+        ttl (float): Default time to live of an entry, in seconds
+        name (str): Prefix of the hit/miss/eviction metrics
+    """
+
+    def __init__(self, max_items: int, max_bytes: int, ttl: float, name: str):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = metrics.counter(f"{name}_hits", "Local cache hits")
+        self.misses = metrics.counter(f"{name}_misses", "Local cache misses")
+        self.evictions = metrics.counter(
+            f"{name}_evictions", "Entries evicted to respect the cache bounds"
+        )
+        metrics.gauge(f"{name}_items", "Entries in the local cache", self.__len__)
+        metrics.gauge(
+            f"{name}_bytes", "Size of the local cache entries", lambda: self._bytes
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses.inc()
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits.inc()
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        """Stores `value`, evicting the least recently used entries if needed."""
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions.inc()
+
+    def delete(self, key: str):
+        self._remove(key)
+
+    def delete_prefix(self, prefix: str):
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
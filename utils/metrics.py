@@ -0,0 +1,78 @@
+"""In-process counters and gauges exposed by the /metrics route"""
+
+from typing import Callable, Dict, Optional, Union
+
+from utils.singleton import Singleton
+
+Number = Union[int, float]
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount: Number = 1):
+        self.value += amount
+
+
+class Gauge:
+    """
+    Value that can go up and down. When `function` is given, the value is
+    read from it at collection time instead of being set explicitly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        function: Optional[Callable[[], Number]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self._function = function
+        self._value = 0
+
+    @property
+    def value(self) -> Number:
+        return self._function() if self._function else self._value
+
+    def set(self, value: Number):
+        self._value = value
+
+    def inc(self, amount: Number = 1):
+        self._value += amount
+
+    def dec(self, amount: Number = 1):
+        self._value -= amount
+
+
+class MetricsRegistry(metaclass=Singleton):
+    """Process-wide registry of named metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Gauge]] = {}
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, description)
+        return self._metrics[name]
+
+    def gauge(
+        self,
+        name: str,
+        description: str = "",
+        function: Optional[Callable[[], Number]] = None,
+    ) -> Gauge:
+        if name not in self._metrics or function is not None:
+            self._metrics[name] = Gauge(name, description, function)
+        return self._metrics[name]
+
+    def collect(self) -> Dict[str, Number]:
+        return {name: metric.value for name, metric in sorted(self._metrics.items())}
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,35 @@
+"""Opaque cursors for search_after pagination"""
+
+import base64
+import json
+from typing import Any, List
+
+from utils.exceptions import InvalidPaginationCursor
+
+
+def encode_cursor(search_after: List[Any], page: int) -> str:
+    """
+    Encode the sort values of the last hit and the next page number into an
+    opaque, URL-safe cursor.
+    """
+    payload = json.dumps({"search_after": search_after, "page": page})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Raises:
+        InvalidPaginationCursor: if the cursor was not produced by this API.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        search_after = payload["search_after"]
+        page = int(payload["page"])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidPaginationCursor()
+    if not isinstance(search_after, list) or page < 1:
+        raise InvalidPaginationCursor()
+    return {"search_after": search_after, "page": page}
@@ -0,0 +1,42 @@
+"""Sampling profiler of a running thread, e.g. the event loop"""
+
+import sys
+import time
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+
+def sample_stacks(thread_id: int, seconds: float, interval: float) -> Counter:
+    """
+    Sample the stack of `thread_id` every `interval` seconds for `seconds`.
+    Meant to run in another thread; only reads frames, so the sampled thread
+    keeps running undisturbed.
+
+    Returns:
+        Counter: Number of samples per collapsed stack
+    """
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            stacks[collapse_stack(frame)] += 1
+        del frame
+        time.sleep(interval)
+    return stacks
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Stack from its outermost frame, as `file:function:line;...`."""
+    entries = []
+    while frame is not None:
+        code = frame.f_code
+        entries.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(entries))
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Collapsed stacks, one `stack count` per line, as read by flamegraph.pl."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
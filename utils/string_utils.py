@@ -1,12 +1,31 @@
 """Text normalization functions"""
 
+import string
 from functools import lru_cache
+from typing import Iterable, List
 from unicodedata import normalize
 
 import regex
 
 _REGEX_NON_DIGIT = regex.compile(r"\D")
 _REGEX_LEFT_ZERO = regex.compile(r"\b0+")
+_REGEX_NON_ALPHANUMERIC = regex.compile(r"[^A-Za-z0-9 ]+")
+_REGEX_WHITESPACES = regex.compile(r"\s+")
+
+# Distinct texts whose normalization is memoized, e.g. titles seen again.
+NORMALIZE_CACHE_SIZE = 65536
+
+# ASCII characters matched by _REGEX_NON_ALPHANUMERIC, removed or replaced by
+# a space with str.translate, which is much cheaper than the regex.
+_NON_ALPHANUMERIC = "".join(
+    char
+    for char in map(chr, range(128))
+    if char not in string.ascii_letters + string.digits + " "
+)
+_DELETE_NON_ALPHANUMERIC = str.maketrans("", "", _NON_ALPHANUMERIC)
+_SPACE_NON_ALPHANUMERIC = str.maketrans(
+    _NON_ALPHANUMERIC, " " * len(_NON_ALPHANUMERIC)
+)
 
 
 def normalized_text(
@@ -26,18 +45,67 @@ def normalized_text(
     """
     if not text:
         return text
-    text = normalize("NFKD", text).encode("ascii", "ignore").decode("utf-8")
+    return _normalized_text(text, keep_whitespaces, remove_alphanumeric)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalized_text(text: str, keep_whitespaces: bool, remove_alphanumeric: bool):
+    if not text.isascii():
+        # NFKD is the identity on ASCII text, so only other texts pay for it
+        text = normalize("NFKD", text).encode("ascii", "ignore").decode("utf-8")
+
+    if remove_alphanumeric:
+        table = _SPACE_NON_ALPHANUMERIC if keep_whitespaces else _DELETE_NON_ALPHANUMERIC
+        # Only spaces are left, so split() collapses exactly what \s+ would
+        return " ".join(text.translate(table).split())
+    return _REGEX_WHITESPACES.sub(" ", text).strip()
+
+
+def normalize_many(
+    texts: Iterable[str], keep_whitespaces: bool = False, remove_alphanumeric: bool = True
+) -> List[str]:
+    """
+    Normalizes each text as `normalized_text` does
+
+    Arguments:
+        texts (Iterable[str]): Texts to be normalized
+        keep_whitespaces (bool): As in `normalized_text`
+        remove_alphanumeric (bool): As in `normalized_text`
+
+    Returns:
+        list: Returns the normalized texts, in the same order
+    """
+    return [
+        _normalized_text(text, keep_whitespaces, remove_alphanumeric) if text else text
+        for text in texts
+    ]
 
-    text = normalize_alphanumeric(
-        text=text,
-        keep_whitespaces=keep_whitespaces,
-        remove_alphanumeric=remove_alphanumeric,
-    )
 
-    # Remove extra spaces
-    text = regex.sub(r"\s+", " ", text).strip()
+def normalized_title(title: str) -> str:
+    """
+    Normalizes a movie title the way `title_normalized` is indexed and
+    searched: accents and special characters removed, lowercase.
+
+    Arguments:
+        title (str): Title to be normalized
+
+    Returns:
+        string: Returns the normalized title
+    """
+    return normalized_text(title).lower()
+
 
-    return text
+def normalized_titles(titles: Iterable[str]) -> List[str]:
+    """
+    Normalizes each title as `normalized_title` does
+
+    Arguments:
+        titles (Iterable[str]): Titles to be normalized
+
+    Returns:
+        list: Returns the normalized titles, in the same order
+    """
+    return [title.lower() for title in normalize_many(titles)]
 
 
 def normalize_alphanumeric(
@@ -57,14 +125,13 @@ def normalize_alphanumeric(
     """
     # Normalize accents to ASCII
     text = normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
-    rex = regex.compile(r"[^A-Za-z0-9 ]+")
 
     if all((remove_alphanumeric, keep_whitespaces)):
         # Remove non-alphanumeric, then collapse multiple spaces
-        result = rex.sub(" ", text)
-        result = regex.sub(r"\s+", " ", result).strip()
+        result = _REGEX_NON_ALPHANUMERIC.sub(" ", text)
+        result = _REGEX_WHITESPACES.sub(" ", result).strip()
         return result
     elif remove_alphanumeric and not keep_whitespaces:
-        return rex.sub("", text)
+        return _REGEX_NON_ALPHANUMERIC.sub("", text)
     else:
         return text
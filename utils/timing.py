@@ -0,0 +1,98 @@
+"""Time spent per stage by the request being served"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+T = TypeVar("T")
+
+# Stage name -> [seconds, calls]. The dict is shared by the tasks the request
+# spawns, so concurrent stages add up and may exceed the request duration.
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> Token:
+    """Starts collecting stage timings for the current request."""
+    return _request_timings.set({})
+
+
+def reset_request_timings(token: Token):
+    _request_timings.reset(token)
+
+
+def get_request_timings() -> Dict[str, List[float]]:
+    """Stage timings collected so far, empty outside of a request."""
+    return _request_timings.get() or {}
+
+
+def record_stage(name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    timing = timings.setdefault(name, [0.0, 0])
+    timing[0] += seconds
+    timing[1] += 1
+
+
+@contextmanager
+def stage(name: str):
+    """Adds the time spent in the block to the `name` stage of the request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+def timed_stage(name: str):
+    """Decorator adding the time spent in a coroutine function to `name`."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with stage(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def server_timing_header(timings: Dict[str, List[float]], total: float) -> str:
+    """
+    `Server-Timing` header value, with durations in milliseconds, e.g.
+    `cache;dur=1.2;desc="2 calls", total;dur=8.0`.
+    """
+    entries = [
+        f'{name};dur={seconds * 1000:.1f};desc="{calls} calls"'
+        for name, (seconds, calls) in timings.items()
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse adding its rendering to the `serialization` stage."""
+
+    def render(self, content) -> bytes:
+        with stage("serialization"):
+            return super().render(content)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse adding its rendering to the `serialization` stage. Routes
+    return it directly with content already validated by the service, so
+    FastAPI neither validates it against a response model nor encodes it
+    with jsonable_encoder.
+    """
+
+    def render(self, content) -> bytes:
+        with stage("serialization"):
+            return super().render(content)
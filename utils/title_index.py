@@ -0,0 +1,100 @@
+"""In-process index of the movie catalogue by id and normalized title"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.metrics import metrics
+
+
+class TitleIndex:
+    """
+    Movies kept in memory, looked up by `id`, by exact normalized title or by
+    title prefix. Prefix lookups bisect a list of `(title, id)` kept sorted.
+
+    The index is only consulted once `ready`, i.e. after a full `replace`;
+    `upsert` and `remove` keep it current between reloads. It is meant to be
+    used from a single event loop, so it does no locking.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._by_id: Dict[int, dict] = {}
+        self._by_title: Dict[str, List[int]] = {}
+        self._titles: List[Tuple[str, int]] = []
+        self.hits = metrics.counter("title_index_hits", "Lookups served locally")
+        self.misses = metrics.counter(
+            "title_index_misses", "Lookups that fell back to OpenSearch"
+        )
+        metrics.gauge(
+            "title_index_documents", "Movies in the title index", self.__len__
+        )
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @staticmethod
+    def title_key(title: Optional[str]) -> str:
+        """Lowercase title with collapsed whitespace."""
+        return " ".join((title or "").lower().split())
+
+    def replace(self, movies: Iterable[dict]):
+        """Swaps the whole content of the index for `movies`."""
+        # Synchronous, so no lookup can see the index half rebuilt
+        self._by_id, self._by_title, self._titles = {}, {}, []
+        for movie in movies:
+            self._add(movie)
+        self._titles.sort()
+        self.ready = True
+
+    def clear(self):
+        """Empties the index and stops it from being consulted until `replace`."""
+        self.ready = False
+        self._by_id, self._by_title, self._titles = {}, {}, []
+
+    def upsert(self, movie: dict):
+        self.remove(movie["id"])
+        self._add(movie, keep_sorted=True)
+
+    def remove(self, movie_id: int):
+        movie = self._by_id.pop(movie_id, None)
+        if movie is None:
+            return
+        key = self.title_key(movie.get("title_normalized"))
+        ids = self._by_title[key]
+        ids.remove(movie_id)
+        if not ids:
+            del self._by_title[key]
+        del self._titles[bisect_left(self._titles, (key, movie_id))]
+
+    def get(self, movie_id: int) -> Optional[dict]:
+        return self._by_id.get(movie_id)
+
+    def find_title(self, title: str) -> List[dict]:
+        """Movies whose normalized title is exactly `title`, by id."""
+        return [self._by_id[i] for i in self._by_title.get(self.title_key(title), ())]
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[dict]:
+        """Up to `limit` movies whose normalized title starts with `prefix`."""
+        prefix = self.title_key(prefix)
+        result = []
+        position = bisect_left(self._titles, (prefix,))
+        while len(result) < limit and position < len(self._titles):
+            title, movie_id = self._titles[position]
+            if not title.startswith(prefix):
+                break
+            result.append(self._by_id[movie_id])
+            position += 1
+        return result
+
+    def _add(self, movie: dict, keep_sorted: bool = False):
+        movie_id = movie["id"]
+        key = self.title_key(movie.get("title_normalized"))
+        self._by_id[movie_id] = movie
+        insort(self._by_title.setdefault(key, []), movie_id)
+        if keep_sorted:
+            insort(self._titles, (key, movie_id))
+        else:
+            self._titles.append((key, movie_id))
+
+
+title_index = TitleIndex()